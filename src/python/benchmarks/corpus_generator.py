@@ -0,0 +1,272 @@
+import os
+import random
+from dataclasses import dataclass
+from typing import List
+
+from utils.repr_builder import build_repr_from_attributes
+
+
+@dataclass
+class CorpusConfig:
+    """The settings used to generate a synthetic Fortran 90 codebase.
+
+    Attributes:
+        file_count: The number of Fortran files to generate.
+        lines_per_file: The approximate number of lines in each file.
+        nesting_depth: The maximum number of DO loops and IF blocks that
+          can be nested inside each other in a subroutine.
+        variables_per_declaration: The number of variables declared in
+          each variable declaration.
+        continuation_rate: The chance (0 to 1) of an assignment being
+          split over two lines with a continuation character.
+        semicolon_rate: The chance (0 to 1) of two statements being put
+          on the same line, separated by a semicolon.
+        comment_density: The chance (0 to 1) of a statement being given
+          a comment.
+        files_per_directory: The number of files put in each directory
+          of the codebase.
+        seed: The seed used to generate the codebase. The same seed and
+          settings always generate the same codebase.
+    """
+
+    file_count: int = 50
+    lines_per_file: int = 400
+    nesting_depth: int = 3
+    variables_per_declaration: int = 3
+    continuation_rate: float = 0.05
+    semicolon_rate: float = 0.05
+    comment_density: float = 0.1
+    files_per_directory: int = 25
+    seed: int = 0
+
+
+@dataclass
+class CorpusStats:
+    """The size of a generated codebase.
+
+    Attributes:
+        file_count: The number of files generated.
+        line_count: The total number of lines across every file.
+    """
+
+    file_count: int
+    line_count: int
+
+
+class FortranFileGenerator:
+    """Generates the contents of a single synthetic Fortran 90 file.
+
+    Each file is a module of subroutines. The subroutines declare a mix
+    of variables and then use them in assignments, DO loops and IF
+    blocks, nested up to the configured depth.
+
+    Attributes:
+        config: The settings used to generate the file.
+        file_index: The index of the file in the codebase, used to give
+          the file's code blocks unique names.
+        lines: The lines of the file generated so far.
+    """
+
+    DATA_TYPES = ["INTEGER", "REAL", "DOUBLE PRECISION", "LOGICAL", "COMPLEX", "CHARACTER(LEN=32)"]
+    ATTRIBUTES = ["", "", "", ", DIMENSION(10)", ", SAVE", ", ALLOCATABLE, DIMENSION(:)"]
+
+    def __init__(self, config: CorpusConfig, file_index: int) -> None:
+        """Initialises a file generator.
+
+        Args:
+            config: The settings used to generate the file.
+            file_index: The index of the file in the codebase.
+        """
+
+        self.config = config
+        self.file_index = file_index
+        self.lines: List[str] = []
+        # Each file gets its own random generator, so a file's contents
+        # don't depend on how many files are generated before it.
+        self._random = random.Random(f"{config.seed}:{file_index}")
+        self._indent = 0
+
+    def generate(self) -> List[str]:
+        """Generates the lines of the file.
+
+        Returns:
+            A list of the lines in the file, without newline characters.
+        """
+
+        module_name = f"bench_module_{self.file_index}"
+        self._emit(f"MODULE {module_name}")
+        self._indent += 1
+        self._emit("IMPLICIT NONE")
+        self._write_declarations(f"m{self.file_index}_", 2)
+        self._indent -= 1
+        self._emit("CONTAINS")
+
+        subroutine_index = 0
+        # Always generate at least one subroutine, so tiny line counts
+        # still produce a module with something in it.
+        while subroutine_index == 0 or len(self.lines) < self.config.lines_per_file - 2:
+            self._indent += 1
+            self._write_subroutine(subroutine_index)
+            self._indent -= 1
+            subroutine_index += 1
+
+        self._emit(f"END MODULE {module_name}")
+
+        return self.lines
+
+    def _write_subroutine(self, subroutine_index: int) -> None:
+        """Writes a subroutine with its declarations and body."""
+
+        name = f"bench_sub_{self.file_index}_{subroutine_index}"
+        recursive = "RECURSIVE " if self._random.random() < 0.1 else ""
+        self._emit(f"{recursive}SUBROUTINE {name}(arg)")
+        self._indent += 1
+        self._emit("INTEGER, INTENT(IN) :: arg")
+        if self.config.nesting_depth > 0:
+            loop_counters = [f"i{depth}" for depth in range(1, self.config.nesting_depth + 1)]
+            self._emit(f"INTEGER :: {', '.join(loop_counters)}")
+
+        variable_names = self._write_declarations("v", self._random.randint(1, 3))
+
+        remaining_lines = self.config.lines_per_file - len(self.lines) - 1
+        self._write_body(variable_names, self.config.nesting_depth, max(1, min(remaining_lines, 40)))
+
+        self._indent -= 1
+        self._emit(f"END SUBROUTINE {name}")
+
+    def _write_declarations(self, prefix: str, declaration_count: int) -> List[str]:
+        """Writes variable declarations, returning the declared names."""
+
+        variable_names = []
+        for declaration_index in range(declaration_count):
+            data_type = self._random.choice(self.DATA_TYPES)
+            attributes = self._random.choice(self.ATTRIBUTES)
+            names = [
+                f"{prefix}{declaration_index}_{variable_index}"
+                for variable_index in range(self.config.variables_per_declaration)
+            ]
+            variable_names.extend(names)
+            self._emit_statement(f"{data_type}{attributes} :: {', '.join(names)}")
+
+        return variable_names
+
+    def _write_body(self, variable_names: List[str], depth: int, statement_budget: int) -> int:
+        """Writes a mix of statements and nested blocks.
+
+        Args:
+            variable_names: The names of the variables that can be used.
+            depth: How many more levels of blocks can be nested.
+            statement_budget: The approximate number of statements to
+              write.
+
+        Returns:
+            The number of statements written.
+        """
+
+        written = 0
+        while written < statement_budget:
+            choice = self._random.random()
+            if depth > 0 and choice < 0.15:
+                written += self._write_do_loop(variable_names, depth, statement_budget - written)
+            elif depth > 0 and choice < 0.3:
+                written += self._write_if_block(variable_names, depth, statement_budget - written)
+            elif self._random.random() < self.config.semicolon_rate:
+                self._emit(f"{self._assignment(variable_names)}; {self._assignment(variable_names)}")
+                written += 2
+            else:
+                self._write_assignment(variable_names)
+                written += 1
+
+        return written
+
+    def _write_do_loop(self, variable_names: List[str], depth: int, statement_budget: int) -> int:
+        """Writes a DO loop, returning the number of statements written."""
+
+        self._emit_statement(f"DO i{depth} = 1, arg")
+        self._indent += 1
+        written = self._write_body(variable_names, depth - 1, max(1, statement_budget // 2))
+        self._indent -= 1
+        self._emit("END DO")
+
+        return written + 2
+
+    def _write_if_block(self, variable_names: List[str], depth: int, statement_budget: int) -> int:
+        """Writes an IF block, returning the number of statements written."""
+
+        self._emit_statement(f"IF ({self._random.choice(variable_names)} > arg) THEN")
+        self._indent += 1
+        written = self._write_body(variable_names, depth - 1, max(1, statement_budget // 2))
+        self._indent -= 1
+        self._emit("END IF")
+
+        return written + 2
+
+    def _write_assignment(self, variable_names: List[str]) -> None:
+        """Writes an assignment, possibly split over two lines."""
+
+        if self._random.random() < self.config.continuation_rate:
+            target, first_value, second_value = (self._random.choice(variable_names) for _ in range(3))
+            self._emit(f"{target} = {first_value} + &")
+            self._emit(f"    {second_value} * 2")
+        else:
+            self._emit_statement(self._assignment(variable_names))
+
+    def _assignment(self, variable_names: List[str]) -> str:
+        """Returns a single line assignment statement."""
+
+        target = self._random.choice(variable_names)
+        value = self._random.choice(variable_names)
+
+        return f"{target} = {value} + {self._random.randint(1, 100)}"
+
+    def _emit_statement(self, statement: str) -> None:
+        """Emits a statement, possibly with a comment."""
+
+        if self._random.random() < self.config.comment_density:
+            if self._random.random() < 0.5:
+                self._emit(f"! Comment for: {statement}")
+            else:
+                statement += " ! trailing comment"
+
+        self._emit(statement)
+
+    def _emit(self, line: str) -> None:
+        """Adds a line to the file at the current indentation."""
+
+        self.lines.append("    " * self._indent + line)
+
+    def __repr__(self) -> str:
+        return build_repr_from_attributes(
+            target_object=self,
+            file_index=self.file_index,
+            lines=len(self.lines),
+        )
+
+
+def generate_corpus(output_dir: str, config: CorpusConfig) -> CorpusStats:
+    """Generates a synthetic Fortran 90 codebase.
+
+    The files are split across numbered directories, with the number of
+    files per directory set by the config. Generating a codebase with the
+    same config always gives identical files.
+
+    Args:
+        output_dir: The directory to write the codebase to. It is
+          created if it does not exist yet.
+        config: The settings used to generate the codebase.
+
+    Returns:
+        The number of files and lines generated.
+    """
+
+    line_count = 0
+    for file_index in range(config.file_count):
+        directory_path = os.path.join(output_dir, f"dir_{file_index // max(1, config.files_per_directory):04d}")
+        os.makedirs(directory_path, exist_ok=True)
+
+        lines = FortranFileGenerator(config, file_index).generate()
+        line_count += len(lines)
+        with open(os.path.join(directory_path, f"bench_{file_index:05d}.f90"), "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+    return CorpusStats(config.file_count, line_count)
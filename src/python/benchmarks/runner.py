@@ -0,0 +1,364 @@
+"""
+Runs the benchmark suite for the Fortran 90 code analyser.
+
+A synthetic Fortran 90 codebase is generated with the corpus generator,
+and then the file parser, Fortran file parsing, each CLI command and
+each serializer are timed against it. The results are output as JSON, so
+that runs from different versions of the analyser can be compared.
+
+Run the suite from the root of the project with:
+
+    PYTHONPATH=src/python python3 -m benchmarks.runner --help
+"""
+
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import click
+from click.testing import CliRunner
+
+from file_data_models.fortran_file import FortranFile
+from fortran_cli import cli
+from parsers.file_parser import FileParser
+from serializers import SerializerRegistry
+from utils.repr_builder import build_repr_from_attributes
+
+from .corpus_generator import CorpusConfig, CorpusStats, generate_corpus
+
+BENCHMARK_RESULTS_VERSION = 2
+
+# Every CLI command is run with each of its flag combinations that
+# change how much work the command does.
+CLI_COMMANDS = [
+    ["get-raw-contents"],
+    ["get-summary"],
+    ["get-summary", "--top-level-blocks", "--top-level-vars"],
+    ["list-all-variables"],
+    ["list-all-variables", "--no-duplicates"],
+]
+
+
+@dataclass
+class BenchmarkResult:
+    """The measurements taken for a single benchmark.
+
+    Attributes:
+        name: The name of the benchmark.
+        repeats: The number of times the benchmark was timed.
+        best_seconds: The fastest time taken by the benchmark.
+        mean_seconds: The average time taken by the benchmark.
+        lines_per_second: The number of corpus lines processed per second,
+          based on the fastest time.
+        files_per_second: The number of corpus files processed per second,
+          based on the fastest time.
+        peak_memory_bytes: The peak amount of memory allocated by Python
+          while the benchmark ran.
+    """
+
+    name: str
+    repeats: int
+    best_seconds: float
+    mean_seconds: float
+    lines_per_second: float
+    files_per_second: float
+    peak_memory_bytes: int
+
+
+@dataclass
+class MemoryResult:
+    """The memory held on to by the result of a benchmark.
+
+    Attributes:
+        name: The name of the benchmark.
+        retained_bytes: The memory allocated by Python that was still
+          held once the benchmark had finished.
+        bytes_per_line: The memory held for each corpus line.
+    """
+
+    name: str
+    retained_bytes: int
+    bytes_per_line: float
+
+
+class BenchmarkRunner:
+    """Times parts of the analyser against a generated codebase.
+
+    Each benchmark is timed several times, and then run once more with
+    memory tracing turned on to find its peak memory usage. Memory
+    tracing slows everything down, so it is kept out of the timed runs.
+    The memory held by the parsed codebase itself is measured separately,
+    as the size of the parsed objects for each line of Fortran.
+
+    Attributes:
+        corpus_dir: The directory holding the codebase to benchmark.
+        corpus_stats: The size of the codebase.
+        repeats: The number of times each benchmark is timed.
+        results: The results of the benchmarks run so far.
+        memory_results: The results of the memory benchmarks run so far.
+    """
+
+    def __init__(self, corpus_dir: str, corpus_stats: CorpusStats, repeats: int = 3) -> None:
+        """Initialises a benchmark runner.
+
+        Args:
+            corpus_dir: The directory holding the codebase to benchmark.
+            corpus_stats: The size of the codebase.
+            repeats: The number of times each benchmark is timed.
+        """
+
+        self.corpus_dir = corpus_dir
+        self.corpus_stats = corpus_stats
+        self.repeats = repeats
+        self.results: List[BenchmarkResult] = []
+        self.memory_results: List[MemoryResult] = []
+
+    def run_all(self) -> List[BenchmarkResult]:
+        """Runs every benchmark in the suite.
+
+        Returns:
+            The results of every benchmark.
+        """
+
+        self.benchmark_file_parser()
+        self.benchmark_fortran_file()
+        self.benchmark_cli_commands()
+        self.benchmark_serializers()
+        self.benchmark_parsed_memory()
+
+        return self.results
+
+    def benchmark_file_parser(self) -> None:
+        """Times parsing the whole codebase with the file parser."""
+
+        self.measure("file_parser.build_directory_tree", lambda: FileParser().build_directory_tree(self.corpus_dir))
+
+    def benchmark_fortran_file(self) -> None:
+        """Times parsing Fortran files, without reading them from disk."""
+
+        file_parser = FileParser()
+        file_contents = []
+        for dir_path, _, file_names in os.walk(self.corpus_dir):
+            for file_name in sorted(file_names):
+                file_path = os.path.join(dir_path, file_name)
+                file_contents.append((f"/{file_name}", list(file_parser.parse_file_contents(file_path))))
+
+        def parse_files() -> None:
+            for path_from_root, contents in file_contents:
+                FortranFile(path_from_root, contents)
+
+        self.measure("fortran_file.parse", parse_files)
+
+    def benchmark_cli_commands(self) -> None:
+        """Times each CLI command, including parsing the codebase."""
+
+        cli_runner = CliRunner()
+        for command in CLI_COMMANDS:
+
+            def run_command(command: List[str] = command) -> None:
+                result = cli_runner.invoke(cli, ["--code-path", self.corpus_dir, "--fortran-only", *command])
+                if result.exit_code != 0:
+                    raise RuntimeError(f"CLI command {command} failed: {result.output}") from result.exception
+
+            self.measure(f"cli.{' '.join(command)}", run_command)
+
+    def benchmark_serializers(self) -> None:
+        """Times each serializer's commands on an already parsed codebase."""
+
+        collected_files = FileParser().build_directory_tree(self.corpus_dir).get_all_files()
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            for output_format in SerializerRegistry.get_all_serializable_formats():
+                output_path = os.path.join(output_dir, f"output.{output_format}")
+                serializer = SerializerRegistry.get_serializer(output_format, output_path, collected_files)
+
+                prefix = f"serializer.{output_format}"
+                self.measure(f"{prefix}.get_raw_contents", serializer.serialize_get_raw_contents)
+                self.measure(f"{prefix}.get_summary", lambda: serializer.serialize_get_summary(False, False))
+                self.measure(f"{prefix}.list_all_variables", lambda: serializer.serialize_list_all_variables(True))
+
+    def benchmark_parsed_memory(self) -> None:
+        """Measures the memory held by the parsed codebase."""
+
+        self.measure_retained_memory(
+            "file_parser.build_directory_tree", lambda: FileParser().build_directory_tree(self.corpus_dir)
+        )
+
+    def measure(self, name: str, benchmark: Callable[[], Any]) -> BenchmarkResult:
+        """Times a benchmark and records its result.
+
+        Args:
+            name: The name of the benchmark.
+            benchmark: A function that runs the benchmark once.
+
+        Returns:
+            The result of the benchmark.
+        """
+
+        timings = []
+        for _ in range(self.repeats):
+            start_time = time.perf_counter()
+            benchmark()
+            timings.append(time.perf_counter() - start_time)
+
+        tracemalloc.start()
+        try:
+            benchmark()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        best_time = min(timings)
+        result = BenchmarkResult(
+            name=name,
+            repeats=self.repeats,
+            best_seconds=best_time,
+            mean_seconds=statistics.mean(timings),
+            lines_per_second=self.corpus_stats.line_count / best_time if best_time else 0.0,
+            files_per_second=self.corpus_stats.file_count / best_time if best_time else 0.0,
+            peak_memory_bytes=peak_memory,
+        )
+        self.results.append(result)
+
+        return result
+
+    def measure_retained_memory(self, name: str, benchmark: Callable[[], Any]) -> MemoryResult:
+        """Measures the memory held by the result of a benchmark.
+
+        Unlike the peak memory of a timed benchmark, this only counts the
+        memory still allocated once the benchmark has returned, while its
+        result is kept alive.
+
+        Args:
+            name: The name of the benchmark.
+            benchmark: A function that runs the benchmark once, and
+              returns the objects to measure.
+
+        Returns:
+            The result of the benchmark.
+        """
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            start_memory, _ = tracemalloc.get_traced_memory()
+            benchmark_output = benchmark()
+            gc.collect()
+            end_memory, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        del benchmark_output
+        retained_bytes = end_memory - start_memory
+        line_count = self.corpus_stats.line_count
+        result = MemoryResult(
+            name=name,
+            retained_bytes=retained_bytes,
+            bytes_per_line=retained_bytes / line_count if line_count else 0.0,
+        )
+        self.memory_results.append(result)
+
+        return result
+
+    def __repr__(self) -> str:
+        return build_repr_from_attributes(
+            target_object=self,
+            corpus_dir=self.corpus_dir,
+            repeats=self.repeats,
+        )
+
+
+def run_benchmarks(corpus_dir: str, config: CorpusConfig, repeats: int = 3) -> Dict[str, Any]:
+    """Generates a codebase and runs the benchmark suite against it.
+
+    Args:
+        corpus_dir: The directory to generate the codebase in.
+        config: The settings used to generate the codebase.
+        repeats: The number of times each benchmark is timed.
+
+    Returns:
+        A dictionary of the benchmark results, along with the details of
+        the codebase and environment they were measured with.
+    """
+
+    corpus_stats = generate_corpus(corpus_dir, config)
+
+    # The parser logs every file it parses, which would end up measuring
+    # how fast the terminal is rather than how fast the parser is.
+    parser_logger = logging.getLogger("FILE_PARSER")
+    log_level = parser_logger.level
+    parser_logger.setLevel(logging.WARNING)
+    runner = BenchmarkRunner(corpus_dir, corpus_stats, repeats)
+    try:
+        results = runner.run_all()
+    finally:
+        parser_logger.setLevel(log_level)
+
+    return {
+        "version": BENCHMARK_RESULTS_VERSION,
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+        },
+        "corpus": {**asdict(config), **asdict(corpus_stats)},
+        "results": [asdict(result) for result in results],
+        "memory": [asdict(result) for result in runner.memory_results],
+    }
+
+
+@click.command(epilog="The benchmark results are output as JSON.")
+@click.option("--output", type=click.Path(dir_okay=False, writable=True), help="A file to write the results to.")
+@click.option(
+    "--corpus-dir",
+    type=click.Path(file_okay=False, writable=True),
+    help="A directory to generate the codebase in. A temporary directory is used if not given.",
+)
+@click.option("--repeats", default=3, show_default=True, type=click.IntRange(min=1))
+@click.option("--file-count", default=CorpusConfig.file_count, show_default=True, type=click.IntRange(min=1))
+@click.option("--lines-per-file", default=CorpusConfig.lines_per_file, show_default=True, type=click.IntRange(min=1))
+@click.option("--nesting-depth", default=CorpusConfig.nesting_depth, show_default=True, type=click.IntRange(min=0))
+@click.option(
+    "--variables-per-declaration",
+    default=CorpusConfig.variables_per_declaration,
+    show_default=True,
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--continuation-rate",
+    default=CorpusConfig.continuation_rate,
+    show_default=True,
+    type=click.FloatRange(0, 1),
+)
+@click.option("--semicolon-rate", default=CorpusConfig.semicolon_rate, show_default=True, type=click.FloatRange(0, 1))
+@click.option("--comment-density", default=CorpusConfig.comment_density, show_default=True, type=click.FloatRange(0, 1))
+@click.option("--seed", default=CorpusConfig.seed, show_default=True, type=int)
+def main(output: Optional[str], corpus_dir: Optional[str], repeats: int, **config_options: Any) -> None:
+    """Runs the benchmark suite against a synthetic Fortran 90 codebase."""
+
+    config = CorpusConfig(**config_options)
+    if corpus_dir:
+        results = run_benchmarks(corpus_dir, config, repeats)
+    else:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            results = run_benchmarks(temp_dir, config, repeats)
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=4)
+    else:
+        json.dump(results, sys.stdout, indent=4)
+        click.echo()
+
+
+if __name__ == "__main__":
+    main()
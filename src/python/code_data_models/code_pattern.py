@@ -1,3 +1,6 @@
+import re
+from typing import Dict, List, Pattern, Tuple
+
 from code_data_models.variable import Variable
 
 # Replacing the whitespaces in the Fortran data types with [ \\t]+
@@ -62,3 +65,151 @@ class CodePatternRegex:
         rf"^\s*({ALL_RETURN_TYPES}|TYPE\(.*\)|CLASS\(.*\)).*::\s*\w{{1,31}}(\([\d:,]+\))?(\*\d+)?(\s*=.*)?"
         rf"(\s*,\s*\w{{1,31}}(\([\d:,]+\))?(\*\d+)?(\s*=.*)?)*\s*(!.*)?$"
     )
+
+
+# The block patterns in the order that a statement's matched patterns
+# have always been recorded in. The first pattern a statement matches is
+# the one pushed onto the parser stack, so this order must be kept.
+_ORDERED_BLOCK_PATTERNS = [
+    CodePattern.DO_LOOP,
+    CodePattern.DO_LOOP_END,
+    CodePattern.FUNCTION,
+    CodePattern.FUNCTION_END,
+    CodePattern.IF_BLOCK,
+    CodePattern.IF_BLOCK_END,
+    CodePattern.INTERFACE,
+    CodePattern.INTERFACE_END,
+    CodePattern.MODULE,
+    CodePattern.MODULE_END,
+    CodePattern.PROGRAM,
+    CodePattern.PROGRAM_END,
+    CodePattern.SUBROUTINE,
+    CodePattern.SUBROUTINE_END,
+    CodePattern.TYPE,
+    CodePattern.TYPE_END,
+]
+
+# Each block pattern is given its own bit, so that the patterns a
+# statement matches can be stored as a single int. The bits follow the
+# order above, so the patterns are always read back in that order.
+PATTERN_FLAGS: Dict[str, int] = {pattern: 1 << bit for bit, pattern in enumerate(_ORDERED_BLOCK_PATTERNS)}
+PATTERNS_BY_BIT: Tuple[str, ...] = tuple(_ORDERED_BLOCK_PATTERNS)
+END_PATTERN_FLAGS = sum(flag for pattern, flag in PATTERN_FLAGS.items() if CodePattern.END in pattern)
+
+_COMPILED_BLOCK_PATTERNS: Dict[str, Pattern[str]] = {
+    pattern: re.compile(getattr(CodePatternRegex, pattern), re.IGNORECASE) for pattern in _ORDERED_BLOCK_PATTERNS
+}
+
+# The patterns that can possibly match a statement, keyed by the word
+# the statement starts with. Statements starting with a statement label
+# are keyed by "LABEL", and the words that can follow an END are looked
+# up separately. A function declaration can be prefixed by almost
+# anything (return types, RECURSIVE, etc.) so it is not keyed here, and
+# is instead checked for any statement containing the word "function".
+_CANDIDATES_BY_START_WORD = {
+    "LABEL": [CodePattern.DO_LOOP, CodePattern.DO_LOOP_END, CodePattern.IF_BLOCK],
+    "abstract": [CodePattern.INTERFACE],
+    "do": [CodePattern.DO_LOOP],
+    "if": [CodePattern.IF_BLOCK],
+    "interface": [CodePattern.INTERFACE],
+    "module": [CodePattern.MODULE],
+    "program": [CodePattern.PROGRAM],
+    "recursive": [CodePattern.SUBROUTINE],
+    "subroutine": [CodePattern.SUBROUTINE],
+    "type": [CodePattern.TYPE],
+    "while": [CodePattern.DO_LOOP],
+}
+
+_CANDIDATES_BY_END_WORD = {
+    "": [CodePattern.MODULE_END, CodePattern.PROGRAM_END],
+    "do": [CodePattern.DO_LOOP_END],
+    "function": [CodePattern.FUNCTION_END],
+    "if": [CodePattern.IF_BLOCK_END],
+    "interface": [CodePattern.INTERFACE_END],
+    "module": [CodePattern.MODULE_END],
+    "program": [CodePattern.PROGRAM_END],
+    "subroutine": [CodePattern.SUBROUTINE_END],
+    "type": [CodePattern.TYPE_END],
+}
+
+
+_CandidatePatterns = Tuple[Tuple[str, Pattern[str]], ...]
+
+
+def _build_candidate_table(
+    candidates_by_word: Dict[str, List[str]]
+) -> Dict[str, Tuple[_CandidatePatterns, _CandidatePatterns]]:
+    """Pairs each set of candidates with its compiled patterns.
+
+    Each word maps to two tuples of (pattern, compiled_regex) pairs in
+    the original pattern order: one for statements without the word
+    "function" in them, and one with the FUNCTION pattern included.
+    """
+
+    table = {}
+    for word, candidates in candidates_by_word.items():
+        with_function = candidates + [CodePattern.FUNCTION]
+        table[word] = (
+            tuple((p, _COMPILED_BLOCK_PATTERNS[p]) for p in _ORDERED_BLOCK_PATTERNS if p in candidates),
+            tuple((p, _COMPILED_BLOCK_PATTERNS[p]) for p in _ORDERED_BLOCK_PATTERNS if p in with_function),
+        )
+
+    return table
+
+
+_START_WORD_TABLE = _build_candidate_table(_CANDIDATES_BY_START_WORD)
+_END_WORD_TABLE = _build_candidate_table(_CANDIDATES_BY_END_WORD)
+_NO_START_WORD = _build_candidate_table({"": []})[""]
+_ALL_BLOCK_PATTERNS = tuple(_COMPILED_BLOCK_PATTERNS.items())
+_START_WORDS = tuple(word for word in _CANDIDATES_BY_START_WORD if word != "LABEL")
+_END_WORDS = tuple(word for word in _CANDIDATES_BY_END_WORD if word != "")
+
+
+def match_code_patterns(statement: str) -> List[str]:
+    """Finds all the code block patterns that a statement matches.
+
+    Rather than trying every block pattern against the statement, the
+    word the statement starts with is used to pick out the few patterns
+    that could possibly match it. Most statements (assignments, calls,
+    etc.) do not start with any of these words, and so never need to be
+    checked against a regex at all.
+
+    Args:
+        statement: The contents of a single Fortran statement.
+
+    Returns:
+        A list of the CodePatterns matched by the statement, in the same
+        order as the patterns are declared in CodePattern.
+    """
+
+    # Case-insensitive regex matching also folds a handful of non-ASCII
+    # characters onto ASCII letters, so to be safe we fall back to
+    # checking every pattern for any statement that isn't pure ASCII.
+    if not statement.isascii():
+        return [pattern for pattern, regex in _ALL_BLOCK_PATTERNS if regex.match(statement)]
+
+    head = statement.lstrip().lower()
+    function_index = int("function" in head)
+
+    if head[:1].isdigit():
+        candidates = _START_WORD_TABLE["LABEL"][function_index]
+    elif head.startswith("end"):
+        end_word = head[3:].lstrip()
+        if not end_word or end_word.startswith("!"):
+            candidates = _END_WORD_TABLE[""][function_index]
+        else:
+            candidates = _NO_START_WORD[function_index]
+            for word in _END_WORDS:
+                if end_word.startswith(word):
+                    candidates = _END_WORD_TABLE[word][function_index]
+                    break
+    elif head.startswith(_START_WORDS):
+        candidates = _NO_START_WORD[function_index]
+        for word in _START_WORDS:
+            if head.startswith(word):
+                candidates = _START_WORD_TABLE[word][function_index]
+                break
+    else:
+        candidates = _NO_START_WORD[function_index]
+
+    return [pattern for pattern, regex in candidates if regex.match(statement)]
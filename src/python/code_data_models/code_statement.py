@@ -1,14 +1,19 @@
-from typing import List
+from typing import List, Optional
 
-from utils.comment_finder import find_comment
+from utils.comment_finder import find_comment, remove_comment_from_line
 from utils.repr_builder import build_repr_from_attributes
 
-from .code_pattern import CodePattern
+from .code_pattern import END_PATTERN_FLAGS, PATTERN_FLAGS, PATTERNS_BY_BIT
 
 
 class CodeStatement:
     """A single Fortran instruction.
 
+    A statement is made for every line of every parsed file, so it keeps
+    its fields in slots rather than a per-instance dict. The patterns it
+    matches are stored as a bitmask of PATTERN_FLAGS, which most
+    statements leave as zero.
+
     Attributes:
         line_number: The line number of the code statement in its parent
           file. Statements on the same line separated by semicolons will
@@ -20,28 +25,71 @@ class CodeStatement:
           comment.
     """
 
-    def __init__(self, line_number: int, content: str) -> None:
+    __slots__ = ("line_number", "content", "contains_comment", "_pattern_mask")
+
+    def __init__(self, line_number: int, content: str, contains_comment: Optional[bool] = None) -> None:
         """Initialises a code statement object.
 
         Args:
             line_number: The line number of the code statement in its
               parent file.
             content: The string contents of the statement.
+            contains_comment: Whether the statement includes a code
+              comment, if this is already known from lexing its line.
+              The statement is searched for a comment if not given.
         """
 
         self.line_number: int = line_number
         self.content: str = content
-        self.matched_patterns: List[CodePattern] = []
-        self.contains_comment: bool = find_comment(content) is not None
+        self.contains_comment: bool = (
+            find_comment(content) is not None if contains_comment is None else contains_comment
+        )
+        self._pattern_mask: int = 0
+
+    @property
+    def code(self) -> str:
+        """The content of the statement without its comment."""
+
+        # Most statements have no comment, so there's nothing to remove.
+        return remove_comment_from_line(self.content) if self.contains_comment else self.content
+
+    @property
+    def matched_patterns(self) -> List[str]:
+        """The CodePatterns matched by the statement, in declared order."""
+
+        matched_patterns = []
+        pattern_mask = self._pattern_mask
+        while pattern_mask:
+            lowest_flag = pattern_mask & -pattern_mask
+            matched_patterns.append(PATTERNS_BY_BIT[lowest_flag.bit_length() - 1])
+            pattern_mask ^= lowest_flag
+
+        return matched_patterns
+
+    def first_matched_pattern(self) -> Optional[str]:
+        """Returns the first CodePattern matched by the statement.
+
+        This is the same as the first of 'matched_patterns', but is read
+        straight from the lowest bit set, without building the list.
+
+        Returns:
+            The first pattern matched by the statement in declared order,
+            or None if the statement matches no patterns.
+        """
+
+        if not self._pattern_mask:
+            return None
+
+        return PATTERNS_BY_BIT[(self._pattern_mask & -self._pattern_mask).bit_length() - 1]
 
-    def add_pattern(self, pattern_type: CodePattern) -> None:
+    def add_pattern(self, pattern_type: str) -> None:
         """Adds a code pattern to the statement's matched patterns.
 
         Args:
-            pattern_type: The code pattern that the statement matches.
+            pattern_type: The CodePattern that the statement matches.
         """
 
-        self.matched_patterns.append(pattern_type)
+        self._pattern_mask |= PATTERN_FLAGS[pattern_type]
 
     def has_matched_patterns(self) -> bool:
         """Checks if the statement matches any Fortran code patterns.
@@ -51,7 +99,7 @@ class CodeStatement:
             matched for the statement, otherwise False.
         """
 
-        return len(self.matched_patterns) > 0
+        return self._pattern_mask != 0
 
     def is_end_statement(self) -> bool:
         """Checks if the statement matches any Fortran END statements.
@@ -61,7 +109,7 @@ class CodeStatement:
             pattern matched for the statement, otherwise False.
         """
 
-        return any(CodePattern.END in pattern for pattern in self.matched_patterns)  # type: ignore[operator]
+        return self._pattern_mask & END_PATTERN_FLAGS != 0
 
     def __repr__(self) -> str:
         return build_repr_from_attributes(
@@ -0,0 +1,88 @@
+from types import NotImplementedType
+from typing import Any, Iterator, List, Sequence, Union, overload
+
+from utils.repr_builder import build_repr_from_attributes
+
+from .code_statement import CodeStatement
+
+
+class CodeStatementView(Sequence[CodeStatement]):
+    """A read-only view of a range of statements in a list.
+
+    Code blocks use views of their parent file's statements rather than
+    copying the statements into a new list, so nested blocks don't end
+    up holding several copies of the same references. The view behaves
+    like a list of the statements in its range, and compares equal to
+    any sequence of the same statements. Like a list, a view is not
+    hashable.
+
+    Attributes:
+        statements: The full list of statements the view is taken from.
+        start: The index of the first statement in the view.
+        stop: The index after the final statement in the view.
+    """
+
+    def __init__(self, statements: List[CodeStatement], start: int = 0, stop: int = -1) -> None:
+        """Initialises a statement view.
+
+        Args:
+            statements: The full list of statements to take the view of.
+            start: The index of the first statement in the view.
+            stop: The index after the final statement in the view. A
+              negative value means the view runs to the end of the list.
+
+        Raises:
+            ValueError: The range is outside of the list of statements.
+        """
+
+        if stop < 0:
+            stop = len(statements)
+
+        if not 0 <= start <= stop <= len(statements):
+            raise ValueError("View range must be within the list of statements.")
+
+        self.statements = statements
+        self.start = start
+        self.stop = stop
+
+    @overload
+    def __getitem__(self, index: int) -> CodeStatement:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[CodeStatement]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[CodeStatement, Sequence[CodeStatement]]:
+        indices = range(self.start, self.stop)
+        if isinstance(index, slice):
+            sliced_indices = indices[index]
+            if sliced_indices.step != 1:
+                return [self.statements[i] for i in sliced_indices]
+
+            return CodeStatementView(
+                self.statements, sliced_indices.start, max(sliced_indices.start, sliced_indices.stop)
+            )
+
+        # Indexing the range takes care of negative indices and raises
+        # an IndexError for us when out of range.
+        return self.statements[indices[index]]
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __iter__(self) -> Iterator[CodeStatement]:
+        return map(self.statements.__getitem__, range(self.start, self.stop))
+
+    def __eq__(self, other: Any) -> Union[bool, NotImplementedType]:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return build_repr_from_attributes(
+            target_object=self,
+            start=self.start,
+            stop=self.stop,
+        )
@@ -1,7 +1,8 @@
-from typing import List
+from typing import List, Optional, Sequence, Union
 
-from .code_block import CodeBlock
+from .code_block import CodeBlock, VariableLoader
 from .code_statement import CodeStatement
+from .variable import Variable
 
 
 class FortranDoLoop(CodeBlock):
@@ -16,9 +17,14 @@ class FortranDoLoop(CodeBlock):
           block being instantiated.
     """
 
-    def __init__(self, parent_file_path: str, contents: List[CodeStatement], subprograms: List[CodeBlock]) -> None:
+    def __init__(
+        self,
+        parent_file_path: str,
+        contents: Sequence[CodeStatement],
+        subprograms: List[CodeBlock],
+        variables: Optional[Union[List[Variable], VariableLoader]] = None,
+    ) -> None:
         """Initialises a DO loop object."""
 
-        super().__init__(parent_file_path, contents)
-        self.variables = self._find_variable_declarations()
+        super().__init__(parent_file_path, contents, variables)
         self.subprograms = subprograms
@@ -1,7 +1,8 @@
 import re
-from typing import List
+from functools import cached_property
+from typing import List, Optional, Sequence, Union
 
-from .code_block import CodeBlock
+from .code_block import CodeBlock, VariableLoader
 from .code_statement import CodeStatement
 from .variable import Variable
 
@@ -21,16 +22,29 @@ class FortranFunction(CodeBlock):
           block being instantiated.
     """
 
-    def __init__(self, parent_file_path: str, contents: List[CodeStatement], subprograms: List[CodeBlock]) -> None:
+    def __init__(
+        self,
+        parent_file_path: str,
+        contents: Sequence[CodeStatement],
+        subprograms: List[CodeBlock],
+        variables: Optional[Union[List[Variable], VariableLoader]] = None,
+    ) -> None:
         """Initialises a function object."""
 
-        super().__init__(parent_file_path, contents)
-        self.block_name = self._find_block_name("FUNCTION")
-        self.variables = self._find_variable_declarations()
+        super().__init__(parent_file_path, contents, variables)
         self.subprograms = subprograms
 
-        start_line = self.contents[0].content
-        self.is_recursive = re.search(r"\bRECURSIVE\b", start_line, re.IGNORECASE) is not None
+    @cached_property
+    def block_name(self) -> str:
+        """The name given to the function."""
+
+        return self._find_block_name("FUNCTION")
+
+    @cached_property
+    def is_recursive(self) -> bool:
+        """Whether the function is declared as recursive or not."""
+
+        return re.search(r"\bRECURSIVE\b", self.contents[0].content, re.IGNORECASE) is not None
 
     def _find_block_name(self, block_type: str) -> str:
         """Parses the code block's name from its declaration.
@@ -1,7 +1,9 @@
-from typing import List
+from functools import cached_property
+from typing import List, Optional, Sequence, Union
 
-from .code_block import CodeBlock
+from .code_block import CodeBlock, VariableLoader
 from .code_statement import CodeStatement
+from .variable import Variable
 
 
 class FortranModule(CodeBlock):
@@ -17,10 +19,20 @@ class FortranModule(CodeBlock):
           block being instantiated.
     """
 
-    def __init__(self, parent_file_path: str, contents: List[CodeStatement], subprograms: List[CodeBlock]) -> None:
+    def __init__(
+        self,
+        parent_file_path: str,
+        contents: Sequence[CodeStatement],
+        subprograms: List[CodeBlock],
+        variables: Optional[Union[List[Variable], VariableLoader]] = None,
+    ) -> None:
         """Initialises a module object."""
 
-        super().__init__(parent_file_path, contents)
-        self.block_name = self._find_block_name("MODULE")
-        self.variables = self._find_variable_declarations()
+        super().__init__(parent_file_path, contents, variables)
         self.subprograms = subprograms
+
+    @cached_property
+    def block_name(self) -> str:
+        """The name given to the module."""
+
+        return self._find_block_name("MODULE")
@@ -1,8 +1,10 @@
 import re
-from typing import List
+from functools import cached_property
+from typing import List, Optional, Sequence, Union
 
-from .code_block import CodeBlock
+from .code_block import CodeBlock, VariableLoader
 from .code_statement import CodeStatement
+from .variable import Variable
 
 
 class FortranType(CodeBlock):
@@ -17,12 +19,21 @@ class FortranType(CodeBlock):
           attributes in the type.
     """
 
-    def __init__(self, parent_file_path: str, contents: List[CodeStatement]) -> None:
+    def __init__(
+        self,
+        parent_file_path: str,
+        contents: Sequence[CodeStatement],
+        variables: Optional[Union[List[Variable], VariableLoader]] = None,
+    ) -> None:
         """Initialises a type object."""
 
-        super().__init__(parent_file_path, contents)
-        self.block_name = self._find_block_name("TYPE")
-        self.variables = self._find_variable_declarations()
+        super().__init__(parent_file_path, contents, variables)
+
+    @cached_property
+    def block_name(self) -> str:
+        """The name given to the type."""
+
+        return self._find_block_name("TYPE")
 
     def _find_block_name(self, block_type: str) -> str:
         """Parses the code block's name from its declaration.
@@ -1,5 +1,6 @@
+import sys
 from types import NotImplementedType
-from typing import Any, List, Union
+from typing import Any, List, Tuple, Union
 
 from utils.repr_builder import build_repr_from_attributes
 
@@ -7,6 +8,10 @@ from utils.repr_builder import build_repr_from_attributes
 class Variable:
     """A representation of a variable in Fortran 90.
 
+    Variables keep their fields in slots rather than a per-instance dict.
+    The data type and file path are interned, so the many variables that
+    share them also share a single copy of each string.
+
     Attributes:
         ALL_DATA_TYPES: A list of all the possible built-in data types
           that a variable can have in Fortran 90.
@@ -36,6 +41,17 @@ class Variable:
         "TYPE",
     ]
 
+    __slots__ = (
+        "data_type",
+        "attributes",
+        "name",
+        "parent_file_path",
+        "line_declared",
+        "possibly_unused",
+        "is_array",
+        "is_pointer",
+    )
+
     def __init__(
         self,
         data_type: str,
@@ -48,10 +64,10 @@ class Variable:
     ):
         """Initialises a Variable object."""
 
-        self.data_type = data_type
+        self.data_type = sys.intern(data_type)
         self.attributes = attributes
         self.name = name
-        self.parent_file_path = parent_file_path
+        self.parent_file_path = sys.intern(parent_file_path)
         self.line_declared = line_declared
         self.possibly_unused = possibly_unused
         self.is_array = is_array
@@ -65,18 +81,39 @@ class Variable:
             parent_file_path=self.parent_file_path,
         )
 
-    def __eq__(self, other: Any) -> Union[bool, NotImplementedType]:
-        if not isinstance(other, Variable):
-            return NotImplemented
+    @property
+    def identity_key(self) -> Tuple[Any, ...]:
+        """A tuple of the attributes that identify the variable.
+
+        Two variables are equal when their identity keys are equal, and
+        the key is also what the variable's hash is based on. The key is
+        built from the variable's current attributes, so a variable
+        should not be changed while it is stored in a set or as a dict
+        key.
+        """
 
-        # We compare every attribute of the two variables, EXCEPT for
-        # the possibly_unused field. This is because larger program
-        # units may contain multiple subprograms that use the same local
+        # Every attribute of the variable is included, EXCEPT for the
+        # possibly_unused field. This is because larger program units
+        # may contain multiple subprograms that use the same local
         # variable names, and therefore there is a small chance that
         # larger program units may incorrectly mark an unused variable
         # as used, resulting in the same variable having two different
         # possibly_unused values depending on its parent code block.
-        self_dict = {k: v for k, v in self.__dict__.items() if k != "possibly_unused"}
-        other_dict = {k: v for k, v in other.__dict__.items() if k != "possibly_unused"}
+        return (
+            self.data_type,
+            tuple(self.attributes),
+            self.name,
+            self.parent_file_path,
+            self.line_declared,
+            self.is_array,
+            self.is_pointer,
+        )
+
+    def __eq__(self, other: Any) -> Union[bool, NotImplementedType]:
+        if not isinstance(other, Variable):
+            return NotImplemented
+
+        return self.identity_key == other.identity_key
 
-        return self_dict == other_dict
+    def __hash__(self) -> int:
+        return hash(self.identity_key)
@@ -0,0 +1,290 @@
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from utils.repr_builder import build_repr_from_attributes
+from utils.string_splitter import split_outside_quotes
+
+from .code_pattern import CodePatternRegex
+from .code_statement import CodeStatement
+from .variable import Variable
+
+# Matches each run of characters that could make up a Fortran name.
+IDENTIFIER_REGEX = re.compile(r"\w+")
+
+VARIABLE_DECLARATION_REGEX = re.compile(CodePatternRegex.VARIABLE_DECLARATION, re.IGNORECASE)
+
+
+class VariableParser:
+    """Finds the variables declared in a sequence of code statements.
+
+    Every statement is checked for variable declarations once, no matter
+    how many code blocks the statement ends up being part of. The
+    parser can then also check where a variable's name is used in the
+    statements, so that the code blocks that own a variable can work out
+    if it is possibly unused.
+
+    Attributes:
+        statements: The code statements to parse.
+        parent_file_path: The path to the Fortran 90 file the statements
+          are in.
+    """
+
+    def __init__(self, statements: Sequence[CodeStatement], parent_file_path: str) -> None:
+        """Initialises a variable parser.
+
+        Args:
+            statements: The code statements to parse.
+            parent_file_path: The path to the Fortran 90 file the
+              statements are in.
+        """
+
+        self.statements = statements
+        self.parent_file_path = parent_file_path
+        self._declarations: Optional[List[Tuple[int, List[Variable]]]] = None
+        self._claimed_indices: Set[int] = set()
+        self._identifier_index: Optional[Tuple[Dict[str, List[int]], List[int]]] = None
+
+    def find_declarations(self) -> List[Tuple[int, List[Variable]]]:
+        """Parses the statements to find all the variables declared.
+
+        Parses through all the statements and matches any that contain
+        variable declarations. The declaration is then parsed to deduce
+        what type of variables are being declared, any additional
+        attributes given as part of the declaration, the amount of
+        variables being declared, and any initial values assigned to the
+        variable(s).
+
+        The variables are initially marked as possibly unused, as this
+        depends on the code block that ends up owning them. See
+        'is_used'.
+
+        Returns:
+            A list of tuples (index, variables), where 'index' is the
+            index of a declaration statement and 'variables' is a list of
+            the variables it declares. The list is ordered by index.
+        """
+
+        if self._declarations is not None:
+            return self._declarations
+
+        self._declarations = []
+        for index, statement in enumerate(self.statements):
+            if VARIABLE_DECLARATION_REGEX.match(statement.content):
+                self._declarations.append((index, self._parse_declaration(statement)))
+
+        return self._declarations
+
+    def claim_variables(self, start_index: int, end_index: int) -> List[Variable]:
+        """Gets the variables declared in a code block's statements.
+
+        Code blocks must claim their variables innermost first, i.e. in
+        the order their END statements appear. Any declarations in the
+        range that haven't been claimed by a nested block yet belong to
+        the block claiming them, so their variables are checked against
+        the rest of the block to see if there is a chance they are
+        unused. Variables already claimed by a nested block keep what
+        was worked out for their own scope, so the returned list is
+        built from the nested blocks' variables rather than parsed again.
+
+        Args:
+            start_index: The index of the block's first statement.
+            end_index: The index of the block's final statement.
+
+        Returns:
+            A list of all the variables declared in the range of
+            statements (inclusive), in the order they were declared.
+        """
+
+        declarations = self.find_declarations()
+        first = bisect_left(declarations, start_index, key=lambda declaration: declaration[0])
+        last = bisect_right(declarations, end_index, key=lambda declaration: declaration[0])
+
+        block_variables = []
+        for position in range(first, last):
+            declaration_index, variables = declarations[position]
+            if position not in self._claimed_indices:
+                self._claimed_indices.add(position)
+                for variable in variables:
+                    variable.possibly_unused = not self.is_used(variable.name, declaration_index + 1, end_index)
+
+            block_variables.extend(variables)
+
+        return block_variables
+
+    def is_used(self, variable_name: str, start_index: int, end_index: int) -> bool:
+        """Checks if a variable's name is used in a range of statements.
+
+        Args:
+            variable_name: The name of the variable.
+            start_index: The index of the first statement to check.
+            end_index: The index of the final statement to check.
+
+        Returns:
+            A boolean that is True when the variable's name appears in
+            any of the statements in the range (inclusive), otherwise
+            False.
+        """
+
+        if start_index > end_index:
+            return False
+
+        identifier_positions, non_ascii_indices = self._get_identifier_index()
+
+        if variable_name.isascii() and IDENTIFIER_REGEX.fullmatch(variable_name):
+            # FORTRAN variable names are case insensitive, so we can
+            # ignore casing during this search.
+            positions = identifier_positions.get(variable_name.lower(), [])
+            next_position = bisect_right(positions, start_index - 1)
+            if next_position < len(positions) and positions[next_position] <= end_index:
+                return True
+
+            first_non_ascii = bisect_right(non_ascii_indices, start_index - 1)
+            last_non_ascii = bisect_right(non_ascii_indices, end_index)
+            indices_to_search = non_ascii_indices[first_non_ascii:last_non_ascii]
+        else:
+            # Names that aren't a single identifier can't be looked up in
+            # the index, so we fall back to searching every statement.
+            indices_to_search = list(range(start_index, end_index + 1))
+
+        if not indices_to_search:
+            return False
+
+        name_regex = re.compile(rf"\b{re.escape(variable_name)}\b", re.IGNORECASE)
+        return any(name_regex.search(self.statements[index].content) for index in indices_to_search)
+
+    def _get_identifier_index(self) -> Tuple[Dict[str, List[int]], List[int]]:
+        """Indexes where each identifier in the statements is used.
+
+        Every statement is split into its identifiers once, so checking
+        whether a variable is used in a range of statements becomes a
+        lookup rather than a regex search over every statement.
+
+        Returns:
+            A tuple (identifier_positions, non_ascii_indices), where
+            'identifier_positions' maps each lowercase identifier to the
+            ordered indices of the statements that use it, and
+            'non_ascii_indices' lists the indices of any statements
+            containing non-ASCII characters. Case-insensitive matching
+            can treat some non-ASCII characters as ASCII letters, so
+            these statements are not indexed and are searched directly
+            instead.
+        """
+
+        if self._identifier_index is not None:
+            return self._identifier_index
+
+        identifier_positions: Dict[str, List[int]] = defaultdict(list)
+        non_ascii_indices = []
+
+        for index, statement in enumerate(self.statements):
+            if not statement.content.isascii():
+                non_ascii_indices.append(index)
+                continue
+
+            for identifier in set(IDENTIFIER_REGEX.findall(statement.content.lower())):
+                identifier_positions[identifier].append(index)
+
+        self._identifier_index = (identifier_positions, non_ascii_indices)
+        return self._identifier_index
+
+    def _parse_declaration(self, statement: CodeStatement) -> List[Variable]:
+        """Parses the variables declared in a declaration statement."""
+
+        found_variables = []
+        line_content = statement.code
+
+        declaration_parts = split_outside_quotes(line_content, "::")
+        # Variables can have various attributes that follow the data
+        # type, but these aren't required
+        data_type, attributes = self._parse_variable_type_and_attributes(declaration_parts[0])
+
+        variable_list = re.sub(r"\(.*,.*\)", "()", declaration_parts[1], re.IGNORECASE)
+        for variable in split_outside_quotes(variable_list, ","):
+            is_array = any("DIMENSION" in attribute for attribute in attributes)
+            # Split on the "=" sign in case a value is assigned to the
+            # variable on the same line
+            variable_parts = split_outside_quotes(variable, "=")
+            variable_name = variable_parts[0].strip()
+            # This next bit was added after seeing that arrays with their
+            # length declared as part of the variable name, ended up
+            # storing the name with the length part still on the end of
+            # it... so now we search for it and remove.
+            if re.search(r"\([\d:,]*\)", variable_name) is not None:
+                is_array = True
+                bracket_index = variable_name.index("(")
+                variable_name = variable_name[:bracket_index]
+
+            found_variables.append(
+                Variable(
+                    data_type=data_type,
+                    attributes=attributes,
+                    name=variable_name,
+                    parent_file_path=self.parent_file_path,
+                    line_declared=statement.line_number,
+                    possibly_unused=True,
+                    is_array=is_array,
+                )
+            )
+
+        return found_variables
+
+    def _parse_variable_type_and_attributes(self, type_and_attr_string: str) -> Tuple[str, List[str]]:
+        """Parses the first half of a variable declaration.
+
+        Parses the elements of a Fortran variable declaration before the
+        '::' part to figure out what data type and attributes are
+        included as part of the variable declaration.
+
+        Args:
+            type_and_attr_string: The first part of a Fortran variable
+              declaration (before the '::').
+
+        Returns:
+            A tuple (data_type, attributes) where 'data_type' is the
+            Fortran data type detected for the declaration, and
+            'attributes' is a list of the variable attributes included
+            after the data type.
+        """
+
+        # This function draws some inspiration from the comment finder
+        # util, in that we need to parse the data type and attributes of
+        # a variable to find commas that are NOT inside of an attribute,
+        # e.g. inside the DIMENSION attribute. We can then split on the
+        # commas found.
+        if "," not in type_and_attr_string:
+            return type_and_attr_string.strip().upper(), []
+
+        type_and_attr_parts = []
+        open_bracket_count = 0
+        start_of_slice = 0
+
+        for i in range(len(type_and_attr_string)):
+            if (current_char := type_and_attr_string[i]) not in (",", "(", ")"):
+                continue
+            elif current_char == "(":
+                open_bracket_count += 1
+            elif current_char == ")":
+                open_bracket_count -= 1
+            elif open_bracket_count == 0:
+                type_and_attr_parts.append(type_and_attr_string[start_of_slice:i].strip().upper())
+                # index i is on a comma at this point, and we're not
+                # that interested in keeping it so add 1 to the new
+                # slice starting point
+                start_of_slice = i + 1
+
+        # Add the final split piece
+        type_and_attr_parts.append(type_and_attr_string[start_of_slice:].strip().upper())
+
+        # The same few attributes are declared over and over, so each
+        # variable shares one copy of every attribute name.
+        return type_and_attr_parts[0], [sys.intern(attribute) for attribute in type_and_attr_parts[1:]]
+
+    def __repr__(self) -> str:
+        return build_repr_from_attributes(
+            target_object=self,
+            parent_file_path=self.parent_file_path,
+            statements=len(self.statements),
+        )
@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 
 from utils.repr_builder import build_repr_from_attributes
 
@@ -14,6 +15,8 @@ class DigitalFile:
           supposed to be a child instance of this class (FortranFile),
           but parsing failed and so it fell back to being a DigitalFile
           instance.
+        content_hash: A SHA-256 hash of the file's contents as they were
+          parsed, or None if the file was not parsed from disk.
     """
 
     def __init__(self, path_from_root: str, failed_fortran_parse: bool = False) -> None:
@@ -31,6 +34,7 @@ class DigitalFile:
         self.path_from_root: str = path_from_root
         self.file_name = os.path.split(self.path_from_root)[1]
         self.failed_fortran_parse = failed_fortran_parse
+        self.content_hash: Optional[str] = None
 
     def __repr__(self) -> str:
         return build_repr_from_attributes(
@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional, Self, Union
+from typing import Dict, Iterator, List, Optional, Self, Tuple, Union
 
 from utils.repr_builder import build_repr_from_attributes
 
@@ -9,8 +9,15 @@ from .fortran_file import FortranFile
 class Directory:
     """A computer directory that can contain files and subdirectories.
 
+    Looking up an item by its name takes constant time. Items deeper in
+    the directory can also be looked up by their path with 'get_by_path'.
+    The first lookup by path builds an index of every item below the
+    directory, which is then kept up to date as items are added to or
+    removed from the directory and its subdirectories.
+
     Attributes:
         name: The name of the directory.
+        parent: The directory this directory is inside of, if any.
         subdirectories: A dict of directories, where the key is the name
           of the directory.
         files: A dict of files, where the key is the name of the file.
@@ -27,10 +34,13 @@ class Directory:
         """
 
         self.name: str = name
+        self.parent: Optional[Self] = None
+        self._path_index: Optional[Dict[str, Union[DigitalFile, Self]]] = None
 
         self.subdirectories: Dict[str, Self] = {}
         for subdir in subdirectories:
             self.subdirectories[subdir.name] = subdir
+            subdir.parent = self
 
         self.files: Dict[str, DigitalFile] = {}
         for file_obj in files:
@@ -49,6 +59,8 @@ class Directory:
 
         if not self._name_is_taken(subdir.name):
             self.subdirectories[subdir.name] = subdir
+            subdir.parent = self
+            self._update_path_indexes(subdir.name, subdir, True)
         else:
             raise KeyError(f"Item with name '{subdir.name}' already exists inside of directory '{self.name}'.")
 
@@ -65,9 +77,37 @@ class Directory:
 
         if not self._name_is_taken(file_obj.file_name):
             self.files[file_obj.file_name] = file_obj
+            self._update_path_indexes(file_obj.file_name, file_obj, True)
         else:
             raise KeyError(f"Item with name '{file_obj.file_name}' already exists inside of directory '{self.name}'.")
 
+    def replace_file(self, file_obj: DigitalFile) -> DigitalFile:
+        """Replaces a file in the directory with a new version of it.
+
+        The new file takes the old file's place, so the order of the
+        files in the directory is unchanged.
+
+        Args:
+            file_obj: The file object to replace the file of the same
+              name with.
+
+        Returns:
+            The replaced file.
+
+        Raises:
+            KeyError: There is no file in the directory with the same
+              name as the provided file.
+        """
+
+        if file_obj.file_name not in self.files:
+            raise KeyError(f"There is no file with name '{file_obj.file_name}' inside of directory '{self.name}'.")
+
+        old_file = self.files[file_obj.file_name]
+        self.files[file_obj.file_name] = file_obj
+        self._update_path_indexes(file_obj.file_name, file_obj, True)
+
+        return old_file
+
     def get_item(self, key: str) -> Optional[Union[DigitalFile, Self]]:
         """Returns an item with the provided key from the directory.
 
@@ -83,11 +123,89 @@ class Directory:
             key, or None.
         """
 
-        all_items = {}
-        all_items.update(self.subdirectories)
-        all_items.update(self.files)  # type: ignore[arg-type]
+        if key in self.files:
+            return self.files[key]
+
+        return self.subdirectories.get(key)
+
+    def get_by_path(self, path: str) -> Optional[Union[DigitalFile, Self]]:
+        """Returns an item from anywhere in the directory by its path.
+
+        Args:
+            path: The path to the item from the directory, with each part
+              separated by a '/', e.g. 'shapes/circle.f90'. A leading '/'
+              is ignored, so a file's 'path_from_root' can be used to
+              look it up from the root of the codebase.
+
+        Returns:
+            The file or subdirectory at the path, or None if there is no
+            item at the path.
+        """
+
+        if self._path_index is None:
+            self._path_index = dict(self._walk_items(""))
+
+        return self._path_index.get(path.strip("/"))
+
+    def remove_item(self, key: str) -> Union[DigitalFile, Self]:
+        """Removes an item with the provided key from the directory.
+
+        Args:
+            key: The name of the file or subdirectory to remove.
+
+        Returns:
+            The removed file or subdirectory.
+
+        Raises:
+            KeyError: There are no items in the directory that match the
+              key.
+        """
+
+        item: Union[DigitalFile, Self]
+        if key in self.files:
+            item = self.files.pop(key)
+        elif key in self.subdirectories:
+            item = self.subdirectories.pop(key)
+            item.parent = None
+        else:
+            raise KeyError(f"There is no item with name '{key}' inside of directory '{self.name}'.")
+
+        self._update_path_indexes(key, item, False)
+
+        return item
+
+    def iter_fortran_files(self) -> Iterator[FortranFile]:
+        """Lazily yields all the Fortran files in the directory.
+
+        The files are yielded in the same order as 'get_all_fortran_files'
+        returns them.
+
+        Yields:
+            Each Fortran file found in the current directory and any
+            subdirectories.
+        """
+
+        for file_obj in self.iter_files():
+            if isinstance(file_obj, FortranFile):
+                yield file_obj
+
+    def iter_files(self) -> Iterator[DigitalFile]:
+        """Lazily yields all the files in the directory.
 
-        return all_items.get(key)
+        The files directly in a directory are yielded before the files in
+        its subdirectories, in the same order as 'get_all_files' returns
+        them.
+
+        Yields:
+            Each file found in the current directory and any
+            subdirectories.
+        """
+
+        pending = [self]
+        while pending:
+            current = pending.pop()
+            yield from current.files.values()
+            pending.extend(reversed(current.subdirectories.values()))
 
     def get_all_fortran_files(self) -> List[FortranFile]:
         """Returns a list of all the Fortran files in the directory.
@@ -102,11 +220,7 @@ class Directory:
             any subdirectories.
         """
 
-        fortran_files = [file_obj for file_obj in self.files.values() if isinstance(file_obj, FortranFile)]
-        for subdir in self.subdirectories.values():
-            fortran_files += subdir.get_all_fortran_files()
-
-        return fortran_files
+        return list(self.iter_fortran_files())
 
     def get_all_files(self) -> List[DigitalFile]:
         """Returns a list of all the files in the directory.
@@ -121,21 +235,55 @@ class Directory:
             subdirectories.
         """
 
-        all_files = [file_obj for file_obj in self.files.values()]
-        for subdir in self.subdirectories.values():
-            all_files += subdir.get_all_files()
-
-        return all_files
+        return list(self.iter_files())
 
     def _name_is_taken(self, name: str) -> bool:
         """Checks for the existence of a given name in the directory."""
 
-        all_names = list(self.subdirectories.keys()) + list(self.files.keys())
+        return name in self.files or name in self.subdirectories
 
-        if name in all_names:
-            return True
-        else:
-            return False
+    def _walk_items(self, path: str) -> Iterator[Tuple[str, Union[DigitalFile, Self]]]:
+        """Yields the path and item of everything below the directory."""
+
+        prefix = f"{path}/" if path else ""
+        for file_name, file_obj in self.files.items():
+            yield prefix + file_name, file_obj
+
+        for subdir_name, subdir in self.subdirectories.items():
+            yield prefix + subdir_name, subdir
+            yield from subdir._walk_items(prefix + subdir_name)
+
+    def _update_path_indexes(self, name: str, item: Union[DigitalFile, Self], is_added: bool) -> None:
+        """Adds an item to, or removes it from, every built path index.
+
+        The item's path is worked out relative to each directory it is
+        inside of, and changed in the index of each one that has built an
+        index.
+        """
+
+        path_indexes = []
+        directory: Optional[Directory] = self
+        path_prefix = ""
+        while directory is not None:
+            if directory._path_index is not None:
+                path_indexes.append((path_prefix, directory._path_index))
+
+            path_prefix = f"{directory.name}/{path_prefix}"
+            directory = directory.parent
+
+        if not path_indexes:
+            return
+
+        items: List[Tuple[str, Union[DigitalFile, Directory]]] = [(name, item)]
+        if isinstance(item, Directory):
+            items.extend(item._walk_items(name))
+
+        for path_prefix, path_index in path_indexes:
+            for item_path, indexed_item in items:
+                if is_added:
+                    path_index[path_prefix + item_path] = indexed_item
+                else:
+                    path_index.pop(path_prefix + item_path, None)
 
     def __repr__(self) -> str:
         return build_repr_from_attributes(
@@ -0,0 +1,72 @@
+from typing import Iterable, Iterator, Optional
+
+from utils.repr_builder import build_repr_from_attributes
+
+from .digital_file import DigitalFile
+from .fortran_file import FortranFile
+
+
+class FileStream:
+    """Parsed files that are passed on one at a time, as they are parsed.
+
+    A stream can only be read once. No reference to a file is kept after
+    it has been passed on, so each file can be freed as soon as whatever
+    is reading the stream is done with it. The number of files of each
+    kind is counted as they pass, and is complete once the stream has
+    been read.
+
+    Attributes:
+        file_count: The number of files read so far.
+        fortran_file_count: The number of Fortran files read so far,
+          including the files that failed parsing.
+        failed_parse_count: The number of Fortran files read so far that
+          failed parsing.
+    """
+
+    def __init__(self, files: Iterable[DigitalFile]) -> None:
+        """Initialises a stream of files.
+
+        Args:
+            files: The files of the stream. These are normally generated
+              lazily, as each file is parsed.
+        """
+
+        self._files: Optional[Iterator[DigitalFile]] = iter(files)
+        self._is_read = False
+        self.file_count = 0
+        self.fortran_file_count = 0
+        self.failed_parse_count = 0
+
+    @property
+    def is_read(self) -> bool:
+        """Whether every file of the stream has been read."""
+
+        return self._is_read
+
+    def __iter__(self) -> Iterator[DigitalFile]:
+        """Reads the files of the stream.
+
+        Raises:
+            RuntimeError: The stream has already been read.
+        """
+
+        if self._files is None:
+            raise RuntimeError("The files of a stream can only be read once.")
+
+        files, self._files = self._files, None
+
+        for file_obj in files:
+            self.file_count += 1
+            self.fortran_file_count += isinstance(file_obj, FortranFile) + file_obj.failed_fortran_parse
+            self.failed_parse_count += file_obj.failed_fortran_parse
+
+            yield file_obj
+
+        self._is_read = True
+
+    def __repr__(self) -> str:
+        return build_repr_from_attributes(
+            target_object=self,
+            file_count=self.file_count,
+            is_read=self.is_read,
+        )
@@ -1,9 +1,11 @@
-import re
-from typing import Iterable, List, Union
+from bisect import bisect_left, bisect_right
+from functools import partial
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 
-from code_data_models.code_block import CodeBlock
-from code_data_models.code_pattern import CodePattern, CodePatternRegex
+from code_data_models.code_block import CodeBlock, VariableLoader
+from code_data_models.code_pattern import CodePattern, match_code_patterns
 from code_data_models.code_statement import CodeStatement
+from code_data_models.code_statement_view import CodeStatementView
 from code_data_models.fortran_do_loop import FortranDoLoop
 from code_data_models.fortran_function import FortranFunction
 from code_data_models.fortran_if_block import FortranIfBlock
@@ -12,9 +14,13 @@ from code_data_models.fortran_module import FortranModule
 from code_data_models.fortran_program import FortranProgram
 from code_data_models.fortran_subroutine import FortranSubroutine
 from code_data_models.fortran_type import FortranType
+from code_data_models.variable import Variable
+from code_data_models.variable_parser import VariableParser
 from parsers.code_parser_stack import CodeParserStack
-from utils.comment_finder import find_comment, remove_comment_from_line
+from parsers.parse_level import ParseLevel
+from utils.line_lexer import LexedLine, lex_line
 from utils.repr_builder import build_repr_from_attributes
+from utils.string_splitter import split_outside_quotes
 
 from .digital_file import DigitalFile
 
@@ -29,6 +35,42 @@ CODE_BLOCKS_THAT_SUPPORT_SUBPROGRAMS = [
 ]
 
 
+class _VariableClaims:
+    """Claims the variables of a file's code blocks when first needed.
+
+    The variable parser needs code blocks to claim their variables
+    innermost first. Each block is given a loader for its variables, and
+    the first time a block's variables are needed, it and every block
+    before it in that order claim their variables together.
+    """
+
+    def __init__(self, variable_parser: VariableParser) -> None:
+        self._variable_parser: Optional[VariableParser] = variable_parser
+        self._block_ranges: List[Tuple[int, int]] = []
+        self._claimed_variables: List[List[Variable]] = []
+
+    def add_block(self, start_index: int, stop_index: int) -> VariableLoader:
+        """Adds the next block to claim its variables, and returns its loader."""
+
+        self._block_ranges.append((start_index, stop_index))
+        return partial(self._claim_variables, len(self._block_ranges) - 1)
+
+    def _claim_variables(self, position: int) -> List[Variable]:
+        """Claims the variables of every block up to the one at a position."""
+
+        while len(self._claimed_variables) <= position:
+            assert self._variable_parser is not None
+            start_index, stop_index = self._block_ranges[len(self._claimed_variables)]
+            self._claimed_variables.append(self._variable_parser.claim_variables(start_index, stop_index - 1))
+
+        # Once every block has claimed its variables, the parser and the
+        # index of the statements it built are no longer needed.
+        if len(self._claimed_variables) == len(self._block_ranges):
+            self._variable_parser = None
+
+        return self._claimed_variables[position]
+
+
 class FortranFile(DigitalFile):
     """A file with the .f90 extension. Stores Fortran 90 code.
 
@@ -37,33 +79,45 @@ class FortranFile(DigitalFile):
           the codebase.
         contents: A list of all the lines of code in the file.
         components: The detected code blocks that make up the file.
+        parse_level: How far the file's contents have been parsed. The
+          components are only detected from the BLOCKS level onwards,
+          and the components' variables from the VARIABLES level.
     """
 
-    def __init__(self, path_from_root: str, contents: Iterable[str] = []) -> None:
+    def __init__(
+        self,
+        path_from_root: str,
+        contents: Iterable[str] = [],
+        parse_level: ParseLevel = ParseLevel.VARIABLES,
+    ) -> None:
         """Initialises a Fortran file object.
 
         Args:
             path_from_root: The path to the file, starting from the root
               of the codebase.
             contents: The lines of code that make up the file.
+            parse_level: How far to parse the file's contents.
         """
 
         super().__init__(path_from_root)
-        contents = self._join_continued_lines(contents)  # type: ignore[assignment]
+        self.parse_level = parse_level
         self.contents: List[CodeStatement] = []
-        for line in contents:
-            line_number = line[0]
-            line_content = line[1]
-            # This stops several commands on one line being counted as a
-            # single statement.
-            all_statements = self._split_statements(line_content)
 
-            for statement in all_statements:
-                # Line numbers in almost all editors start at 1, hence
-                # the increment of index here.
-                self.contents.append(CodeStatement(line_number, statement))
+        if parse_level == ParseLevel.RAW_LINES:
+            # Line numbers in almost all editors start at 1, hence the
+            # start value here.
+            self.contents.extend(
+                CodeStatement(number, raw_line.rstrip("\r\n")) for number, raw_line in enumerate(contents, start=1)
+            )
+        else:
+            for line_number, line in self._join_continued_lines(contents):
+                # This stops several commands on one line being counted
+                # as a single statement.
+                self.contents.extend(self._split_statements(line_number, line))
 
-        self.components: List[CodeBlock] = self._parse_code_blocks()
+        self.components: List[CodeBlock] = []
+        if parse_level >= ParseLevel.BLOCKS:
+            self.components = self._parse_code_blocks()
 
     def get_snippet(self, start_line: int, end_line: int) -> List[CodeStatement]:
         """Returns a slice of the file's contents.
@@ -91,12 +145,9 @@ class FortranFile(DigitalFile):
         if start_line < 1 or end_line < 1:
             raise ValueError("Line numbers cannot be less than 1.")
 
-        statements_in_range = []
-        for statement in self.contents:
-            if start_line <= statement.line_number <= end_line:
-                statements_in_range.append(statement)
+        start_index, stop_index = self._find_statement_range(start_line, end_line)
 
-        return statements_in_range
+        return self.contents[start_index:stop_index]
 
     def _parse_code_blocks(self) -> List[CodeBlock]:
         """Analyses the file's contents and creates code block objects.
@@ -107,33 +158,19 @@ class FortranFile(DigitalFile):
         into their respective blocks and added to a list of 'components'
         that make up the file.
 
+        Variable declarations are parsed once for the whole file, the
+        first time any block's variables are used. Each variable belongs
+        to the innermost block it is declared in, and the blocks
+        containing that block share the same variable object rather than
+        parsing the declaration again.
+
         Returns:
             A list of code blocks that make up the Fortran file.
         """
 
-        code_patterns = [
-            (CodePattern.DO_LOOP, CodePatternRegex.DO_LOOP),
-            (CodePattern.DO_LOOP_END, CodePatternRegex.DO_LOOP_END),
-            (CodePattern.FUNCTION, CodePatternRegex.FUNCTION),
-            (CodePattern.FUNCTION_END, CodePatternRegex.FUNCTION_END),
-            (CodePattern.IF_BLOCK, CodePatternRegex.IF_BLOCK),
-            (CodePattern.IF_BLOCK_END, CodePatternRegex.IF_BLOCK_END),
-            (CodePattern.INTERFACE, CodePatternRegex.INTERFACE),
-            (CodePattern.INTERFACE_END, CodePatternRegex.INTERFACE_END),
-            (CodePattern.MODULE, CodePatternRegex.MODULE),
-            (CodePattern.MODULE_END, CodePatternRegex.MODULE_END),
-            (CodePattern.PROGRAM, CodePatternRegex.PROGRAM),
-            (CodePattern.PROGRAM_END, CodePatternRegex.PROGRAM_END),
-            (CodePattern.SUBROUTINE, CodePatternRegex.SUBROUTINE),
-            (CodePattern.SUBROUTINE_END, CodePatternRegex.SUBROUTINE_END),
-            (CodePattern.TYPE, CodePatternRegex.TYPE),
-            (CodePattern.TYPE_END, CodePatternRegex.TYPE_END),
-        ]
-
         for line in self.contents:
-            for pattern, pattern_regex in code_patterns:
-                if re.match(pattern_regex, line.content, re.IGNORECASE):
-                    line.add_pattern(pattern)
+            for pattern in match_code_patterns(line.content):
+                line.add_pattern(pattern)
 
         stack = CodeParserStack()
         all_code_block_types = {
@@ -148,27 +185,40 @@ class FortranFile(DigitalFile):
         }
 
         found_components = []
+        # Blocks are given empty variable lists when the file isn't being
+        # parsed as far as its variables.
+        variable_claims = None
+        if self.parse_level >= ParseLevel.VARIABLES:
+            variable_claims = _VariableClaims(VariableParser(self.contents, self.path_from_root))
 
         for line in self.contents:
-            if not line.has_matched_patterns():
+            first_pattern = line.first_matched_pattern()
+            if first_pattern is None:
                 continue
 
-            if not line.is_end_statement() and line.has_matched_patterns():
-                stack.push(line.matched_patterns[0], line.line_number)
+            if not line.is_end_statement():
+                stack.push(first_pattern, line.line_number)
 
             if line.is_end_statement():
                 block_type, start_line, subprograms = stack.pop()
-                block_contents = self.get_snippet(start_line, line.line_number)
+                # The block gets a view of the file's statements rather
+                # than a copy of them, like the one get_snippet returns.
+                start_index, stop_index = self._find_statement_range(start_line, line.line_number)
+                block_contents = CodeStatementView(self.contents, start_index, stop_index)
+                variables: Union[List[Variable], VariableLoader] = (
+                    variable_claims.add_block(start_index, stop_index) if variable_claims else []
+                )
+
                 new_block_type = all_code_block_types[block_type]
                 if new_block_type in CODE_BLOCKS_THAT_SUPPORT_SUBPROGRAMS:
-                    block_object = new_block_type(self.path_from_root, block_contents, subprograms)
+                    block_object = new_block_type(self.path_from_root, block_contents, subprograms, variables)
                 else:
                     # Something has went wrong in our parsing logic if
                     # the stack item we popped is for a type of code
                     # block that doesn't support subprograms, but we
                     # somehow ended up with subprograms anyway...
                     assert subprograms == []
-                    block_object = new_block_type(self.path_from_root, block_contents)
+                    block_object = new_block_type(self.path_from_root, block_contents, variables)
 
                 if stack.peek() is not None:
                     stack.add_subprogram_to_top_item(block_object)
@@ -178,100 +228,114 @@ class FortranFile(DigitalFile):
         assert stack.is_empty
         return found_components  # A non-empty stack means a code block has not been resolved somewhere
 
-    def _split_statements(self, line: str) -> List[str]:
+    def _find_statement_range(self, start_line: int, end_line: int) -> Tuple[int, int]:
+        """Finds the indices of the statements in a range of lines.
+
+        The statements are always in line number order, so the range can
+        be found with a binary search rather than checking every
+        statement in the file.
+
+        Args:
+            start_line: The number of the first line in the range.
+            end_line: The final line number in the range.
+
+        Returns:
+            A tuple (start_index, stop_index), where 'start_index' is the
+            index of the first statement in the range and 'stop_index' is
+            the index after the final statement in the range.
+        """
+
+        start_index = bisect_left(self.contents, start_line, key=lambda statement: statement.line_number)
+        stop_index = bisect_right(self.contents, end_line, lo=start_index, key=lambda statement: statement.line_number)
+
+        return start_index, stop_index
+
+    def _split_statements(self, line_number: int, line: LexedLine) -> List[CodeStatement]:
         """Splits statements separated by semicolons into a list."""
 
-        # We will remove comments, split the line using ";", and then
-        # add the comment back. This is to avoid any comments getting
+        comment = line.comment or ""
+        code = line.code
+
+        # A line without any semicolons to split on is a single statement,
+        # which contains a comment if the line does.
+        if not line.separators:
+            return [CodeStatement(line_number, (code + comment).strip(), line.comment is not None)]
+
+        # We split the line without its comment using ";", and then add
+        # the comment back. This is to avoid any comments getting
         # unnecessarily split.
-        comment = find_comment(line)
-        if comment:
-            line = line.replace(comment, "")
+        statement_list = split_outside_quotes(code, ";", keep_unsplit_string=True)
+        statement_list[-1] += comment
 
-        if line:
-            statement_list = self._split_outside_quotes(line, ";")
-        else:
-            statement_list = [line]
+        return [CodeStatement(line_number, statement.strip()) for statement in statement_list]
 
-        statement_list[-1] += comment or ""
+    def _join_continued_lines(self, contents: Iterable[str]) -> Iterator[Tuple[int, LexedLine]]:
+        """Joins lines connected by a continuation character.
 
-        return [line.strip() for line in statement_list]
+        The lines are joined as they are read, so the contents of the file
+        are never held in memory in full. A complete line is only yielded
+        once the next one has been read, as that line may start with a
+        continuation character. Each line is lexed once, and only lines
+        built by joining other lines together are lexed again.
 
-    def _join_continued_lines(self, contents: Iterable[str]) -> List[List[Union[int, str]]]:  # type: ignore[type-arg]
-        """Joins lines connected by a continuation character."""
+        Raises:
+            ValueError: The first line continues a previous line, or the
+              last line continues on to a next line.
+        """
 
         # This helper function works like str.strip(), but leaves one
         # whitespace in places where there may be excessive whitespace.
         def reduce_whitespace(full_string: str) -> str:
             return " ".join(full_string.split())
 
-        enumerated_contents = list(enumerate(contents))
-        indexed_lines: List[List[int, str]] = [list(item) for item in enumerated_contents]  # type: ignore[type-arg]
-        clean_contents = []
-
-        for i in range(len(indexed_lines)):
-            index, line = indexed_lines[i]
-            line = line.strip()
-
-            if "&" not in remove_comment_from_line(line):
-                clean_contents.append([index + 1, line])
-                continue
+        def complete_line(line_number: int, line: str, lexed_line: Optional[LexedLine]) -> Tuple[int, LexedLine]:
+            return line_number, lexed_line or lex_line(line)
 
-            line = remove_comment_from_line(line)
+        # The last complete line, held back until the next one is read,
+        # and the start of a line that continues on to the next line.
+        held_line: Optional[Tuple[int, str, Optional[LexedLine]]] = None
+        carried_line: Optional[str] = None
 
-            if line.endswith("&"):
+        for line_number, line in enumerate(contents, start=1):
+            if carried_line is not None:
                 # This is very hacky... but it stops accidental duping
                 # or loss of lines when a line ending with '&' comes
                 # before a line starting with '&'.
-                if indexed_lines[i + 1][1].strip().startswith("&"):
-                    indexed_lines[i + 1][1] = indexed_lines[i + 1][1].strip()[1:]
+                if line.strip().startswith("&"):
+                    line = line.strip()[1:]
+
+                line = reduce_whitespace(carried_line + line)
+                carried_line = None
+
+            line = line.strip()
+            lexed_line = lex_line(line)
 
-                # Place AHEAD in ORIGINAL list.
-                indexed_lines[i + 1][1] = reduce_whitespace(line[:-1] + indexed_lines[i + 1][1])
+            if "&" not in lexed_line.code:
+                if held_line is not None:
+                    yield complete_line(*held_line)
+
+                held_line = (line_number, line, lexed_line)
                 continue
 
-            if line.startswith("&"):
-                # Place BEHIND in NEW list.
-                clean_contents[-1][1] = reduce_whitespace(clean_contents[-1][1] + line[1:])
+            if lexed_line.continues_on_next_line:
+                # Carried AHEAD to the next line read.
+                carried_line = lexed_line.code[:-1]
                 continue
 
-        return clean_contents
-
-    def _split_outside_quotes(self, string_to_split: str, delimiter: str) -> List[str]:
-        """Splits a string, ignoring delimiters inside quotes."""
-
-        split_parts = []
-        # Set and unset as we enter and exit quotes
-        active_quote_char = None
-        quote_chars = ("'", '"')
-        start_of_slice = 0
-
-        for i in range(len(string_to_split)):
-            current_str = string_to_split[start_of_slice:i]
-            reverse = current_str[::-1]
-
-            if delimiter == reverse[: len(delimiter)] and active_quote_char is None:
-                # Reaching here means we found our delimiter outside
-                # quotes
-                split_parts.append(string_to_split[start_of_slice : (i - len(delimiter))])
-                start_of_slice = i
-
-            if string_to_split[i] in quote_chars and active_quote_char is None:
-                active_quote_char = string_to_split[i]
-            elif active_quote_char is not None:
-                if string_to_split[i] == active_quote_char:
-                    active_quote_char = None
-
-        # Due to the fact that in our loop we check if we need to split,
-        # THEN we check if we have left a quoted string, if the supplied
-        # string argument ends with a quote character, we have to do one
-        # final check outside the loop to see if a split is needed.
-        if string_to_split[start_of_slice:][-1] in quote_chars or start_of_slice == 0:
-            split_parts.append(string_to_split[start_of_slice:])
-        else:
-            split_parts.extend(string_to_split[start_of_slice:].split(delimiter))
+            if lexed_line.continues_previous_line:
+                if held_line is None:
+                    raise ValueError("The first line of code cannot continue a previous line.")
+
+                # Joined BEHIND to the held line. The joined line is lexed
+                # again once it is complete.
+                held_line = (held_line[0], reduce_whitespace(held_line[1] + lexed_line.code[1:]), None)
+                continue
+
+        if carried_line is not None:
+            raise ValueError("The last line of code cannot continue on to a next line.")
 
-        return split_parts
+        if held_line is not None:
+            yield complete_line(*held_line)
 
     def __repr__(self) -> str:
         return build_repr_from_attributes(
@@ -13,17 +13,26 @@ the project.
 """
 
 import os
-from collections import defaultdict
+import sqlite3
 from configparser import ConfigParser
-from typing import Dict
+from typing import Callable, List, Optional, Tuple, Union
 
 import click
 
-from code_data_models.code_block import CodeBlock
-from code_data_models.variable import Variable
+from file_data_models.digital_file import DigitalFile
+from file_data_models.file_stream import FileStream
 from file_data_models.fortran_file import FortranFile
+from parsers.directory_watcher import DirectoryWatcher
 from parsers.file_parser import FileParser
+from parsers.git_repository import GitRepository
+from parsers.parse_cache import ParseCache
+from parsers.parse_level import ParseLevel
+from parsers.path_filter import PathFilter
+from reports.report_builder import ReportBuilder
+from reports.report_models import ComponentListing, FileCounts
 from serializers import SerializerRegistry
+from storage.scan_history import ScanHistory
+from storage.sqlite_store import SQLiteStore
 
 
 def check_output_path_file_extension(output_format: str, output_path: str) -> None:
@@ -39,6 +48,31 @@ def check_output_path_file_extension(output_format: str, output_path: str) -> No
         )
 
 
+def requires_parse_level(parse_level: Optional[ParseLevel]) -> Callable[[click.Command], click.Command]:
+    """Sets how far a command needs the found Fortran files parsed.
+
+    The files are parsed before the command runs, so the CLI group uses
+    this to avoid parsing any further than the command needs. Commands
+    without a parse level get fully parsed files, and commands with a
+    parse level of None don't have a codebase parsed at all.
+    """
+
+    def decorator(command: click.Command) -> click.Command:
+        setattr(command, "parse_level", parse_level)
+        return command
+
+    return decorator
+
+
+def echo_file_counts(file_counts: FileCounts) -> None:
+    click.echo()
+    click.echo("Codebase parsed. \n")
+    click.echo(f"# of files: {file_counts.file_count}")
+    click.echo(f"# of FORTRAN files: {file_counts.fortran_file_count}")
+    click.echo(f"# of FORTRAN files that failed parsing: {file_counts.failed_parse_count}")
+    click.echo()
+
+
 def read_from_config(ctx: click.Context, param: click.Option, filename: str) -> None:
     cfg = ConfigParser()
     cfg.read(filename)
@@ -65,9 +99,7 @@ def read_from_config(ctx: click.Context, param: click.Option, filename: str) ->
 @click.option(
     "--code-path",
     envvar="FORTRAN_CODE_PATH",
-    help="The full path to the codebase/file you wish to parse.",
-    prompt=True,
-    required=True,
+    help="The full path to the codebase/file you wish to parse. You are prompted for it if not given.",
     type=click.Path(exists=True, resolve_path=True),
 )
 @click.option(
@@ -99,37 +131,211 @@ def read_from_config(ctx: click.Context, param: click.Option, filename: str) ->
     help="Excludes non-FORTRAN files from parsing.",
     is_flag=True,
 )
+@click.option(
+    "--include",
+    envvar="FORTRAN_INCLUDE",
+    help="Only parses the files matching a glob pattern, e.g. 'src/**'. Can be given more than once.",
+    multiple=True,
+)
+@click.option(
+    "--exclude",
+    envvar="FORTRAN_EXCLUDE",
+    help="Skips the files and directories matching a glob pattern, e.g. 'build/'. Can be given more than once.",
+    multiple=True,
+)
+@click.option(
+    "--gitignore",
+    envvar="FORTRAN_GITIGNORE",
+    help="Skips the files and directories ignored by .gitignore files, along with the .git directory.",
+    is_flag=True,
+)
+@click.option(
+    "--jobs",
+    default=1,
+    envvar="FORTRAN_JOBS",
+    help="The number of processes to use when parsing a codebase.",
+    show_default=True,
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--cache-dir",
+    envvar="FORTRAN_CACHE_DIR",
+    help="A directory to cache parsed FORTRAN files in, so that unchanged files are not parsed again on later runs.",
+    type=click.Path(file_okay=False, writable=True, resolve_path=True),
+)
+@click.option(
+    "--cache-max-size",
+    default=512,
+    envvar="FORTRAN_CACHE_MAX_SIZE",
+    help="The maximum size of the parse cache in megabytes.",
+    show_default=True,
+    type=click.IntRange(min=0),
+)
+@click.option(
+    "--multi-document",
+    envvar="YAML_MULTI_DOCUMENT",
+    help="Writes YAML output as a stream of documents, with one document for each file.",
+    is_flag=True,
+)
+@click.option(
+    "--history-db",
+    envvar="FORTRAN_HISTORY_DB",
+    help="A SQLite database to record each scan in, so that scans can be compared with the diff command.",
+    type=click.Path(dir_okay=False, writable=True, resolve_path=True),
+)
+@click.option(
+    "--since",
+    envvar="FORTRAN_SINCE",
+    help="Only parses the files that changed since a git revision, including uncommitted changes.",
+    metavar="REV",
+)
+@click.option(
+    "--rev-range",
+    envvar="FORTRAN_REV_RANGE",
+    help="Only parses the files that changed between two git revisions, reading them from git without a checkout.",
+    metavar="A..B",
+)
+@click.option(
+    "--stream",
+    envvar="FORTRAN_STREAM",
+    help="Parses and outputs the files one at a time, so that only one parsed file is held in memory at once.",
+    is_flag=True,
+)
 @click.pass_context
-def cli(ctx: click.Context, code_path: str, output_format: str, output_path: str, fortran_only: bool) -> None:
+def cli(
+    ctx: click.Context,
+    code_path: Optional[str],
+    output_format: str,
+    output_path: str,
+    fortran_only: bool,
+    include: Tuple[str, ...],
+    exclude: Tuple[str, ...],
+    gitignore: bool,
+    jobs: int,
+    cache_dir: str,
+    cache_max_size: int,
+    multi_document: bool,
+    history_db: Optional[str],
+    since: Optional[str],
+    rev_range: Optional[str],
+    stream: bool,
+) -> None:
     ctx.ensure_object(dict)
+    ctx.obj["history_db"] = history_db
     if output_format or output_path:
         check_output_path_file_extension(output_format, output_path)
 
-    parser = FileParser()
-    if os.path.isdir(code_path):
-        codebase = parser.build_directory_tree(code_path, fortran_only)
+    if multi_document and (output_format or "").lower() != "yaml":
+        raise click.BadParameter("Multi-document output can only be used with the YAML output format.")
+
+    if since and rev_range:
+        raise click.BadParameter("Only one of --since and --rev-range can be used at a time.")
+
+    if since and ".." in since:
+        raise click.BadParameter("Revision ranges must be given with --rev-range rather than --since.")
+
+    if rev_range:
+        try:
+            GitRepository.split_revision_range(rev_range)
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+
+        # The scan history hashes the files on disk, which are not the
+        # files parsed for a revision range.
+        if history_db:
+            raise click.BadParameter("Scans of a revision range cannot be recorded in the scan history.")
+
+    # Only the changed files are parsed, so recording the scan would
+    # mark every other file as removed.
+    if since and history_db:
+        raise click.BadParameter("Scans of only the changed files cannot be recorded in the scan history.")
+
+    # Recording a scan reads the collected files a second time, and a
+    # stream can only be read once.
+    if stream and history_db:
+        raise click.BadParameter("Streamed scans cannot be recorded in the scan history.")
+
+    # The files only need to be parsed as far as the command being run
+    # needs them.
+    command = cli.get_command(ctx, ctx.invoked_subcommand) if ctx.invoked_subcommand else None
+    parse_level = getattr(command, "parse_level", ParseLevel.VARIABLES)
+    if parse_level is None:
+        return
+
+    # Recording a scan needs the code blocks and variables of each file.
+    if history_db:
+        parse_level = ParseLevel.VARIABLES
+
+    if code_path is None:
+        code_path = click.prompt("Code path", type=click.Path(exists=True, resolve_path=True))
+
+    cache = ParseCache(cache_dir, cache_max_size * 1024 * 1024) if cache_dir else None
+    parser = FileParser(cache, parse_level, PathFilter(include, exclude, gitignore))
+    collected_files: Union[List[DigitalFile], FileStream]
+    if revisions := since or rev_range:
+        if not os.path.isdir(code_path):
+            raise click.BadParameter("The --code-path option must be a directory to only parse the changed files.")
+
+        try:
+            collected_files = parser.collect_changed_files(code_path, revisions, fortran_only)
+        except ValueError as e:
+            raise click.BadParameter(f"The changed files could not be found with git: {str(e)}")
+    elif stream and os.path.isdir(code_path):
+        # The files are only parsed as the command reads them.
+        collected_files = FileStream(parser.iter_directory_files(code_path, fortran_only, jobs))
+    elif os.path.isdir(code_path):
+        codebase = parser.build_directory_tree(code_path, fortran_only, jobs)
         collected_files = codebase.get_all_files()
+        # The watch command keeps the tree up to date as files change.
+        ctx.obj["codebase"] = (parser, codebase, code_path, fortran_only)
     else:
         collected_files = [parser.parse_file(code_path)]
 
+    if stream and not isinstance(collected_files, FileStream):
+        collected_files = FileStream(collected_files)
+
+    # The results of each command are built once by the report builder,
+    # and then either printed or rendered by the serializer.
+    report_builder = ReportBuilder(collected_files)
+    ctx.obj["reports"] = report_builder
+
     if output_format:
-        serializer = SerializerRegistry.get_serializer(output_format.lower(), output_path, collected_files)
+        serializer_options = {"multi_document": True} if multi_document else {}
+        serializer = SerializerRegistry.get_serializer(
+            output_format.lower(), output_path, collected_files, report_builder=report_builder, **serializer_options
+        )
         ctx.obj["serializer"] = serializer
     else:
         ctx.obj["files"] = collected_files
 
-    file_count = len(collected_files)
-    failed_parse_count = sum(item.failed_fortran_parse for item in collected_files)
-    fortran_file_count = sum(isinstance(item, FortranFile) for item in collected_files) + failed_parse_count
+    if isinstance(collected_files, FileStream):
+        file_stream = collected_files
 
-    click.echo()
-    click.echo("Codebase parsed. \n")
-    click.echo(f"# of files: {file_count}")
-    click.echo(f"# of FORTRAN files: {fortran_file_count}")
-    click.echo(f"# of FORTRAN files that failed parsing: {failed_parse_count}")
-    click.echo()
+        # The files are counted as the command reads them, so the counts
+        # are shown once the command is done.
+        def finish_stream() -> None:
+            if cache is not None:
+                cache.evict()
+            if file_stream.is_read:
+                echo_file_counts(report_builder.build_file_counts())
+
+        ctx.call_on_close(finish_stream)
+        return
+
+    if cache is not None:
+        cache.evict()
+
+    echo_file_counts(report_builder.build_file_counts())
 
+    if history_db:
+        with ScanHistory(history_db) as history:
+            scan = history.record_scan(code_path, collected_files)
 
+        click.echo(f"Scan recorded in the scan history with the ID {scan.scan_id}.")
+        click.echo()
+
+
+@requires_parse_level(ParseLevel.STATEMENTS)
 @cli.command(short_help="Obtains the raw contents of the found Fortran file(s).")
 @click.pass_context
 def get_raw_contents(ctx: click.Context) -> None:
@@ -152,6 +358,7 @@ def get_raw_contents(ctx: click.Context) -> None:
         click.echo()
 
 
+@requires_parse_level(ParseLevel.VARIABLES)
 @cli.command(short_help="Counts the amount of code blocks, variables and comments in the found Fortran file(s).")
 @click.option(
     "--top-level-blocks",
@@ -182,65 +389,20 @@ def get_summary(ctx: click.Context, top_level_blocks: bool, top_level_vars: bool
 
         return
 
-    comment_count = 0
-    found_blocks = []
-    found_variables = []
-
-    for file_obj in ctx.obj["files"]:
-        if isinstance(file_obj, FortranFile):
-            found_blocks.extend(file_obj.components)
-            comment_count += sum(line.contains_comment for line in file_obj.contents)
+    summary = ctx.obj["reports"].build_summary(top_level_blocks, top_level_vars)
 
-    if not top_level_blocks:
-        subprograms = []
-        for code_block in found_blocks:
-            subprograms.extend(code_block.get_all_subprograms())
-
-        found_blocks.extend(subprograms)
-
-    if not top_level_blocks or top_level_vars:
-        for block in found_blocks:
-            if hasattr(block, "variables") and hasattr(block, "subprograms"):
-                found_variables.extend(block.get_variables_not_in_subprograms())
-    else:
-        for block in found_blocks:
-            if hasattr(block, "variables"):
-                found_variables.extend(block.variables)
-
-    block_counts: Dict[str, int] = defaultdict(int)
-    for block in found_blocks:
-        class_name = type(block).__name__
-        block_counts[class_name] += 1
-
-    variable_counts = {}
-    for var_type in Variable.ALL_DATA_TYPES:
-        # We do 'in' instead of '==' here since some data types can have
-        # extra information as part of the type declaration, e.g
-        # 'INTEGER(I8)'.
-        variable_counts[var_type] = sum(var_type in var.data_type for var in found_variables)
-
-    click.echo(f"# of comments: {comment_count}")
-
-    CODE_BLOCK_KEYS = [
-        "FortranDoLoop",
-        "FortranFunction",
-        "FortranIfBlock",
-        "FortranInterface",
-        "FortranModule",
-        "FortranProgram",
-        "FortranSubroutine",
-        "FortranType",
-    ]
+    click.echo(f"# of comments: {summary.comment_count}")
 
     click.echo("\nCode blocks found:")
-    for block_type in CODE_BLOCK_KEYS:
-        click.echo(f"\t{block_type}: {block_counts[block_type]}")
+    for block_type, count in summary.block_counts.items():
+        click.echo(f"\t{block_type}: {count}")
 
     click.echo("\nVariables found:")
-    for var_type, count in variable_counts.items():
+    for var_type, count in summary.variable_counts.items():
         click.echo(f"\t{var_type}: {count}")
 
 
+@requires_parse_level(ParseLevel.VARIABLES)
 @cli.command(short_help="Lists all the variables in the found Fortran file(s).")
 @click.option(
     "--no-duplicates",
@@ -267,65 +429,192 @@ def list_all_variables(ctx: click.Context, no_duplicates: bool) -> None:
 
         return
 
-    def print_component_info(component: CodeBlock, indent_level: int = 0) -> None:
+    def print_component_info(component: ComponentListing, indent_level: int = 0) -> None:
         indent = "\t" * indent_level
 
-        class_name = type(component).__name__
-        block_type = class_name.replace("Fortran", "")
-        has_subprograms = getattr(component, "subprograms", []) != []
-
         component_info = ""
 
-        if getattr(component, "is_recursive", None):
-            component_info += f"Recursive {block_type.lower()} "
+        if component.is_recursive:
+            component_info += f"Recursive {component.block_type.lower()} "
         else:
-            component_info += f"{block_type} "
+            component_info += f"{component.block_type} "
 
-        if block_name := getattr(component, "block_name", None):
-            component_info += f"'{block_name}' "
+        if component.block_name:
+            component_info += f"'{component.block_name}' "
 
         component_info += f"from line {component.start_line_number} to {component.end_line_number};"
 
         click.echo(f"{indent}\t{component_info}")
 
-        if hasattr(component, "variables"):
-            if has_subprograms and no_duplicates:
-                variable_list = component.get_variables_not_in_subprograms()
-            else:
-                variable_list = component.variables
-
-            if variable_list:
-                click.echo(f"{indent}\tVARIABLES")
-                for var in variable_list:
-                    click.echo(f"{indent}\t\t{var.data_type} '{var.name}' declared on line {var.line_declared};")
+        if component.variables:
+            click.echo(f"{indent}\tVARIABLES")
+            for var in component.variables:
+                click.echo(f"{indent}\t\t{var.data_type} '{var.name}' declared on line {var.line_declared};")
 
-                click.echo()
+            click.echo()
 
-        if has_subprograms:
+        if component.subprograms:
             click.echo(f"{indent}\tSUBPROGRAMS")
             for subprogram in component.subprograms:
                 print_component_info(subprogram, indent_level + 1)
 
-    collected_files = ctx.obj["files"]
-
-    for file_obj in collected_files:
-        is_fortran_file = isinstance(file_obj, FortranFile) or file_obj.failed_fortran_parse
+    for file_listing in ctx.obj["reports"].build_file_listings(no_duplicates):
+        is_fortran_file = file_listing.components is not None or file_listing.failed_fortran_parse
         initial_message = "> FORTRAN file" if is_fortran_file else "> File"
-        initial_message += f" '{file_obj.path_from_root}'"
-        if file_obj.failed_fortran_parse:
+        initial_message += f" '{file_listing.path_from_root}'"
+        if file_listing.failed_fortran_parse:
             initial_message += "\n\tFile parse failed during collection."
-        if not isinstance(file_obj, FortranFile):
+        if file_listing.components is None:
             initial_message += "\n"
 
         click.echo(initial_message)
 
-        if isinstance(file_obj, FortranFile):
-            click.echo(f"> Number of components in file: {len(file_obj.components)}")
+        if file_listing.components is not None:
+            click.echo(f"> Number of components in file: {len(file_listing.components)}")
             click.echo("> Components in file:")
-            for component in file_obj.components:
+            for component in file_listing.components:
                 print_component_info(component)
                 click.echo()
 
 
+@cli.command(
+    short_help="Re-runs a command whenever the found Fortran file(s) change.",
+    context_settings={"ignore_unknown_options": True},
+)
+@click.argument(
+    "command_name",
+    metavar="COMMAND",
+    type=click.Choice(["get-raw-contents", "get-summary", "list-all-variables"]),
+)
+@click.argument("command_args", metavar="[COMMAND OPTIONS]...", nargs=-1, type=click.UNPROCESSED)
+@click.option(
+    "--interval",
+    default=1.0,
+    envvar="WATCH_INTERVAL",
+    help="How often to check for changed files in seconds, when inotify is not available.",
+    show_default=True,
+    type=click.FloatRange(min=0, min_open=True),
+)
+@click.pass_context
+def watch(ctx: click.Context, command_name: str, command_args: Tuple[str, ...], interval: float) -> None:
+    """Runs a command, and runs it again whenever the codebase changes.
+
+    The parsed codebase is kept in memory, and only the files that were
+    added, modified or removed are parsed again before the command's
+    output is updated. Any options for the command are given after its
+    name, e.g. 'watch get-summary --top-level-blocks'. Press Ctrl+C to
+    stop watching.
+    """
+
+    if ctx.obj["reports"].is_streaming:
+        raise click.UsageError("A streamed scan cannot be watched for changes.")
+
+    if "codebase" not in ctx.obj:
+        raise click.UsageError("The --code-path option must be a directory to watch it for changes.")
+
+    command = cli.get_command(ctx, command_name)
+    assert command is not None
+    with command.make_context(command_name, list(command_args), parent=ctx) as command_ctx:
+        # The watcher takes the state of the files as it starts, so it is
+        # started before the command runs to not miss any changes.
+        with DirectoryWatcher(*ctx.obj["codebase"]) as watcher:
+            command.invoke(command_ctx)
+
+            click.echo()
+            click.echo(f"Watching '{watcher.dir_path}' for changes. Press Ctrl+C to stop.")
+
+            try:
+                while True:
+                    changes = watcher.wait_for_changes(interval)
+                    collected_files = watcher.directory_tree.get_all_files()
+                    ctx.obj["reports"].update_files(collected_files, changes.old_files, changes.new_files)
+                    if serializer := ctx.obj.get("serializer"):
+                        serializer.collected_files = collected_files
+                    else:
+                        ctx.obj["files"] = collected_files
+
+                    click.echo()
+                    click.echo(
+                        f"Files changed: {len(changes.added_files)} added, "
+                        f"{len(changes.modified_files)} modified, {len(changes.removed_files)} removed.\n"
+                    )
+                    command.invoke(command_ctx)
+            except KeyboardInterrupt:
+                click.echo()
+                click.echo("Stopped watching.")
+
+
+@requires_parse_level(None)
+@cli.command(short_help="Runs a read-only SQL query against results stored with the SQLite output format.")
+@click.argument("sql")
+@click.option(
+    "--database",
+    envvar="SQLITE_DATABASE_PATH",
+    help="The SQLite database to query, created by running a command with the 'sqlite' output format.",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, resolve_path=True),
+)
+def query(sql: str, database: str) -> None:
+    try:
+        with SQLiteStore.open_read_only(database) as store:
+            columns, rows = store.query(sql)
+            click.echo("\t".join(columns))
+            for row in rows:
+                click.echo("\t".join("" if value is None else str(value) for value in row))
+    except sqlite3.Error as e:
+        click.echo(f"There was an error while running the query: {str(e)}")
+
+
+@requires_parse_level(None)
+@cli.command(short_help="Compares two scans recorded in the scan history.")
+@click.argument("old_scan_id", required=False, type=int)
+@click.argument("new_scan_id", required=False, type=int)
+@click.pass_context
+def diff(ctx: click.Context, old_scan_id: Optional[int], new_scan_id: Optional[int]) -> None:
+    """Compares two scans recorded in the scan history.
+
+    Lists the files, code blocks and variables that were added, removed
+    or changed between the scans. If no scan IDs are given, the two most
+    recent scans are compared, and if only one is given it is compared
+    with the most recent scan.
+    """
+
+    history_db = ctx.obj["history_db"]
+    if not history_db or not os.path.isfile(history_db):
+        raise click.UsageError("The --history-db option must be the path to an existing scan history.")
+
+    CHANGE_SYMBOLS = {"added": "+", "removed": "-", "changed": "~"}
+
+    try:
+        with ScanHistory(history_db) as history:
+            scan_ids = [scan.scan_id for scan in history.get_scans()]
+            if new_scan_id is None:
+                if len(scan_ids) < 2:
+                    click.echo("At least two scans must be recorded in the scan history to compare them.")
+                    return
+
+                new_scan_id = scan_ids[-1]
+                if old_scan_id is None:
+                    old_scan_id = scan_ids[-2]
+
+            assert old_scan_id is not None
+            scan_diff = history.diff(old_scan_id, new_scan_id)
+    except (KeyError, ValueError) as e:
+        click.echo(f"There was an error while comparing the scans: {str(e.args[0])}")
+        return
+
+    click.echo(f"Comparing scan {scan_diff.old_scan.scan_id} ({scan_diff.old_scan.recorded_at}) with ", nl=False)
+    click.echo(f"scan {scan_diff.new_scan.scan_id} ({scan_diff.new_scan.recorded_at}).")
+    click.echo(f"# of unchanged files: {scan_diff.unchanged_file_count}")
+    click.echo(f"# of changes: {len(scan_diff.changes)}")
+    click.echo()
+
+    for change in scan_diff.changes:
+        if change.item_type == "file":
+            click.echo(f"{CHANGE_SYMBOLS[change.change_type]} {change.file_path}")
+        else:
+            click.echo(f"\t{CHANGE_SYMBOLS[change.change_type]} {change.item_type} '{change.name}'")
+
+
 if __name__ == "__main__":
     cli(obj={})
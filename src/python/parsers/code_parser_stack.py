@@ -9,7 +9,7 @@ class EmptyStackError(Exception):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class CodeParserStackItem:
     """A stack item that holds info about the start of a code block.
 
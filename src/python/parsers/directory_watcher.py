@@ -0,0 +1,466 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+from dataclasses import dataclass, field
+from pathlib import PurePath
+from types import TracebackType
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Type, Union
+
+from file_data_models.digital_file import DigitalFile
+from file_data_models.directory import Directory
+from utils.repr_builder import build_repr_from_attributes
+
+from .file_parser import FileParser
+from .path_filter import PathFilter
+
+# The inotify event flags used by the watcher, from 'linux/inotify.h'.
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+WATCH_MASK |= IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+
+EVENT_HEADER = struct.Struct("iIII")
+
+# The size and modification time of a file, used to tell if it changed.
+FileStat = Tuple[int, int]
+
+
+@dataclass
+class WatchChanges:
+    """The files that changed between two polls of a watched directory.
+
+    Attributes:
+        added_files: The newly parsed files that were added.
+        modified_files: The old and newly parsed versions of each file
+          that was modified.
+        removed_files: The files that were removed.
+    """
+
+    added_files: List[DigitalFile] = field(default_factory=list)
+    modified_files: List[Tuple[DigitalFile, DigitalFile]] = field(default_factory=list)
+    removed_files: List[DigitalFile] = field(default_factory=list)
+
+    @property
+    def old_files(self) -> List[DigitalFile]:
+        """The files that are no longer part of the directory tree."""
+
+        return self.removed_files + [old_file for old_file, _ in self.modified_files]
+
+    @property
+    def new_files(self) -> List[DigitalFile]:
+        """The files that were newly parsed into the directory tree."""
+
+        return self.added_files + [new_file for _, new_file in self.modified_files]
+
+    def __bool__(self) -> bool:
+        return bool(self.added_files or self.modified_files or self.removed_files)
+
+
+class _Inotify:
+    """A minimal wrapper around the Linux inotify API.
+
+    The API is loaded from the C library with ctypes, so no extra
+    packages are needed. Each watched directory reports changes to the
+    files directly inside of it, so every directory in the tree is
+    watched on its own.
+    """
+
+    def __init__(self) -> None:
+        """Opens a new inotify instance.
+
+        Raises:
+            OSError: inotify is not available on this system.
+        """
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify is not available on this system.")
+
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "Could not start inotify.")
+
+        self._watched_paths: Dict[int, str] = {}
+
+    def add_watch(self, dir_path: str) -> None:
+        """Watches a directory for changes.
+
+        Raises:
+            OSError: The directory could not be watched, for example
+              because the limit on the number of watches was reached.
+        """
+
+        watch_descriptor = self._libc.inotify_add_watch(self.fd, os.fsencode(dir_path), WATCH_MASK)
+        if watch_descriptor < 0:
+            error_number = ctypes.get_errno()
+            raise OSError(error_number, os.strerror(error_number), dir_path)
+
+        self._watched_paths[watch_descriptor] = dir_path
+
+    def read_changed_paths(self, timeout: float) -> Optional[Set[str]]:
+        """Waits for events and returns the paths that they are about.
+
+        Once the first event arrives, events are read until none arrive
+        for a short while, so that the many events of one save are
+        handled together.
+
+        Args:
+            timeout: The longest time to wait for the first event, in
+              seconds.
+
+        Returns:
+            The paths of the directories with changes, along with any
+            subdirectories that were created or removed. None is returned
+            if events were lost, in which case every path must be
+            checked.
+        """
+
+        changed_paths: Set[str] = set()
+        wait_time = timeout
+
+        while select.select([self.fd], [], [], wait_time)[0]:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset < len(data):
+                watch_descriptor, mask, _, name_length = EVENT_HEADER.unpack_from(data, offset)
+                name_start = offset + EVENT_HEADER.size
+                name = os.fsdecode(data[name_start : name_start + name_length].rstrip(b"\0"))
+                offset = name_start + name_length
+
+                if mask & IN_Q_OVERFLOW:
+                    return None
+
+                dir_path = self._watched_paths.get(watch_descriptor)
+                if mask & IN_IGNORED:
+                    self._watched_paths.pop(watch_descriptor, None)
+                if dir_path is None:
+                    continue
+
+                changed_paths.add(dir_path)
+                if mask & IN_ISDIR and name:
+                    changed_paths.add(os.path.join(dir_path, name))
+
+            wait_time = 0.05
+
+        return changed_paths
+
+    def close(self) -> None:
+        """Closes the inotify instance, removing every watch."""
+
+        os.close(self.fd)
+
+
+class DirectoryWatcher:
+    """Keeps a parsed directory tree up to date with the files on disk.
+
+    The size and modification time of every file in the tree is kept,
+    and only the files whose values change are parsed again. On Linux,
+    inotify is used to wait for changes and to narrow down which
+    directories need checking. Everywhere else, or if inotify cannot
+    watch every directory, each directory is checked on a fixed
+    interval instead.
+
+    The watcher can be used as a context manager, which stops inotify on
+    exit.
+
+    Attributes:
+        parser: The file parser used to parse changed files.
+        directory_tree: The parsed directory tree kept up to date.
+        dir_path: The path to the directory the tree was built from.
+        fortran_only: Whether non-Fortran files are left out of the tree.
+    """
+
+    def __init__(
+        self,
+        parser: FileParser,
+        directory_tree: Directory,
+        dir_path: Union[str, PurePath],
+        fortran_only: bool = True,
+        use_inotify: bool = True,
+    ) -> None:
+        """Initialises a watcher for a directory tree.
+
+        The current state of the files on disk is taken as the state the
+        tree was built from, so the watcher should be made straight after
+        the tree is built.
+
+        Args:
+            parser: The file parser used to parse changed files.
+            directory_tree: A directory tree built by the parser's
+              'build_directory_tree' function.
+            dir_path: The path to the directory the tree was built from.
+            fortran_only: Whether non-Fortran files are left out of the
+              tree.
+            use_inotify: Whether to use inotify where it is available,
+              rather than checking every directory on an interval.
+        """
+
+        self.parser = parser
+        self.directory_tree = directory_tree
+        self.dir_path = os.path.abspath(dir_path)
+        self.fortran_only = fortran_only
+
+        # The stats of the files directly inside of each directory, keyed
+        # by the absolute path to the directory.
+        self._snapshot: Dict[str, Dict[str, FileStat]] = {}
+        self._inotify: Optional[_Inotify] = None
+        if use_inotify:
+            try:
+                self._inotify = _Inotify()
+            except OSError:
+                self._inotify = None
+
+        # The path filter for each directory, made when first needed.
+        self._path_filters: Dict[str, PathFilter] = {}
+
+        for walked_path, _, entries in parser.walk_directory(self.dir_path, Directory(directory_tree.name)):
+            self._snapshot[walked_path] = self._stat_files(walked_path, (entry.name for entry in entries))
+            self._watch_directory(walked_path)
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Whether the watcher is using inotify to wait for changes."""
+
+        return self._inotify is not None
+
+    def wait_for_changes(self, interval: float = 1.0) -> WatchChanges:
+        """Waits until files in the directory change, and applies them.
+
+        Args:
+            interval: How often to check for changes without inotify, in
+              seconds. With inotify, changes are picked up as soon as
+              they happen, and this is only how often the wait is
+              interrupted.
+
+        Returns:
+            The files that changed.
+        """
+
+        while True:
+            if self._inotify is not None:
+                changed_paths = self._inotify.read_changed_paths(interval)
+                if changed_paths == set():
+                    continue
+            else:
+                time.sleep(interval)
+                changed_paths = None
+
+            if changes := self.poll(changed_paths):
+                return changes
+
+    def poll(self, dir_paths: Optional[Iterable[str]] = None) -> WatchChanges:
+        """Checks directories for changed files, and applies the changes.
+
+        Added and modified files are parsed and put into the directory
+        tree, and removed files are taken out of it. Directories that
+        were not seen before are checked along with everything in them.
+
+        Args:
+            dir_paths: The absolute paths of the directories to check.
+              Every known directory is checked if no paths are given.
+
+        Returns:
+            The files that changed.
+        """
+
+        changes = WatchChanges()
+        pending = sorted(self._snapshot if dir_paths is None else set(dir_paths), reverse=True)
+        checked: Set[str] = set()
+
+        while pending:
+            dir_path = pending.pop()
+            if dir_path in checked or not self._is_inside_tree(dir_path):
+                continue
+
+            checked.add(dir_path)
+
+            path_filter = self._get_path_filter(dir_path)
+            try:
+                with os.scandir(dir_path) as entries:
+                    file_names = []
+                    for entry in entries:
+                        path_from_root = self._get_path_from_root(entry.path)
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.path not in self._snapshot and not path_filter.excludes_directory(path_from_root):
+                                pending.append(entry.path)
+                        elif entry.is_file() and path_filter.includes_file(path_from_root):
+                            file_names.append(entry.name)
+            except (FileNotFoundError, NotADirectoryError):
+                if dir_path in self._snapshot:
+                    self._remove_directory(dir_path, changes)
+
+                continue
+
+            parent = self._get_tree_directory(dir_path)
+            old_stats = self._snapshot.get(dir_path, {})
+            new_stats = self._stat_files(dir_path, file_names)
+
+            for file_name in old_stats.keys() - new_stats.keys():
+                changes.removed_files.append(parent.remove_item(file_name))  # type: ignore[arg-type]
+
+            for file_name, file_stat in new_stats.items():
+                old_stat = old_stats.get(file_name)
+                if old_stat == file_stat:
+                    continue
+
+                new_file = self.parser.parse_file(os.path.join(dir_path, file_name), self.dir_path)
+                if old_stat is None:
+                    changes.added_files.append(new_file)
+                    parent.add_file(new_file)
+                else:
+                    # The file keeps its place, so the files stay in the
+                    # same order as a fresh scan would give.
+                    changes.modified_files.append((parent.replace_file(new_file), new_file))
+
+            if dir_path not in self._snapshot:
+                self._watch_directory(dir_path)
+
+            self._snapshot[dir_path] = new_stats
+
+        return changes
+
+    def close(self) -> None:
+        """Stops watching the directory."""
+
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _stat_files(self, dir_path: str, file_names: Iterable[str]) -> Dict[str, FileStat]:
+        """Returns the stats of the files in a directory that are parsed."""
+
+        file_stats = {}
+        for file_name in file_names:
+            if self.fortran_only and not self.parser.is_f90_file(file_name):
+                continue
+
+            try:
+                file_stat = os.stat(os.path.join(dir_path, file_name))
+            except FileNotFoundError:
+                continue
+
+            file_stats[file_name] = (file_stat.st_size, file_stat.st_mtime_ns)
+
+        return file_stats
+
+    def _watch_directory(self, dir_path: str) -> None:
+        """Adds an inotify watch for a directory, if inotify is in use.
+
+        If the directory cannot be watched, inotify is stopped and every
+        directory is checked on an interval instead.
+        """
+
+        if self._inotify is None:
+            return
+
+        try:
+            self._inotify.add_watch(dir_path)
+        except OSError:
+            self.close()
+
+    def _get_path_filter(self, dir_path: str) -> PathFilter:
+        """Returns the path filter for the contents of a directory."""
+
+        path_filter = self._path_filters.get(dir_path)
+        if path_filter is None:
+            if dir_path == self.dir_path:
+                parent_filter = self.parser.path_filter
+            else:
+                parent_filter = self._get_path_filter(os.path.dirname(dir_path))
+
+            path_filter = parent_filter.for_directory(dir_path, self._get_path_from_root(dir_path))
+            self._path_filters[dir_path] = path_filter
+
+        return path_filter
+
+    def _get_path_from_root(self, path: str) -> str:
+        """Returns a path from the root of the codebase, without a leading '/'."""
+
+        relative_path = os.path.relpath(path, self.dir_path)
+
+        return "" if relative_path == os.curdir else PurePath(relative_path).as_posix()
+
+    def _is_inside_tree(self, dir_path: str) -> bool:
+        """Checks if a path is the watched directory or inside of it."""
+
+        return dir_path == self.dir_path or dir_path.startswith(self.dir_path + os.sep)
+
+    def _get_tree_directory(self, dir_path: str) -> Directory:
+        """Returns the directory in the tree for a path, adding any missing."""
+
+        path_from_root = self._get_path_from_root(dir_path)
+        if not path_from_root:
+            return self.directory_tree
+
+        directory = self.directory_tree.get_by_path(path_from_root)
+        if isinstance(directory, Directory):
+            return directory
+
+        current = self.directory_tree
+        for name in path_from_root.split("/"):
+            subdirectory = current.subdirectories.get(name)
+            if subdirectory is None:
+                subdirectory = Directory(name)
+                current.add_subdirectory(subdirectory)
+
+            current = subdirectory
+
+        return current
+
+    def _remove_directory(self, dir_path: str, changes: WatchChanges) -> None:
+        """Removes a directory that no longer exists from the tree."""
+
+        removed_paths = [path for path in self._snapshot if path == dir_path or path.startswith(dir_path + os.sep)]
+        for path in removed_paths:
+            del self._snapshot[path]
+            self._path_filters.pop(path, None)
+
+        if dir_path == self.dir_path:
+            changes.removed_files.extend(self.directory_tree.iter_files())
+            for name in list(self.directory_tree.files) + list(self.directory_tree.subdirectories):
+                self.directory_tree.remove_item(name)
+            return
+
+        parent = self._get_tree_directory(os.path.dirname(dir_path))
+        if os.path.basename(dir_path) in parent.subdirectories:
+            removed_directory = parent.remove_item(os.path.basename(dir_path))
+            changes.removed_files.extend(removed_directory.iter_files())  # type: ignore[union-attr]
+
+    def __enter__(self) -> "DirectoryWatcher":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return build_repr_from_attributes(
+            target_object=self,
+            dir_path=self.dir_path,
+            uses_inotify=self.uses_inotify,
+        )
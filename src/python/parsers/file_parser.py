@@ -1,11 +1,22 @@
+import io
 import logging
 import os
+import posixpath
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import repeat
 from pathlib import PurePath
-from typing import Generator, Optional, Union
+from typing import Deque, Generator, Iterable, Iterator, List, Optional, Tuple, Union
 
 from file_data_models.digital_file import DigitalFile
 from file_data_models.directory import Directory
 from file_data_models.fortran_file import FortranFile
+from utils.file_hasher import HashingReader
+
+from .git_repository import GitRepository
+from .parse_cache import FileFingerprint, ParseCache
+from .parse_level import ParseLevel
+from .path_filter import PathFilter
 
 logger = logging.getLogger("FILE_PARSER")
 logger.setLevel(logging.INFO)
@@ -27,7 +38,38 @@ logger.addHandler(file_handler2)
 
 
 class FileParser:
-    """Parses the content of files and directories."""
+    """Parses the content of files and directories.
+
+    Attributes:
+        cache: An optional on-disk cache of parsed Fortran files. When a
+          cache is provided, unchanged Fortran files are loaded from the
+          cache rather than being parsed again.
+        parse_level: How far the contents of Fortran files are parsed.
+        path_filter: Decides which files and directories of a codebase
+          are parsed.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[ParseCache] = None,
+        parse_level: ParseLevel = ParseLevel.VARIABLES,
+        path_filter: Optional[PathFilter] = None,
+    ) -> None:
+        """Initialises a file parser.
+
+        Args:
+            cache: An optional on-disk cache of parsed Fortran files.
+            parse_level: How far to parse the contents of Fortran files.
+              Parsing stops early for lower levels, so uses that don't
+              need a file's code blocks or variables don't pay for them.
+            path_filter: Decides which files and directories of a
+              codebase are parsed. Every file is parsed if no filter is
+              provided.
+        """
+
+        self.cache = cache
+        self.parse_level = parse_level
+        self.path_filter = path_filter if path_filter is not None else PathFilter()
 
     def parse_file(self, file_path: str, root_dir_path: Optional[str] = None) -> Union[DigitalFile, FortranFile]:
         """Parses a file at a given path and returns it as an object.
@@ -49,26 +91,57 @@ class FileParser:
             path_from_root_dir = os.path.abspath(file_path)
 
         if self.is_f90_file(file_path):
+            if self.cache is not None:
+                cached_file = self.cache.load(file_path, path_from_root_dir, self.parse_level)
+                if cached_file is not None:
+                    logger.info("Loaded FORTRAN file '%s' from the parse cache.", path_from_root_dir)
+                    return cached_file
+
+                file_stat = os.stat(file_path)
+
             logger.info("Parsing FORTRAN file '%s'...", path_from_root_dir)
-            file_contents = self.parse_file_contents(file_path)
-            try:
-                new_file = FortranFile(path_from_root_dir, file_contents)
-            except Exception as e:
-                if os.environ.get("RAISE_PARSING_ERRORS", "").lower() == "true":
-                    raise e
-
-                logger.error(
-                    "Something went wrong while parsing FORTRAN file '%s'. Storing minimal data.",
-                    path_from_root_dir,
-                )
-                new_file = DigitalFile(path_from_root_dir, failed_fortran_parse=True)
+            # The file is hashed as it is parsed, so the hash is always of
+            # the contents that were parsed.
+            with open(file_path, "rb") as f:
+                reader = HashingReader(f)
+                new_file = self.parse_fortran_contents(path_from_root_dir, self.parse_file_contents(file_path, reader))
+                new_file.content_hash = reader.hexdigest()
+
+            if self.cache is not None:
+                fingerprint = FileFingerprint(file_stat.st_size, file_stat.st_mtime_ns, new_file.content_hash)
+                self.cache.store(file_path, path_from_root_dir, fingerprint, new_file, self.parse_level)
         else:
             logger.info("Parsing file '%s'...", path_from_root_dir)
             new_file = DigitalFile(path_from_root_dir)
 
         return new_file
 
-    def parse_file_contents(self, file_path: str) -> Generator[str, None, None]:
+    def parse_fortran_contents(self, path_from_root: str, contents: Iterable[str]) -> Union[DigitalFile, FortranFile]:
+        """Parses the lines of a Fortran file into a file object.
+
+        Args:
+            path_from_root: The path to the file, starting from the root
+              of the codebase.
+            contents: The lines of the file.
+
+        Returns:
+            The parsed Fortran file, or a file object marked as having
+            failed parsing if something went wrong while parsing it.
+        """
+
+        try:
+            return FortranFile(path_from_root, contents, self.parse_level)
+        except Exception as e:
+            if os.environ.get("RAISE_PARSING_ERRORS", "").lower() == "true":
+                raise e
+
+            logger.error(
+                "Something went wrong while parsing FORTRAN file '%s'. Storing minimal data.",
+                path_from_root,
+            )
+            return DigitalFile(path_from_root, failed_fortran_parse=True)
+
+    def parse_file_contents(self, file_path: str, reader: Optional[HashingReader] = None) -> Generator[str, None, None]:
         """Parses the contents of the file.
 
         Parses the contents of the file, and then yields the contents
@@ -76,12 +149,16 @@ class FileParser:
 
         Args:
             file_path: The path to the file.
+            reader: A reader to read the file's contents through, so that
+              they are hashed as they are read. If no reader is given,
+              the file is opened from its path.
 
         Yields:
             Each individual line of the file.
         """
 
-        with open(file_path, "r") as f:
+        text_file = io.TextIOWrapper(io.BufferedReader(reader)) if reader is not None else open(file_path, "r")
+        with text_file as f:
             line = f.readline()
             while line:
                 yield line
@@ -91,6 +168,7 @@ class FileParser:
         self,
         dir_path: Union[str, PurePath],
         fortran_only: bool = True,
+        workers: int = 1,
     ) -> Directory:
         """Builds out a representation of a specified directory.
 
@@ -98,6 +176,9 @@ class FileParser:
             dir_path: The path to the directory.
             fortran_only: A flag that determines whether any non-Fortran
               file objects are included in the final result.
+            workers: The number of processes to spread the parsing of
+              files over. Files are parsed one at a time in the current
+              process when this value is 1.
 
         Returns:
             A directory populated with all the files and subdirectories
@@ -119,34 +200,234 @@ class FileParser:
         root_dir_name = dir_path.parts[-1]
         logger.info("Beginning parsing for codebase '%s'...", root_dir_name)
         directory_tree: Directory = Directory(root_dir_name)
-        current = directory_tree  # We will use current to build the inner dicts within the tree
-
-        for root, dirs, files in os.walk(dir_path):
-            working_dir_path = PurePath(root.replace(str(dir_path), ""))
-
-            # By comparing the path to the directory we started in with
-            # the path to where we are now, we can navigate to the
-            # correct part of the tree to populate the next batch of
-            # files.
-            if working_dir_path:
-                current = directory_tree
-                # We do not include the first item as it's not any sort
-                # of directory name
-                for level in working_dir_path.parts[1:]:
-                    current = current.get_item(level)  # type: ignore[assignment]
-
-            for directory_name in dirs:
-                new_directory = Directory(directory_name)
-                current.add_subdirectory(new_directory)
-
-            for file_name in files:
-                if self.is_f90_file(file_name) or not fortran_only:
-                    new_file = self.parse_file(os.path.join(root, file_name), str(dir_path))
-                    current.add_file(new_file)
+        # The files are parsed once the walk is complete, so we keep
+        # track of which directory each file belongs in until then.
+        files_to_parse: List[Tuple[Directory, str]] = []
+
+        for _, current, entries in self.walk_directory(str(dir_path), directory_tree):
+            for entry in entries:
+                if self.is_f90_file(entry.name) or not fortran_only:
+                    files_to_parse.append((current, entry.path))
+
+        file_paths = [file_path for _, file_path in files_to_parse]
+        parsed_files = self._parse_files(file_paths, str(dir_path), workers)
+        for (parent_directory, _), new_file in zip(files_to_parse, parsed_files):
+            parent_directory.add_file(new_file)
 
         logger.info("All files collected for codebase '%s'.", root_dir_name)
         return directory_tree
 
+    def iter_directory_files(
+        self,
+        dir_path: Union[str, PurePath],
+        fortran_only: bool = True,
+        workers: int = 1,
+    ) -> Iterator[Union[DigitalFile, FortranFile]]:
+        """Parses the files of a directory one at a time, as it is walked.
+
+        Unlike 'build_directory_tree', no directory tree is built, so no
+        reference to a file is kept once it has been yielded. Reading the
+        files one at a time and dropping each one when done keeps the
+        memory needed for a large codebase to about one file's worth.
+
+        Args:
+            dir_path: The path to the directory.
+            fortran_only: A flag that determines whether any non-Fortran
+              files are yielded.
+            workers: The number of processes to spread the parsing of
+              files over. Only a few files per process are parsed ahead
+              of the file being read.
+
+        Yields:
+            Each parsed file, in the order the directory is walked.
+
+        Raises:
+            ValueError: The given path did not exist, or pointed to a
+              file rather than a directory.
+        """
+
+        dir_path = os.path.abspath(dir_path)
+
+        if not os.path.exists(dir_path):
+            raise ValueError("Given path does not exist.")
+        elif os.path.isfile(dir_path):
+            raise ValueError("Specified path is a file, not a directory.")
+
+        def find_file_paths() -> Iterator[str]:
+            # The walk needs a tree to add directories to, but it only
+            # ever holds the directory names.
+            walked_tree = Directory(os.path.basename(dir_path))
+            for _, _, entries in self.walk_directory(dir_path, walked_tree):
+                for entry in entries:
+                    if self.is_f90_file(entry.name) or not fortran_only:
+                        yield entry.path
+
+        logger.info("Beginning streaming parse for codebase '%s'...", os.path.basename(dir_path))
+        if workers <= 1:
+            for file_path in find_file_paths():
+                yield self.parse_file(file_path, dir_path)
+            return
+
+        # Only a few files per process are parsed ahead of the consumer,
+        # so parsed files do not pile up if the consumer is slower.
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending: Deque[Future[Union[DigitalFile, FortranFile]]] = deque()
+            for file_path in find_file_paths():
+                pending.append(executor.submit(self.parse_file, file_path, dir_path))
+                if len(pending) >= workers * 4:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+
+    def collect_changed_files(
+        self,
+        dir_path: Union[str, PurePath],
+        revisions: str,
+        fortran_only: bool = True,
+    ) -> List[Union[DigitalFile, FortranFile]]:
+        """Parses only the files in a git repository that have changed.
+
+        The changed files are listed with the local 'git' binary, so the
+        rest of the directory is never walked.
+
+        Args:
+            dir_path: The path to a directory inside of a git repository.
+            revisions: A revision to compare the working tree with, or a
+              revision range in the form 'A..B' or 'A...B'. For a range,
+              the files are read at the range's end revision straight
+              from git, so it does not need to be checked out.
+            fortran_only: A flag that determines whether any changed
+              non-Fortran files are included in the final result.
+
+        Returns:
+            The changed files, parsed.
+
+        Raises:
+            ValueError: The directory is not inside of a git repository,
+              or the revisions are not known to it.
+        """
+
+        dir_path = os.path.abspath(dir_path)
+        repository = GitRepository(dir_path)
+
+        file_paths = [
+            file_path
+            for file_path in repository.list_changed_files(revisions)
+            if (self.is_f90_file(file_path) or not fortran_only) and self.path_filter.includes_path(file_path)
+        ]
+        logger.info("Found %d changed files for '%s'.", len(file_paths), revisions)
+
+        if ".." not in revisions:
+            return [self.parse_file(os.path.join(dir_path, file_path), dir_path) for file_path in file_paths]
+
+        _, new_revision = GitRepository.split_revision_range(revisions)
+        changed_files: List[Union[DigitalFile, FortranFile]] = []
+        for file_path, contents in repository.read_files(new_revision, file_paths):
+            path_from_root = "/" + file_path
+            if self.is_f90_file(file_path):
+                logger.info("Parsing FORTRAN file '%s' at '%s'...", path_from_root, new_revision)
+                changed_files.append(self.parse_fortran_contents(path_from_root, contents))
+            else:
+                changed_files.append(DigitalFile(path_from_root))
+
+        return changed_files
+
+    def walk_directory(
+        self, dir_path: str, directory_tree: Directory
+    ) -> Iterator[Tuple[str, Directory, List[os.DirEntry[str]]]]:
+        """Walks a directory, adding its subdirectories to a tree.
+
+        Directories excluded by the parser's path filter are skipped
+        before they are entered, so nothing inside of them is listed. The
+        entries of each directory are only listed once, and the type of
+        each entry is read from the listing, so no extra stat calls are
+        made. Symbolic links to directories are added to the tree, but
+        are not followed.
+
+        Args:
+            dir_path: The path to the directory.
+            directory_tree: The directory object for the directory, which
+              each subdirectory that is walked is added to.
+
+        Yields:
+            The path to each walked directory and its directory object,
+            along with the entries of the files in it that pass the path
+            filter.
+        """
+
+        pending = [(dir_path, "", directory_tree, self.path_filter.for_directory(dir_path, ""))]
+
+        while pending:
+            current_path, current_path_from_root, current, path_filter = pending.pop()
+            file_entries = []
+            subdirectories = []
+
+            try:
+                with os.scandir(current_path) as entries:
+                    for entry in entries:
+                        path_from_root = posixpath.join(current_path_from_root, entry.name)
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+
+                        if is_dir:
+                            if path_filter.excludes_directory(path_from_root):
+                                continue
+
+                            new_directory = Directory(entry.name)
+                            current.add_subdirectory(new_directory)
+                            if not entry.is_symlink():
+                                subdirectories.append((entry.path, path_from_root, new_directory))
+                        elif path_filter.includes_file(path_from_root):
+                            file_entries.append(entry)
+            except OSError as e:
+                logger.error("Could not read directory '%s': %s", current_path, str(e))
+                continue
+
+            yield current_path, current, file_entries
+
+            # The subdirectories are walked in the order they were listed.
+            for subdir_path, subdir_path_from_root, subdirectory in reversed(subdirectories):
+                pending.append(
+                    (
+                        subdir_path,
+                        subdir_path_from_root,
+                        subdirectory,
+                        path_filter.for_directory(subdir_path, subdir_path_from_root),
+                    )
+                )
+
+    def _parse_files(
+        self,
+        file_paths: List[str],
+        root_dir_path: str,
+        workers: int,
+    ) -> Iterable[Union[DigitalFile, FortranFile]]:
+        """Parses a list of files, possibly over several processes.
+
+        Args:
+            file_paths: The paths to the files to parse.
+            root_dir_path: The path to the root of the codebase being
+              parsed.
+            workers: The number of processes to parse the files with.
+
+        Returns:
+            The parsed file objects, in the same order as the provided
+            file paths.
+        """
+
+        if workers <= 1 or len(file_paths) <= 1:
+            return (self.parse_file(file_path, root_dir_path) for file_path in file_paths)
+
+        # Handing each process a batch of files at a time keeps the cost
+        # of sending work to (and results back from) the processes down
+        # when there are lots of small files.
+        chunk_size = max(1, len(file_paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.parse_file, file_paths, repeat(root_dir_path), chunksize=chunk_size))
+
     def is_f90_file(self, file_path: str) -> bool:
         """Checks if a given file is a Fortran 90 file.
 
@@ -0,0 +1,147 @@
+import io
+import os
+import subprocess
+from typing import IO, Iterable, Iterator, List, Tuple
+
+from utils.repr_builder import build_repr_from_attributes
+
+
+class GitRepository:
+    """A directory inside of a local git repository.
+
+    Every git command is run with the local 'git' binary, from inside of
+    the directory. Paths given to and returned from the repository are
+    relative to the directory rather than the root of the repository, so
+    only changes inside of the directory are seen.
+
+    Attributes:
+        dir_path: The absolute path to the directory.
+    """
+
+    def __init__(self, dir_path: str) -> None:
+        """Initialises a repository for a directory.
+
+        Args:
+            dir_path: The path to the directory.
+
+        Raises:
+            ValueError: The git binary could not be found, or the
+              directory is not inside of a git repository.
+        """
+
+        self.dir_path = os.path.abspath(dir_path)
+        self._run_git("rev-parse", "--git-dir")
+
+    @staticmethod
+    def split_revision_range(revision_range: str) -> Tuple[str, str]:
+        """Splits a revision range into its old and new revisions.
+
+        Both the 'A..B' and 'A...B' forms are accepted, in the same way as
+        'git diff'.
+
+        Args:
+            revision_range: The revision range.
+
+        Returns:
+            The revisions at the start and end of the range.
+
+        Raises:
+            ValueError: The range is not in either form.
+        """
+
+        separator = "..." if "..." in revision_range else ".."
+        old_revision, _, new_revision = revision_range.partition(separator)
+        if not old_revision or not new_revision:
+            raise ValueError(f"'{revision_range}' is not a revision range in the form 'A..B'.")
+
+        return old_revision, new_revision
+
+    def list_changed_files(self, revisions: str) -> List[str]:
+        """Lists the files that were added or changed after a revision.
+
+        Files that were deleted are not listed, as there is nothing left
+        to parse. Untracked files are also not listed.
+
+        Args:
+            revisions: A revision to compare the working tree with, or a
+              revision range in the form 'A..B' or 'A...B' to compare two
+              revisions with.
+
+        Returns:
+            The paths of the changed files, relative to the directory.
+
+        Raises:
+            ValueError: A revision is not known to the repository.
+        """
+
+        output = self._run_git("diff", "--name-only", "-z", "--relative", "--diff-filter=d", revisions, "--")
+
+        return [os.fsdecode(path) for path in output.split(b"\0") if path]
+
+    def read_files(self, revision: str, file_paths: Iterable[str]) -> Iterator[Tuple[str, IO[str]]]:
+        """Reads the contents of files at a revision, without a checkout.
+
+        The contents are read straight from git's object database with a
+        single 'git cat-file --batch' process, one file at a time.
+
+        Args:
+            revision: The revision to read the files at.
+            file_paths: The paths of the files, relative to the directory.
+
+        Yields:
+            The path of each file, along with a text stream of its
+            contents at the revision.
+
+        Raises:
+            ValueError: A file does not exist at the revision.
+        """
+
+        with subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=self.dir_path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        ) as process:
+            assert process.stdin is not None and process.stdout is not None
+
+            try:
+                for file_path in file_paths:
+                    # The './' makes git look the path up from the
+                    # directory rather than the root of the repository.
+                    process.stdin.write(os.fsencode(f"{revision}:./{file_path}\n"))
+                    process.stdin.flush()
+
+                    header = process.stdout.readline().split()
+                    if len(header) != 3 or header[1] != b"blob":
+                        raise ValueError(f"The file '{file_path}' does not exist at the revision '{revision}'.")
+
+                    contents = process.stdout.read(int(header[2]))
+                    process.stdout.read(1)  # The newline after the contents.
+
+                    yield file_path, io.TextIOWrapper(io.BytesIO(contents))
+            finally:
+                process.stdin.close()
+
+    def _run_git(self, *arguments: str) -> bytes:
+        """Runs a git command in the directory and returns its output.
+
+        Raises:
+            ValueError: The git binary could not be found, or the command
+              failed.
+        """
+
+        try:
+            result = subprocess.run(["git", *arguments], cwd=self.dir_path, capture_output=True)
+        except FileNotFoundError:
+            raise ValueError("The git binary could not be found.")
+
+        if result.returncode != 0:
+            raise ValueError(os.fsdecode(result.stderr).strip())
+
+        return result.stdout
+
+    def __repr__(self) -> str:
+        return build_repr_from_attributes(
+            target_object=self,
+            dir_path=self.dir_path,
+        )
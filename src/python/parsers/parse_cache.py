@@ -0,0 +1,247 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from file_data_models.digital_file import DigitalFile
+from file_data_models.fortran_file import FortranFile
+from utils.file_hasher import hash_file
+from utils.repr_builder import build_repr_from_attributes
+
+from .parse_level import ParseLevel
+
+# This must be bumped whenever a change is made to the parsing logic or
+# to the shape of the parsed file objects, as any entries stored by an
+# older version of the parser are no longer valid.
+PARSE_CACHE_VERSION = 8
+
+logger = logging.getLogger("FILE_PARSER")
+
+DEFAULT_MAX_CACHE_SIZE = 512 * 1024 * 1024
+
+
+@dataclass
+class FileFingerprint:
+    """The details used to tell if a file has changed since parsing.
+
+    Attributes:
+        size: The size of the file in bytes.
+        mtime_ns: The last modification time of the file in nanoseconds.
+        content_hash: A SHA-256 hash of the file's contents.
+    """
+
+    size: int
+    mtime_ns: int
+    content_hash: str
+
+
+class ParseCache:
+    """An on-disk cache of parsed Fortran files.
+
+    Each parsed file is stored in its own entry in the cache directory,
+    keyed by the file's path and the level it was parsed to. An entry is
+    only used if the file it was created from is unchanged: a matching
+    size and modification time is taken as the file being unchanged,
+    and otherwise the file's content hash is compared with the one
+    stored in the entry. Entries created by a different version of the
+    parser are dropped, and the least recently used entries are evicted
+    when the cache grows beyond its size limit.
+
+    Attributes:
+        cache_dir: The directory the cache entries are stored in.
+        max_size: The maximum total size of the cache entries in bytes.
+    """
+
+    VERSION_FILE_NAME = "VERSION"
+    ENTRY_EXTENSION = ".pickle"
+
+    def __init__(self, cache_dir: str, max_size: int = DEFAULT_MAX_CACHE_SIZE) -> None:
+        """Initialises a parse cache.
+
+        The cache directory is created if it does not exist yet. If the
+        directory holds entries from a different version of the parser,
+        they are removed.
+
+        Args:
+            cache_dir: The directory to store cache entries in.
+            max_size: The maximum total size of the cache entries in
+              bytes.
+        """
+
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_size = max_size
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        version_file_path = os.path.join(self.cache_dir, self.VERSION_FILE_NAME)
+        try:
+            with open(version_file_path, "r") as f:
+                cached_version = f.read().strip()
+        except FileNotFoundError:
+            cached_version = None
+
+        if cached_version != str(PARSE_CACHE_VERSION):
+            self.clear()
+            with open(version_file_path, "w") as f:
+                f.write(str(PARSE_CACHE_VERSION))
+
+    def load(
+        self,
+        file_path: str,
+        path_from_root: str,
+        parse_level: ParseLevel = ParseLevel.VARIABLES,
+    ) -> Optional[Union[DigitalFile, FortranFile]]:
+        """Loads a parsed file from the cache.
+
+        Args:
+            file_path: The path to the file on disk.
+            path_from_root: The path to the file, starting from the root
+              of the codebase being parsed.
+            parse_level: How far the file was parsed.
+
+        Returns:
+            The parsed file object stored for the file, or None if there
+            is no valid entry for the file in the cache.
+        """
+
+        entry_path = self._get_entry_path(file_path, path_from_root, parse_level)
+        try:
+            file_stat = os.stat(file_path)
+            with open(entry_path, "rb") as f:
+                version, fingerprint = pickle.load(f)
+                if version != PARSE_CACHE_VERSION or fingerprint.size != file_stat.st_size:
+                    return None
+
+                if fingerprint.mtime_ns != file_stat.st_mtime_ns:
+                    # The file may have been touched (e.g. by a checkout)
+                    # without its contents changing.
+                    if fingerprint.content_hash != hash_file(file_path):
+                        return None
+
+                    fingerprint.mtime_ns = file_stat.st_mtime_ns
+                    parsed_file = pickle.load(f)
+                    self._write_entry(entry_path, fingerprint, parsed_file)
+                else:
+                    parsed_file = pickle.load(f)
+
+            # Touching the entry keeps track of when it was last used,
+            # which is what eviction is based on.
+            os.utime(entry_path)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # An unreadable entry is treated the same as a missing one,
+            # and is removed so it gets replaced on the next store.
+            self._remove_entry(entry_path)
+            return None
+
+        return parsed_file
+
+    def store(
+        self,
+        file_path: str,
+        path_from_root: str,
+        fingerprint: FileFingerprint,
+        parsed_file: Union[DigitalFile, FortranFile],
+        parse_level: ParseLevel = ParseLevel.VARIABLES,
+    ) -> None:
+        """Stores a parsed file in the cache.
+
+        If the entry can't be written, e.g. because the disk is full, a
+        warning is logged and the file is left out of the cache.
+
+        Args:
+            file_path: The path to the file on disk.
+            path_from_root: The path to the file, starting from the root
+              of the codebase being parsed.
+            fingerprint: The fingerprint of the file, taken before the
+              file was parsed.
+            parsed_file: The parsed file object to store.
+            parse_level: How far the file was parsed.
+        """
+
+        entry_path = self._get_entry_path(file_path, path_from_root, parse_level)
+        try:
+            self._write_entry(entry_path, fingerprint, parsed_file)
+        except (OSError, pickle.PicklingError) as e:
+            # The cache is only there to speed up later runs, so failing
+            # to write to it shouldn't stop the file being parsed.
+            logger.warning("Could not store '%s' in the parse cache: %s", path_from_root, e)
+
+    def evict(self) -> None:
+        """Removes the least recently used entries over the size limit."""
+
+        entries = []
+        for dir_entry in os.scandir(self.cache_dir):
+            if dir_entry.name.endswith(self.ENTRY_EXTENSION):
+                entry_stat = dir_entry.stat()
+                entries.append((entry_stat.st_mtime_ns, entry_stat.st_size, dir_entry.path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+
+            self._remove_entry(entry_path)
+            total_size -= size
+
+    def clear(self) -> None:
+        """Removes every entry from the cache."""
+
+        for dir_entry in os.scandir(self.cache_dir):
+            if dir_entry.name.endswith(self.ENTRY_EXTENSION):
+                self._remove_entry(dir_entry.path)
+
+    def _get_entry_path(self, file_path: str, path_from_root: str, parse_level: ParseLevel) -> str:
+        """Returns the path to the cache entry for a file."""
+
+        # The path from the root is part of the key since it is stored on
+        # the parsed objects, so the same file parsed as part of two
+        # different codebases needs two different entries. Each parse
+        # level also gets its own entry, so a file parsed less fully is
+        # never loaded where a fuller parse is needed (or vice versa).
+        key = f"{os.path.abspath(file_path)}\0{path_from_root}\0{parse_level.value}"
+        entry_name = hashlib.sha256(key.encode("utf-8", "surrogateescape")).hexdigest()
+
+        return os.path.join(self.cache_dir, entry_name + self.ENTRY_EXTENSION)
+
+    def _write_entry(
+        self,
+        entry_path: str,
+        fingerprint: FileFingerprint,
+        parsed_file: Union[DigitalFile, FortranFile],
+    ) -> None:
+        """Writes a cache entry to disk."""
+
+        # Writing to a temporary file first means a reader (e.g. another
+        # parsing process) never sees a half-written entry.
+        temp_fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(temp_fd, "wb") as f:
+                # The version and fingerprint are pickled separately from
+                # the parsed file so they can be checked without loading
+                # the whole entry.
+                pickle.dump((PARSE_CACHE_VERSION, fingerprint), f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(parsed_file, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            os.replace(temp_path, entry_path)
+        except Exception:
+            self._remove_entry(temp_path)
+            raise
+
+    def _remove_entry(self, entry_path: str) -> None:
+        """Removes a cache entry, if it still exists."""
+
+        try:
+            os.remove(entry_path)
+        except FileNotFoundError:
+            pass
+
+    def __repr__(self) -> str:
+        return build_repr_from_attributes(
+            target_object=self,
+            cache_dir=self.cache_dir,
+            max_size=self.max_size,
+        )
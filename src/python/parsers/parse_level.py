@@ -0,0 +1,23 @@
+from enum import IntEnum
+
+
+class ParseLevel(IntEnum):
+    """How far the contents of a Fortran file are parsed.
+
+    Each level includes all of the work done by the levels before it, so
+    levels can be compared to check if a file has been parsed far enough
+    for a given use.
+
+    Attributes:
+        RAW_LINES: The file's lines are stored as they are, without
+          joining continued lines or splitting statements.
+        STATEMENTS: Continued lines are joined and lines with several
+          statements are split, giving the file's code statements.
+        BLOCKS: The statements are grouped into code blocks.
+        VARIABLES: The variables declared in each code block are found.
+    """
+
+    RAW_LINES = 1
+    STATEMENTS = 2
+    BLOCKS = 3
+    VARIABLES = 4
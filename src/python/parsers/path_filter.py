@@ -0,0 +1,257 @@
+import copy
+import os
+import posixpath
+import re
+from dataclasses import dataclass
+from typing import Iterable, Pattern, Sequence, Tuple
+
+from utils.repr_builder import build_repr_from_attributes
+
+
+@dataclass(frozen=True)
+class _GlobRule:
+    """A single glob pattern, matched against paths under a directory.
+
+    Attributes:
+        regex: The compiled pattern, matched against the part of a path
+          after the rule's base directory.
+        base: The path from the root of the codebase to the directory
+          the pattern is relative to, or an empty string for the root.
+        negated: Whether a match re-includes a path rather than
+          excluding it.
+        directory_only: Whether the pattern only matches directories.
+    """
+
+    regex: Pattern[str]
+    base: str = ""
+    negated: bool = False
+    directory_only: bool = False
+
+    @classmethod
+    def from_pattern(cls, pattern: str, base: str = "", negated: bool = False) -> "_GlobRule":
+        """Builds a rule from a glob pattern in the '.gitignore' syntax.
+
+        A pattern without a slash matches a name at any depth, and any
+        other pattern is matched from the base directory. A trailing '/'
+        only matches directories.
+        """
+
+        directory_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+
+        regex = _translate_glob(pattern.lstrip("/"))
+        if "/" not in pattern:
+            regex = "(?:.*/)?" + regex
+
+        return cls(re.compile(regex + r"\Z"), base, negated, directory_only)
+
+    def matches(self, path: str, is_directory: bool) -> bool:
+        """Checks if the rule matches a path from the root of the codebase."""
+
+        if self.directory_only and not is_directory:
+            return False
+
+        if self.base:
+            if not path.startswith(self.base + "/"):
+                return False
+            path = path[len(self.base) + 1 :]
+
+        return self.regex.match(path) is not None
+
+
+def _translate_glob(pattern: str) -> str:
+    """Translates a glob pattern into a regular expression.
+
+    '*' and '?' do not match a '/', while '**' matches across any number
+    of directories.
+    """
+
+    regex = ""
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**/", index):
+            regex += "(?:.*/)?"
+            index += 3
+            continue
+        elif pattern.startswith("**", index):
+            regex += ".*"
+            index += 2
+            continue
+        elif char == "*":
+            regex += "[^/]*"
+        elif char == "?":
+            regex += "[^/]"
+        elif char == "[" and (end := pattern.find("]", index + 2)) != -1:
+            char_class = pattern[index + 1 : end].replace("\\", "\\\\")
+            if char_class.startswith("!"):
+                char_class = "^" + char_class[1:]
+            regex += f"[{char_class}]"
+            index = end
+        else:
+            regex += re.escape(char)
+
+        index += 1
+
+    return regex
+
+
+class PathFilter:
+    """Decides which files and directories of a codebase are parsed.
+
+    Paths are matched with the same glob syntax as '.gitignore' files.
+    Excluded directories are skipped along with everything in them, and
+    if any include patterns are given, only the files that match one of
+    them are parsed. When '.gitignore' files are used, each one applies
+    to the directory it is in, and to everything below it.
+
+    Filters for subdirectories are made with 'for_directory', which adds
+    the rules of any '.gitignore' file found there.
+
+    Attributes:
+        include: The glob patterns a file must match one of to be parsed.
+        exclude: The glob patterns of files and directories to skip.
+        use_gitignore: Whether the rules in '.gitignore' files are used.
+    """
+
+    def __init__(
+        self,
+        include: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+        use_gitignore: bool = False,
+    ) -> None:
+        """Initialises a path filter.
+
+        Args:
+            include: The glob patterns a file must match one of to be
+              parsed. Every file is parsed if no patterns are given.
+            exclude: The glob patterns of files and directories to skip.
+            use_gitignore: Whether to skip the files and directories
+              ignored by '.gitignore' files, along with the '.git'
+              directory.
+        """
+
+        self.include = tuple(include)
+        self.exclude = tuple(exclude)
+        self.use_gitignore = use_gitignore
+
+        self._include_rules = tuple(_GlobRule.from_pattern(pattern) for pattern in self.include)
+        self._exclude_rules = tuple(_GlobRule.from_pattern(pattern) for pattern in self.exclude)
+        self._gitignore_rules: Tuple[_GlobRule, ...] = ()
+
+    def for_directory(self, dir_path: str, path_from_root: str) -> "PathFilter":
+        """Returns the filter for the contents of a directory.
+
+        Args:
+            dir_path: The path to the directory.
+            path_from_root: The path to the directory from the root of the
+              codebase, without a leading '/'.
+
+        Returns:
+            A filter with the rules of the directory's '.gitignore' file
+            added, or this filter if there are no rules to add.
+        """
+
+        if not self.use_gitignore:
+            return self
+
+        rules = list(self._read_gitignore(os.path.join(dir_path, ".gitignore"), path_from_root))
+        if not rules:
+            return self
+
+        directory_filter = copy.copy(self)
+        directory_filter._gitignore_rules = self._gitignore_rules + tuple(rules)
+
+        return directory_filter
+
+    def excludes_directory(self, path_from_root: str) -> bool:
+        """Checks if a directory, and everything in it, should be skipped.
+
+        Args:
+            path_from_root: The path to the directory from the root of the
+              codebase, without a leading '/'.
+        """
+
+        if self.use_gitignore and posixpath.basename(path_from_root) == ".git":
+            return True
+
+        return self._is_excluded(path_from_root, True)
+
+    def includes_file(self, path_from_root: str) -> bool:
+        """Checks if a file in a directory that is not skipped is parsed.
+
+        Args:
+            path_from_root: The path to the file from the root of the
+              codebase, without a leading '/'.
+        """
+
+        if self._is_excluded(path_from_root, False):
+            return False
+
+        return not self._include_rules or any(rule.matches(path_from_root, False) for rule in self._include_rules)
+
+    def includes_path(self, path_from_root: str) -> bool:
+        """Checks if a file is parsed, including whether its directories are.
+
+        This is for files that were found without walking the codebase,
+        so only the include and exclude patterns are used.
+
+        Args:
+            path_from_root: The path to the file from the root of the
+              codebase, without a leading '/'.
+        """
+
+        parent = posixpath.dirname(path_from_root)
+        while parent:
+            if any(rule.matches(parent, True) for rule in self._exclude_rules):
+                return False
+            parent = posixpath.dirname(parent)
+
+        return self.includes_file(path_from_root)
+
+    def _is_excluded(self, path_from_root: str, is_directory: bool) -> bool:
+        """Checks a path against the exclude patterns and '.gitignore' rules."""
+
+        if any(rule.matches(path_from_root, is_directory) for rule in self._exclude_rules):
+            return True
+
+        # The last '.gitignore' rule to match a path decides whether it
+        # is ignored, so that negated rules can re-include paths.
+        for rule in reversed(self._gitignore_rules):
+            if rule.matches(path_from_root, is_directory):
+                return not rule.negated
+
+        return False
+
+    @staticmethod
+    def _read_gitignore(file_path: str, base: str) -> Iterable[_GlobRule]:
+        """Reads the rules of a '.gitignore' file, if there is one."""
+
+        try:
+            with open(file_path, "r") as f:
+                lines = f.read().splitlines()
+        except (FileNotFoundError, NotADirectoryError):
+            return
+
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            # A leading backslash escapes a '#' or '!' at the start of a
+            # pattern.
+            elif line.startswith("\\"):
+                line = line[1:]
+
+            yield _GlobRule.from_pattern(line, base, negated)
+
+    def __repr__(self) -> str:
+        return build_repr_from_attributes(
+            target_object=self,
+            include=list(self.include),
+            exclude=list(self.exclude),
+            use_gitignore=self.use_gitignore,
+        )
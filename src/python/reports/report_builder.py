@@ -0,0 +1,260 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+from code_data_models.code_block import CodeBlock
+from code_data_models.variable import Variable
+from file_data_models.digital_file import DigitalFile
+from file_data_models.file_stream import FileStream
+from file_data_models.fortran_file import FortranFile
+from utils.repr_builder import build_repr_from_attributes
+
+from .report_models import ComponentListing, FileCounts, FileListing, SummaryReport
+
+
+@dataclass
+class _SummaryTally:
+    """The running counts that a summary is built from."""
+
+    comment_count: int = 0
+    block_counts: Counter[str] = field(default_factory=Counter)
+    data_type_counts: Counter[str] = field(default_factory=Counter)
+
+    def update(self, other: "_SummaryTally") -> None:
+        """Adds the counts of another tally to this one."""
+
+        self.comment_count += other.comment_count
+        self.block_counts.update(other.block_counts)
+        self.data_type_counts.update(other.data_type_counts)
+
+    def subtract(self, other: "_SummaryTally") -> None:
+        """Takes the counts of another tally away from this one."""
+
+        self.comment_count -= other.comment_count
+        self.block_counts.subtract(other.block_counts)
+        self.data_type_counts.subtract(other.data_type_counts)
+
+
+class ReportBuilder:
+    """Builds the results of the CLI commands from the collected files.
+
+    The results are built once into report objects, which the CLI and
+    every serializer then render in their own format. Summaries are kept
+    once built, so rendering the same summary in several formats only
+    walks the code blocks once. When some of the collected files change,
+    the counts behind each summary are updated from just those files.
+
+    The collected files can also be a file stream, which can only be read
+    once. Each result must then be built only once, and the file counts
+    are only complete after the stream has been read.
+
+    Attributes:
+        collected_files: The file(s) collected by the application's file
+          parser.
+    """
+
+    def __init__(self, collected_files: Union[Sequence[DigitalFile], FileStream]) -> None:
+        """Initialises a report builder.
+
+        Args:
+            collected_files: The file(s) collected by the application's
+              file parser, or a stream of them.
+        """
+
+        self.collected_files = collected_files
+        self._summaries: Dict[Tuple[bool, bool], SummaryReport] = {}
+        self._tallies: Dict[Tuple[bool, bool], _SummaryTally] = {}
+
+    def update_files(
+        self,
+        collected_files: Sequence[DigitalFile],
+        old_files: Iterable[DigitalFile],
+        new_files: Iterable[DigitalFile],
+    ) -> None:
+        """Updates the builder after some of the collected files change.
+
+        The counts of any summaries already built are updated by taking
+        away the counts of the old files and adding the counts of the new
+        ones, so the unchanged files are not walked again.
+
+        Args:
+            collected_files: Every file that is now collected.
+            old_files: The files that were removed, or have been replaced
+              by a newer version.
+            new_files: The files that were added, or are the newer
+              version of a changed file.
+        """
+
+        self.collected_files = collected_files
+        self._summaries.clear()
+
+        old_files = list(old_files)
+        new_files = list(new_files)
+        for (top_level_blocks, top_level_vars), tally in self._tallies.items():
+            tally.subtract(self._tally_files(old_files, top_level_blocks, top_level_vars))
+            tally.update(self._tally_files(new_files, top_level_blocks, top_level_vars))
+
+    @property
+    def is_streaming(self) -> bool:
+        """Whether the collected files are a stream that is read once."""
+
+        return isinstance(self.collected_files, FileStream)
+
+    def build_file_counts(self) -> FileCounts:
+        """Counts the collected files of each kind.
+
+        Returns:
+            The number of files, Fortran files and Fortran files that
+            failed parsing. For a stream, these are the files read so
+            far.
+        """
+
+        if isinstance(self.collected_files, FileStream):
+            stream = self.collected_files
+            return FileCounts(stream.file_count, stream.fortran_file_count, stream.failed_parse_count)
+
+        failed_parse_count = sum(item.failed_fortran_parse for item in self.collected_files)
+        fortran_file_count = sum(isinstance(item, FortranFile) for item in self.collected_files) + failed_parse_count
+
+        return FileCounts(len(self.collected_files), fortran_file_count, failed_parse_count)
+
+    def build_summary(self, top_level_blocks: bool, top_level_vars: bool) -> SummaryReport:
+        """Builds the results of the get-summary command.
+
+        Every code block is visited once. The variables are tallied by
+        their declared data type as they are found, and each distinct
+        data type is only matched against the built-in data types at the
+        end.
+
+        Args:
+            top_level_blocks: Does not include subprogram information in
+              the summary.
+            top_level_vars: Does not include variable information for
+              variables that are found in a program unit's subprograms
+              in the summary. This value has no effect if the value
+              'top_level_blocks' is False.
+
+        Returns:
+            The summary of the collected files.
+        """
+
+        if summary := self._summaries.get((top_level_blocks, top_level_vars)):
+            return summary
+
+        tally = self._tallies.get((top_level_blocks, top_level_vars))
+        if tally is None:
+            tally = self._tally_files(self.collected_files, top_level_blocks, top_level_vars)
+            self._tallies[(top_level_blocks, top_level_vars)] = tally
+
+        # We do 'in' instead of '==' here since some data types can have
+        # extra information as part of the type declaration, e.g
+        # 'INTEGER(I8)'.
+        variable_counts = {
+            var_type: sum(count for data_type, count in tally.data_type_counts.items() if var_type in data_type)
+            for var_type in Variable.ALL_DATA_TYPES
+        }
+
+        summary = SummaryReport(
+            file_counts=self.build_file_counts(),
+            comment_count=tally.comment_count,
+            top_level_blocks=top_level_blocks,
+            top_level_vars=top_level_vars,
+            block_counts={block_type: tally.block_counts[block_type] for block_type in SummaryReport.BLOCK_TYPES},
+            variable_counts=variable_counts,
+        )
+        self._summaries[(top_level_blocks, top_level_vars)] = summary
+
+        return summary
+
+    def _tally_files(self, files: Iterable[DigitalFile], top_level_blocks: bool, top_level_vars: bool) -> _SummaryTally:
+        """Counts the comments, code blocks and variables of some files."""
+
+        # When listing top level blocks with all of their variables, a
+        # block's variables include the ones in its subprograms.
+        include_subprogram_variables = top_level_blocks and not top_level_vars
+
+        tally = _SummaryTally()
+
+        for file_obj in files:
+            if not isinstance(file_obj, FortranFile):
+                continue
+
+            tally.comment_count += sum(line.contains_comment for line in file_obj.contents)
+
+            blocks: List[CodeBlock] = list(file_obj.components)
+            while blocks:
+                block = blocks.pop()
+                tally.block_counts[type(block).__name__] += 1
+
+                subprograms = getattr(block, "subprograms", None)
+                if include_subprogram_variables:
+                    variables = getattr(block, "variables", [])
+                elif subprograms is not None and hasattr(block, "variables"):
+                    variables = block.get_variables_not_in_subprograms()
+                else:
+                    variables = []
+
+                tally.data_type_counts.update(var.data_type for var in variables)
+
+                if not top_level_blocks and subprograms:
+                    blocks.extend(subprograms)
+
+        return tally
+
+    def build_file_listings(self, no_duplicates: bool) -> Iterator[FileListing]:
+        """Builds the results of the list-all-variables command.
+
+        The listings are generated one file at a time, so that only the
+        listing for the file being rendered is held in memory.
+
+        Args:
+            no_duplicates: Stops variables found in the subprograms for
+              a larger program unit from appearing more than once.
+              Variables inside of any subprograms are only listed as
+              part of the subprogram's variables, and not as part of the
+              larger program unit's variables.
+
+        Yields:
+            The listing for each collected file, in order.
+        """
+
+        for file_obj in self.collected_files:
+            listing = FileListing(file_obj.path_from_root, file_obj.failed_fortran_parse)
+
+            if isinstance(file_obj, FortranFile):
+                listing.components = [
+                    self._build_component_listing(component, no_duplicates) for component in file_obj.components
+                ]
+
+            yield listing
+
+    def _build_component_listing(self, component: CodeBlock, no_duplicates: bool) -> ComponentListing:
+        """Builds the listing for a code block and its subprograms."""
+
+        listing = ComponentListing(
+            block_type=type(component).__name__.replace("Fortran", ""),
+            start_line_number=component.start_line_number,
+            end_line_number=component.end_line_number,
+            block_name=getattr(component, "block_name", None),
+            is_recursive=getattr(component, "is_recursive", None),
+        )
+
+        subprograms = getattr(component, "subprograms", None)
+        if subprograms is not None:
+            listing.subprograms = [
+                self._build_component_listing(subprogram, no_duplicates) for subprogram in subprograms
+            ]
+
+        if hasattr(component, "variables"):
+            if subprograms is not None and no_duplicates:
+                listing.variables = component.get_variables_not_in_subprograms()
+            else:
+                listing.variables = component.variables
+
+        return listing
+
+    def __repr__(self) -> str:
+        return build_repr_from_attributes(
+            target_object=self,
+            collected_files=self.collected_files if self.is_streaming else len(self.collected_files),
+        )
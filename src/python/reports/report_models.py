@@ -0,0 +1,207 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from code_data_models.variable import Variable
+
+
+def build_variable_dict(variable: Variable) -> Dict[str, Any]:
+    """Returns a variable's details with the keys used by the serializers.
+
+    Args:
+        variable: The variable to describe.
+
+    Returns:
+        A dictionary of the variable's details.
+    """
+
+    return {
+        "variableName": variable.name,
+        "dataType": variable.data_type,
+        "attributes": variable.attributes,
+        "lineDeclared": variable.line_declared,
+        "possiblyUnused": variable.possibly_unused,
+        "isArray": variable.is_array,
+        "isPointer": variable.is_pointer,
+    }
+
+
+@dataclass
+class FileCounts:
+    """The number of files of each kind collected by the file parser.
+
+    Attributes:
+        file_count: The overall number of files collected.
+        fortran_file_count: The number of Fortran files collected,
+          including the files that failed parsing.
+        failed_parse_count: The number of Fortran files that failed
+          parsing.
+    """
+
+    file_count: int
+    fortran_file_count: int
+    failed_parse_count: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the counts with the keys used by the serializers."""
+
+        return {
+            "fileCount": self.file_count,
+            "fortranFileCount": self.fortran_file_count,
+            "fortranFilesFailedToParse": self.failed_parse_count,
+        }
+
+
+@dataclass
+class SummaryReport:
+    """The results of the get-summary command.
+
+    Attributes:
+        BLOCK_TYPES: The class names of the code blocks counted in the
+          summary, in the order they are reported.
+        file_counts: The number of files of each kind.
+        comment_count: The number of lines with a comment, across every
+          Fortran file.
+        top_level_blocks: Whether only the top level code blocks were
+          counted.
+        top_level_vars: Whether only the variables declared at a code
+          block's widest scope were counted.
+        block_counts: The number of code blocks of each type, keyed by
+          the names in BLOCK_TYPES.
+        variable_counts: The number of variables of each data type,
+          keyed by the names in 'Variable.ALL_DATA_TYPES'.
+    """
+
+    BLOCK_TYPES = [
+        "FortranDoLoop",
+        "FortranFunction",
+        "FortranIfBlock",
+        "FortranInterface",
+        "FortranModule",
+        "FortranProgram",
+        "FortranSubroutine",
+        "FortranType",
+    ]
+
+    file_counts: FileCounts
+    comment_count: int
+    top_level_blocks: bool
+    top_level_vars: bool
+    block_counts: Dict[str, int]
+    variable_counts: Dict[str, int]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the summary with the keys used by the serializers."""
+
+        return {
+            **self.file_counts.to_dict(),
+            "commentCount": self.comment_count,
+            "topLevelCodeBlocksOnly": self.top_level_blocks,
+            "topLevelVariablesOnly": self.top_level_vars,
+            "codeBlockTypeSummary": {
+                "doLoopCount": self.block_counts["FortranDoLoop"],
+                "functionCount": self.block_counts["FortranFunction"],
+                "ifBlockCount": self.block_counts["FortranIfBlock"],
+                "interfaceCount": self.block_counts["FortranInterface"],
+                "moduleCount": self.block_counts["FortranModule"],
+                "programCount": self.block_counts["FortranProgram"],
+                "subroutineCount": self.block_counts["FortranSubroutine"],
+                "derivedTypeDeclarationCount": self.block_counts["FortranType"],
+            },
+            "variableDataTypeSummary": {
+                "characterCount": self.variable_counts["CHARACTER"],
+                "classCount": self.variable_counts["CLASS"],
+                "complexCount": self.variable_counts["COMPLEX"],
+                "doubleComplexCount": self.variable_counts["DOUBLE COMPLEX"],
+                "doublePrecisionCount": self.variable_counts["DOUBLE PRECISION"],
+                "integerCount": self.variable_counts["INTEGER"],
+                "logicalCount": self.variable_counts["LOGICAL"],
+                "realCount": self.variable_counts["REAL"],
+                "typeCount": self.variable_counts["TYPE"],
+            },
+        }
+
+
+@dataclass
+class ComponentListing:
+    """A code block and its variables, as listed by list-all-variables.
+
+    Attributes that a type of code block does not have are None, rather
+    than empty, so that renderers can tell the two apart.
+
+    Attributes:
+        block_type: The type of the code block, e.g. 'Subroutine'.
+        start_line_number: The line number of the first line in the
+          block.
+        end_line_number: The line number of the final line in the block.
+        block_name: The name of the block.
+        is_recursive: Whether the block is a recursive function or
+          subroutine.
+        variables: The variables listed for the block. These are the
+          block's own Variable objects, not copies.
+        subprograms: The listings for the block's subprograms.
+    """
+
+    block_type: str
+    start_line_number: int
+    end_line_number: int
+    block_name: Optional[str] = None
+    is_recursive: Optional[bool] = None
+    variables: Optional[List[Variable]] = None
+    subprograms: Optional[List["ComponentListing"]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the listing with the keys used by the serializers."""
+
+        component_dict: Dict[str, Any] = {
+            "blockType": self.block_type.lower(),
+            "startLineNumber": self.start_line_number,
+            "endLineNumber": self.end_line_number,
+        }
+
+        if self.block_name is not None:
+            component_dict["blockName"] = self.block_name
+
+        if self.is_recursive is not None:
+            component_dict["isRecursive"] = self.is_recursive
+
+        if self.subprograms is not None:
+            component_dict["subprogramCount"] = len(self.subprograms)
+            component_dict["subprograms"] = [subprogram.to_dict() for subprogram in self.subprograms]
+
+        if self.variables is not None:
+            component_dict["variableCount"] = len(self.variables)
+            component_dict["variables"] = [build_variable_dict(variable) for variable in self.variables]
+
+        return component_dict
+
+
+@dataclass
+class FileListing:
+    """A file and its code blocks, as listed by list-all-variables.
+
+    Attributes:
+        path_from_root: The path to the file from the root of the
+          codebase.
+        failed_fortran_parse: Whether the file is a Fortran file that
+          failed parsing.
+        components: The listings for the file's top level code blocks,
+          or None if the file is not a parsed Fortran file.
+    """
+
+    path_from_root: str
+    failed_fortran_parse: bool
+    components: Optional[List[ComponentListing]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the listing with the keys used by the serializers."""
+
+        file_dict: Dict[str, Any] = {
+            "filePath": self.path_from_root,
+            "failedFortranParse": self.failed_fortran_parse,
+        }
+
+        if self.components is not None:
+            file_dict["componentCount"] = len(self.components)
+            file_dict["components"] = [component.to_dict() for component in self.components]
+
+        return file_dict
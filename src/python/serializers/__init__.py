@@ -1,5 +1,7 @@
 # flake8: noqa
 
 from .json_serializer import _JSONSerializer
+from .jsonl_serializer import _JSONLSerializer
 from .serializers import SerializerRegistry
+from .sqlite_serializer import _SQLiteSerializer
 from .yaml_serializer import _YAMLSerializer
@@ -1,9 +1,6 @@
 import json
-from collections import defaultdict
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterable, Iterator
 
-from code_data_models.code_block import CodeBlock
-from code_data_models.variable import Variable
 from file_data_models.fortran_file import FortranFile
 
 from .serializers import Serializer, SerializerRegistry
@@ -16,8 +13,14 @@ class _JSONSerializer(Serializer):
     For more information, please see the 'Serializer' base class in the
     'serializers.py' file. Information for any functions not documented
     in this class are available there.
+
+    Attributes:
+        INDENT: The number of spaces each level of the JSON output is
+          indented by.
     """
 
+    INDENT = 4
+
     def _write_json_to_file(self, json_output: Dict[str, Any]) -> None:
         """Writes the results of a class function to a JSON file.
 
@@ -30,174 +33,84 @@ class _JSONSerializer(Serializer):
         """
 
         with open(self.output_path, "w") as f:
-            json.dump(json_output, f, indent=4)
+            json.dump(json_output, f, indent=self.INDENT)
 
-    def serialize_get_raw_contents(self) -> None:
-        output: Dict[str, Any] = {}
-        failed_parse_count = sum(item.failed_fortran_parse for item in self.collected_files)
+    def _write_json_stream_to_file(
+        self, build_header: Callable[[], Dict[str, Any]], list_key: str, items: Iterable[Any]
+    ) -> None:
+        """Writes a JSON object to a file one list item at a time.
 
-        output["fileCount"] = len(self.collected_files)
-        output["fortranFileCount"] = (
-            sum(isinstance(item, FortranFile) for item in self.collected_files) + failed_parse_count
-        )
-        output["fortranFilesFailedToParse"] = failed_parse_count
-        output["files"] = []
+        The output is identical to writing the header fields followed by
+        the list with '_write_json_to_file', but only one item of the
+        list has to be held in memory at a time. This keeps the memory
+        needed for reports on large codebases down. When the collected
+        files are a stream, the header fields are written after the list
+        instead.
 
-        for file_obj in self.collected_files:
-            file_info = {
-                "filePath": file_obj.path_from_root,
-                "failedFortranParse": file_obj.failed_fortran_parse,
-            }
+        Args:
+            build_header: Builds the fields to write before the list.
+            list_key: The key of the list, written as the final field.
+            items: The items of the list. These can be generated lazily.
 
-            if isinstance(file_obj, FortranFile):
-                file_info["contents"] = [line.content for line in file_obj.contents]
+        Raise:
+            FileNotFoundError: The output path for the serializer is not
+              valid.
+        """
 
-            output["files"].append(file_info)
+        def dumps(value: Any, level: int) -> str:
+            # JSON strings can't hold a raw newline, so every newline in
+            # the output is the start of a new indented line.
+            return json.dumps(value, indent=self.INDENT).replace("\n", "\n" + " " * self.INDENT * level)
 
-        self._write_json_to_file(output)
+        is_streaming = self.report_builder.is_streaming
+        indent = " " * self.INDENT
+        with open(self.output_path, "w") as f:
+            f.write("{")
+            if not is_streaming:
+                for key, value in build_header().items():
+                    f.write(f"\n{indent}{json.dumps(key)}: {dumps(value, 1)},")
 
-    def serialize_get_summary(self, top_level_blocks: bool, top_level_vars: bool) -> None:
-        output: Dict[str, Any] = {}
-        failed_parse_count = sum(item.failed_fortran_parse for item in self.collected_files)
+            f.write(f"\n{indent}{json.dumps(list_key)}: [")
+            separator = ""
+            for item in items:
+                f.write(f"{separator}\n{indent * 2}{dumps(item, 2)}")
+                separator = ","
 
-        output["fileCount"] = len(self.collected_files)
-        output["fortranFileCount"] = (
-            sum(isinstance(item, FortranFile) for item in self.collected_files) + failed_parse_count
-        )
-        output["fortranFilesFailedToParse"] = failed_parse_count
-        output["commentCount"] = 0
-        found_blocks = []
-        found_variables = []
-
-        for file_obj in self.collected_files:
-            if not isinstance(file_obj, FortranFile):
-                continue
-
-            found_blocks.extend(file_obj.components)
-            output["commentCount"] += sum(line.contains_comment for line in file_obj.contents)
-
-        output["topLevelCodeBlocksOnly"] = top_level_blocks
-        output["topLevelVariablesOnly"] = top_level_vars
-
-        if not top_level_blocks:
-            subprograms = []
-            for code_block in found_blocks:
-                subprograms.extend(code_block.get_all_subprograms())
-
-            found_blocks.extend(subprograms)
-
-        if not top_level_blocks or top_level_vars:
-            for block in found_blocks:
-                if hasattr(block, "variables") and hasattr(block, "subprograms"):
-                    found_variables.extend(block.get_variables_not_in_subprograms())
-        else:
-            for block in found_blocks:
-                if hasattr(block, "variables"):
-                    found_variables.extend(block.variables)
-
-        block_counts: Dict[str, int] = defaultdict(int)
-        for block in found_blocks:
-            class_name = type(block).__name__
-            block_counts[class_name] += 1
-
-        variable_counts = {}
-        for var_type in Variable.ALL_DATA_TYPES:
-            # We do 'in' instead of '==' here since some data types can have
-            # extra information as part of the type declaration, e.g
-            # 'INTEGER(I8)'.
-            variable_counts[var_type] = sum(var_type in var.data_type for var in found_variables)
-
-        output["codeBlockTypeSummary"] = {
-            "doLoopCount": block_counts["FortranDoLoop"],
-            "functionCount": block_counts["FortranFunction"],
-            "ifBlockCount": block_counts["FortranIfBlock"],
-            "interfaceCount": block_counts["FortranInterface"],
-            "moduleCount": block_counts["FortranModule"],
-            "programCount": block_counts["FortranProgram"],
-            "subroutineCount": block_counts["FortranSubroutine"],
-            "derivedTypeDeclarationCount": block_counts["FortranType"],
-        }
-
-        output["variableDataTypeSummary"] = {
-            "characterCount": variable_counts["CHARACTER"],
-            "classCount": variable_counts["CLASS"],
-            "complexCount": variable_counts["COMPLEX"],
-            "doubleComplexCount": variable_counts["DOUBLE COMPLEX"],
-            "doublePrecisionCount": variable_counts["DOUBLE PRECISION"],
-            "integerCount": variable_counts["INTEGER"],
-            "logicalCount": variable_counts["LOGICAL"],
-            "realCount": variable_counts["REAL"],
-            "typeCount": variable_counts["TYPE"],
-        }
-
-        self._write_json_to_file(output)
+            # An empty list is written on the same line, like json.dump.
+            f.write(f"\n{indent}]" if separator else "]")
 
-    def serialize_list_all_variables(self, no_duplicates: bool) -> None:
-        def build_component_json(component: CodeBlock) -> Dict[str, Any]:
-            class_name = type(component).__name__
-            has_subprograms = hasattr(component, "subprograms")
-
-            component_json: Dict[str, Any] = {
-                "blockType": class_name.replace("Fortran", "").lower(),
-                "startLineNumber": component.start_line_number,
-                "endLineNumber": component.end_line_number,
-            }
-
-            if hasattr(component, "block_name"):
-                component_json["blockName"] = component.block_name
-
-            if hasattr(component, "is_recursive"):
-                component_json["isRecursive"] = component.is_recursive
-
-            if has_subprograms:
-                component_json["subprogramCount"] = len(component.subprograms)
-                component_json["subprograms"] = [
-                    build_component_json(subprogram) for subprogram in component.subprograms
-                ]
-
-            if hasattr(component, "variables"):
-                if has_subprograms and no_duplicates:
-                    variable_list = component.get_variables_not_in_subprograms()
-                else:
-                    variable_list = component.variables
-
-                component_json["variableCount"] = len(variable_list)
-                component_json["variables"] = [build_variable_json(var) for var in variable_list]
-
-            return component_json
-
-        def build_variable_json(variable: Variable) -> Dict[str, Any]:
-            return {
-                "variableName": variable.name,
-                "dataType": variable.data_type,
-                "attributes": variable.attributes,
-                "lineDeclared": variable.line_declared,
-                "possiblyUnused": variable.possibly_unused,
-                "isArray": variable.is_array,
-                "isPointer": variable.is_pointer,
-            }
-
-        output: Dict[str, Any] = {}
-        failed_parse_count = sum(item.failed_fortran_parse for item in self.collected_files)
-
-        output["fileCount"] = len(self.collected_files)
-        output["fortranFileCount"] = (
-            sum(isinstance(item, FortranFile) for item in self.collected_files) + failed_parse_count
-        )
-        output["fortranFilesFailedToParse"] = failed_parse_count
-        output["noDuplicateVariableInformation"] = no_duplicates
-        output["files"] = []
+            if is_streaming:
+                for key, value in build_header().items():
+                    f.write(f",\n{indent}{json.dumps(key)}: {dumps(value, 1)}")
+
+            f.write("\n}")
+
+    def serialize_get_raw_contents(self) -> None:
+        def build_file_json() -> Iterator[Dict[str, Any]]:
+            for file_obj in self.collected_files:
+                file_info: Dict[str, Any] = {
+                    "filePath": file_obj.path_from_root,
+                    "failedFortranParse": file_obj.failed_fortran_parse,
+                }
 
-        for file_obj in self.collected_files:
-            file_info = {
-                "filePath": file_obj.path_from_root,
-                "failedFortranParse": file_obj.failed_fortran_parse,
-            }
+                if isinstance(file_obj, FortranFile):
+                    file_info["contents"] = [line.content for line in file_obj.contents]
 
-            if isinstance(file_obj, FortranFile):
-                file_info["componentCount"] = len(file_obj.components)
-                file_info["components"] = [build_component_json(component) for component in file_obj.components]
+                yield file_info
 
-            output["files"].append(file_info)
+        self._write_json_stream_to_file(
+            lambda: self.report_builder.build_file_counts().to_dict(), "files", build_file_json()
+        )
+
+    def serialize_get_summary(self, top_level_blocks: bool, top_level_vars: bool) -> None:
+        summary = self.report_builder.build_summary(top_level_blocks, top_level_vars)
+        self._write_json_to_file(summary.to_dict())
+
+    def serialize_list_all_variables(self, no_duplicates: bool) -> None:
+        def build_header() -> Dict[str, Any]:
+            header = self.report_builder.build_file_counts().to_dict()
+            header["noDuplicateVariableInformation"] = no_duplicates
+            return header
 
-        self._write_json_to_file(output)
+        file_listings = self.report_builder.build_file_listings(no_duplicates)
+        self._write_json_stream_to_file(build_header, "files", (listing.to_dict() for listing in file_listings))
@@ -0,0 +1,144 @@
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from file_data_models.fortran_file import FortranFile
+from reports.report_models import ComponentListing, build_variable_dict
+
+from .serializers import Serializer, SerializerRegistry
+
+
+@SerializerRegistry.register("jsonl")
+class _JSONLSerializer(Serializer):
+    """A serializer class for the JSON Lines format.
+
+    Every line of the output is a separate JSON object, called a record.
+    Each record has a 'recordType' field saying what it describes, and
+    repeats the path of its file, so any range of lines can be processed
+    on its own. The output is flushed after each file, so it can be read
+    while it is still being written.
+
+    For more information, please see the 'Serializer' base class in the
+    'serializers.py' file. Information for any functions not documented
+    in this class are available there.
+    """
+
+    def _write_records_to_file(self, records: Iterable[Optional[Dict[str, Any]]]) -> None:
+        """Writes records to a JSON Lines file.
+
+        Args:
+            records: The records to write, one per line. A None value
+              marks the end of a file's records, and flushes the output.
+
+        Raise:
+            FileNotFoundError: The output path for the serializer is not
+              valid.
+        """
+
+        with open(self.output_path, "w") as f:
+            for record in records:
+                if record is None:
+                    f.flush()
+                else:
+                    f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def _build_header_record(self, **fields: Any) -> Dict[str, Any]:
+        """Builds the record at the start of each command's output.
+
+        When the collected files are a stream, this record comes at the
+        end of the output instead, once the file counts are known.
+        """
+
+        return {"recordType": "scan", **self.report_builder.build_file_counts().to_dict(), **fields}
+
+    def serialize_get_raw_contents(self) -> None:
+        def build_records() -> Iterator[Optional[Dict[str, Any]]]:
+            if not self.report_builder.is_streaming:
+                yield self._build_header_record()
+
+            for file_obj in self.collected_files:
+                record: Dict[str, Any] = {
+                    "recordType": "file",
+                    "filePath": file_obj.path_from_root,
+                    "failedFortranParse": file_obj.failed_fortran_parse,
+                }
+
+                if isinstance(file_obj, FortranFile):
+                    record["contents"] = [line.content for line in file_obj.contents]
+
+                yield record
+                yield None
+
+            if self.report_builder.is_streaming:
+                yield self._build_header_record()
+
+        self._write_records_to_file(build_records())
+
+    def serialize_get_summary(self, top_level_blocks: bool, top_level_vars: bool) -> None:
+        summary = self.report_builder.build_summary(top_level_blocks, top_level_vars)
+        self._write_records_to_file([{"recordType": "summary", **summary.to_dict()}])
+
+    def serialize_list_all_variables(self, no_duplicates: bool) -> None:
+        def build_component_records(
+            component: ComponentListing, file_path: str, parent: Optional[ComponentListing]
+        ) -> Iterator[Dict[str, Any]]:
+            block_fields: Dict[str, Any] = {"blockType": component.block_type.lower()}
+            if component.block_name is not None:
+                block_fields["blockName"] = component.block_name
+
+            record: Dict[str, Any] = {
+                "recordType": "component",
+                "filePath": file_path,
+                **block_fields,
+                "startLineNumber": component.start_line_number,
+                "endLineNumber": component.end_line_number,
+                "parentStartLineNumber": parent.start_line_number if parent is not None else None,
+            }
+
+            if component.is_recursive is not None:
+                record["isRecursive"] = component.is_recursive
+
+            if component.subprograms is not None:
+                record["subprogramCount"] = len(component.subprograms)
+
+            if component.variables is not None:
+                record["variableCount"] = len(component.variables)
+
+            yield record
+
+            for variable in component.variables or []:
+                yield {
+                    "recordType": "variable",
+                    "filePath": file_path,
+                    **block_fields,
+                    "blockStartLineNumber": component.start_line_number,
+                    **build_variable_dict(variable),
+                }
+
+            for subprogram in component.subprograms or []:
+                yield from build_component_records(subprogram, file_path, component)
+
+        def build_records() -> Iterator[Optional[Dict[str, Any]]]:
+            if not self.report_builder.is_streaming:
+                yield self._build_header_record(noDuplicateVariableInformation=no_duplicates)
+
+            for listing in self.report_builder.build_file_listings(no_duplicates):
+                record: Dict[str, Any] = {
+                    "recordType": "file",
+                    "filePath": listing.path_from_root,
+                    "failedFortranParse": listing.failed_fortran_parse,
+                }
+
+                if listing.components is not None:
+                    record["componentCount"] = len(listing.components)
+
+                yield record
+
+                for component in listing.components or []:
+                    yield from build_component_records(component, listing.path_from_root, None)
+
+                yield None
+
+            if self.report_builder.is_streaming:
+                yield self._build_header_record(noDuplicateVariableInformation=no_duplicates)
+
+        self._write_records_to_file(build_records())
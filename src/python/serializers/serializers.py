@@ -1,8 +1,10 @@
 import os
 from abc import ABC, abstractmethod
-from typing import Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from file_data_models.digital_file import DigitalFile
+from file_data_models.file_stream import FileStream
+from reports.report_builder import ReportBuilder
 
 
 class Serializer(ABC):
@@ -18,9 +20,19 @@ class Serializer(ABC):
         output_path: The path the serializer writes to when called.
         collected_files: The file(s) collected by the application's file
           parser. These files are then processed during serialization.
+          When they are a file stream, the commands that list each file
+          write the file counts after the files, as the counts are only
+          known once the stream has been read.
+        report_builder: Builds the results of each command from the
+          collected files, for the serializer to render.
     """
 
-    def __init__(self, output_path: str, collected_files: List[DigitalFile]):
+    def __init__(
+        self,
+        output_path: str,
+        collected_files: Union[List[DigitalFile], FileStream],
+        report_builder: Optional[ReportBuilder] = None,
+    ):
         """Initialises a Serializer object.
 
         This __init__ can only be called by fully implemented child
@@ -31,10 +43,15 @@ class Serializer(ABC):
             collected_files: The file(s) collected by the application's
               file parser. These files are then processed during
               serialization.
+            report_builder: A report builder for the collected files.
+              Passing the same builder to several serializers lets them
+              share the results it has already built. A new builder is
+              made if one is not provided.
         """
 
         self.output_path = os.path.abspath(output_path)
         self.collected_files = collected_files
+        self.report_builder = report_builder if report_builder is not None else ReportBuilder(collected_files)
 
     @abstractmethod
     def serialize_get_raw_contents(self) -> None:
@@ -109,7 +126,9 @@ class SerializerRegistry:
         return wrapper
 
     @classmethod
-    def get_serializer(cls, format: str, output_path: str, collected_files: List[DigitalFile]) -> Serializer:
+    def get_serializer(
+        cls, format: str, output_path: str, collected_files: Union[List[DigitalFile], FileStream], **options: Any
+    ) -> Serializer:
         """Finds and returns an instance of a serializer.
 
         Checks the Serializer Registry for a serializer class registered
@@ -123,6 +142,8 @@ class SerializerRegistry:
             collected_files: The file(s) collected by the application's
               file parser. These files are then processed during
               serialization.
+            **options: Any options specific to the registered class,
+              passed on when the class is initialised.
 
         Returns:
             An instance of the class registered under the provided key
@@ -134,7 +155,7 @@ class SerializerRegistry:
         """
 
         serializer = cls._serializers[format]
-        return serializer(output_path, collected_files)  # type: ignore[operator]
+        return serializer(output_path, collected_files, **options)  # type: ignore[operator]
 
     @classmethod
     def get_all_serializable_formats(cls) -> List[str]:
@@ -0,0 +1,65 @@
+from file_data_models.fortran_file import FortranFile
+from storage.sqlite_store import SQLiteStore
+
+from .serializers import Serializer, SerializerRegistry
+
+
+@SerializerRegistry.register("sqlite")
+class _SQLiteSerializer(Serializer):
+    """A serializer class for SQLite databases.
+
+    Each command's results are written to a new database, replacing any
+    database already at the output path. The tables of the database are
+    described in the 'storage/sqlite_store.py' file, and stored results
+    can be searched with the CLI's query command.
+
+    For more information, please see the 'Serializer' base class in the
+    'serializers.py' file. Information for any functions not documented
+    in this class are available there.
+    """
+
+    def serialize_get_raw_contents(self) -> None:
+        with SQLiteStore.create(self.output_path) as store:
+            for file_obj in self.collected_files:
+                is_fortran = isinstance(file_obj, FortranFile)
+                file_id = store.add_file(file_obj.path_from_root, is_fortran, file_obj.failed_fortran_parse)
+                if isinstance(file_obj, FortranFile):
+                    store.add_statements(file_id, file_obj.contents)
+
+                store.end_file()
+
+            # The counts are stored last, as they are only complete once
+            # every file has been read when the files are streamed.
+            store.add_scan_info(command="get-raw-contents", **self.report_builder.build_file_counts().to_dict())
+            store.finish()
+
+    def serialize_get_summary(self, top_level_blocks: bool, top_level_vars: bool) -> None:
+        summary = self.report_builder.build_summary(top_level_blocks, top_level_vars)
+
+        with SQLiteStore.create(self.output_path) as store:
+            store.add_scan_info(
+                command="get-summary",
+                **summary.file_counts.to_dict(),
+                commentCount=summary.comment_count,
+                topLevelCodeBlocksOnly=top_level_blocks,
+                topLevelVariablesOnly=top_level_vars,
+            )
+            store.add_summary(summary)
+            store.finish()
+
+    def serialize_list_all_variables(self, no_duplicates: bool) -> None:
+        with SQLiteStore.create(self.output_path) as store:
+            for listing in self.report_builder.build_file_listings(no_duplicates):
+                is_fortran = listing.components is not None
+                file_id = store.add_file(listing.path_from_root, is_fortran, listing.failed_fortran_parse)
+                for component in listing.components or []:
+                    store.add_component(file_id, component)
+
+                store.end_file()
+
+            store.add_scan_info(
+                command="list-all-variables",
+                **self.report_builder.build_file_counts().to_dict(),
+                noDuplicateVariableInformation=no_duplicates,
+            )
+            store.finish()
@@ -1,18 +1,25 @@
-from collections import defaultdict
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
 
 import yaml
 
-from code_data_models.code_block import CodeBlock
-from code_data_models.variable import Variable
+from file_data_models.digital_file import DigitalFile
+from file_data_models.file_stream import FileStream
 from file_data_models.fortran_file import FortranFile
+from reports.report_builder import ReportBuilder
 
 from .serializers import Serializer, SerializerRegistry
 
+try:
+    # The C emitter from libyaml is much faster than the pure Python one,
+    # but it is only available if PyYAML was built with libyaml.
+    from yaml import CSafeDumper as BaseSafeDumper
+except ImportError:
+    from yaml import SafeDumper as BaseSafeDumper
+
 
 # We override the ignore_aliases function from the yaml Dumper class in
 # order to serialize to YAML without generating anchors and aliases.
-class NoAliasDumper(yaml.SafeDumper):
+class NoAliasDumper(BaseSafeDumper):
     def ignore_aliases(self, data: Any) -> bool:
         return True
 
@@ -24,8 +31,38 @@ class _YAMLSerializer(Serializer):
     For more information, please see the 'Serializer' base class in the
     'serializers.py' file. Information for any functions not documented
     in this class are available there.
+
+    Attributes:
+        multi_document: Whether the commands that list information for
+          each file write a separate YAML document for every file,
+          rather than one document containing every file.
     """
 
+    def __init__(
+        self,
+        output_path: str,
+        collected_files: Union[List[DigitalFile], FileStream],
+        report_builder: Optional[ReportBuilder] = None,
+        multi_document: bool = False,
+    ) -> None:
+        """Initialises a YAML serializer.
+
+        Args:
+            output_path: The path the serializer writes to when called.
+            collected_files: The file(s) collected by the application's
+              file parser.
+            report_builder: A report builder for the collected files.
+            multi_document: When True, the commands that list
+              information for each file write a first document holding
+              the overall counts, followed by one document per file.
+              Each document is written as soon as it is built, so memory
+              use stays flat and the output can be read before it is
+              finished.
+        """
+
+        super().__init__(output_path, collected_files, report_builder)
+        self.multi_document = multi_document
+
     def _write_yaml_to_file(self, yaml_output: Dict[str, Any]) -> None:
         """Writes the results of a class function to a YAML file.
 
@@ -40,168 +77,83 @@ class _YAMLSerializer(Serializer):
         with open(self.output_path, "w") as f:
             yaml.dump(yaml_output, f, Dumper=NoAliasDumper, sort_keys=False)
 
-    def serialize_get_raw_contents(self) -> None:
-        output: Dict[str, Any] = {}
-        failed_parse_count = sum(item.failed_fortran_parse for item in self.collected_files)
-
-        output["fileCount"] = len(self.collected_files)
-        output["fortranFileCount"] = (
-            sum(isinstance(item, FortranFile) for item in self.collected_files) + failed_parse_count
-        )
-        output["fortranFilesFailedToParse"] = failed_parse_count
-        output["files"] = []
+    def _write_yaml_documents_to_file(
+        self, build_header: Callable[[], Dict[str, Any]], list_key: str, items: Iterable[Any]
+    ) -> None:
+        """Writes the results of a class function that lists each file.
 
-        for file_obj in self.collected_files:
-            file_info = {
-                "filePath": file_obj.path_from_root,
-                "failedFortranParse": file_obj.failed_fortran_parse,
-            }
+        When the collected files are a stream, the header is written
+        after the list of files instead, and each file is written as soon
+        as it is built.
 
-            if isinstance(file_obj, FortranFile):
-                file_info["contents"] = [line.content for line in file_obj.contents]
-
-            output["files"].append(file_info)
-
-        self._write_yaml_to_file(output)
+        Args:
+            build_header: Builds the fields to write before the list of
+              files.
+            list_key: The key of the list of files.
+            items: The information for each file. These can be generated
+              lazily.
 
-    def serialize_get_summary(self, top_level_blocks: bool, top_level_vars: bool) -> None:
-        output: Dict[str, Any] = {}
-        failed_parse_count = sum(item.failed_fortran_parse for item in self.collected_files)
+        Raise:
+            FileNotFoundError: The output path for the serializer is not
+              valid.
+        """
 
-        output["fileCount"] = len(self.collected_files)
-        output["fortranFileCount"] = (
-            sum(isinstance(item, FortranFile) for item in self.collected_files) + failed_parse_count
-        )
-        output["fortranFilesFailedToParse"] = failed_parse_count
-        output["commentCount"] = 0
-        found_blocks = []
-        found_variables = []
+        is_streaming = self.report_builder.is_streaming
 
-        for file_obj in self.collected_files:
-            if not isinstance(file_obj, FortranFile):
-                continue
+        if self.multi_document:
 
-            found_blocks.extend(file_obj.components)
-            output["commentCount"] += sum(line.contains_comment for line in file_obj.contents)
+            def build_documents() -> Iterator[Any]:
+                if not is_streaming:
+                    yield build_header()
+                yield from items
+                if is_streaming:
+                    yield build_header()
 
-        output["topLevelCodeBlocksOnly"] = top_level_blocks
-        output["topLevelVariablesOnly"] = top_level_vars
+            with open(self.output_path, "w") as f:
+                yaml.dump_all(build_documents(), f, Dumper=NoAliasDumper, sort_keys=False, explicit_start=True)
+        elif not is_streaming:
+            self._write_yaml_to_file({**build_header(), list_key: list(items)})
+        else:
+            with open(self.output_path, "w") as f:
+                # A list in a mapping is not indented by the dumper, so
+                # dumping each item as its own list gives the same text
+                # as dumping the whole list at once.
+                f.write(f"{list_key}:")
+                is_empty = True
+                for item in items:
+                    f.write("\n" if is_empty else "")
+                    yaml.dump([item], f, Dumper=NoAliasDumper, sort_keys=False)
+                    is_empty = False
+
+                f.write(" []\n" if is_empty else "")
+                yaml.dump(build_header(), f, Dumper=NoAliasDumper, sort_keys=False)
 
-        if not top_level_blocks:
-            subprograms = []
-            for code_block in found_blocks:
-                subprograms.extend(code_block.get_all_subprograms())
+    def serialize_get_raw_contents(self) -> None:
+        def build_file_dicts() -> Iterator[Dict[str, Any]]:
+            for file_obj in self.collected_files:
+                file_info: Dict[str, Any] = {
+                    "filePath": file_obj.path_from_root,
+                    "failedFortranParse": file_obj.failed_fortran_parse,
+                }
 
-            found_blocks.extend(subprograms)
+                if isinstance(file_obj, FortranFile):
+                    file_info["contents"] = [line.content for line in file_obj.contents]
 
-        if not top_level_blocks or top_level_vars:
-            for block in found_blocks:
-                found_variables.extend(block.get_variables_not_in_subprograms())
-        else:
-            for block in found_blocks:
-                found_variables.extend(block.variables)
-
-        block_counts: Dict[str, int] = defaultdict(int)
-        for block in found_blocks:
-            class_name = type(block).__name__
-            block_counts[class_name] += 1
-
-        variable_counts = {}
-        for var_type in Variable.ALL_DATA_TYPES:
-            # We do 'in' instead of '==' here since some data types can have
-            # extra information as part of the type declaration, e.g
-            # 'INTEGER(I8)'.
-            variable_counts[var_type] = sum(var_type in var.data_type for var in found_variables)
-
-        output["codeBlockTypeSummary"] = {
-            "doLoopCount": block_counts["FortranDoLoop"],
-            "functionCount": block_counts["FortranFunction"],
-            "ifBlockCount": block_counts["FortranIfBlock"],
-            "interfaceCount": block_counts["FortranInterface"],
-            "moduleCount": block_counts["FortranModule"],
-            "programCount": block_counts["FortranProgram"],
-            "subroutineCount": block_counts["FortranSubroutine"],
-            "derivedTypeDeclarationCount": block_counts["FortranType"],
-        }
-
-        output["variableDataTypeSummary"] = {
-            "characterCount": variable_counts["CHARACTER"],
-            "complexCount": variable_counts["COMPLEX"],
-            "doubleComplexCount": variable_counts["DOUBLE COMPLEX"],
-            "doublePrecisionCount": variable_counts["DOUBLE PRECISION"],
-            "integerCount": variable_counts["INTEGER"],
-            "logicalCount": variable_counts["LOGICAL"],
-            "realCount": variable_counts["REAL"],
-        }
-
-        self._write_yaml_to_file(output)
+                yield file_info
 
-    def serialize_list_all_variables(self, no_duplicates: bool) -> None:
-        def build_component_dict(component: CodeBlock) -> Dict[str, Any]:
-            class_name = type(component).__name__
-            has_subprograms = hasattr(component, "subprograms")
-
-            component_json: Dict[str, Any] = {
-                "blockType": class_name.replace("Fortran", "").lower(),
-                "startLineNumber": component.start_line_number,
-                "endLineNumber": component.end_line_number,
-            }
-
-            if hasattr(component, "block_name"):
-                component_json["blockName"] = component.block_name
-
-            if hasattr(component, "is_recursive"):
-                component_json["isRecursive"] = component.is_recursive
-
-            if has_subprograms:
-                component_json["subprogramCount"] = len(component.subprograms)
-                component_json["subprograms"] = [
-                    build_component_dict(subprogram) for subprogram in component.subprograms
-                ]
-
-            if hasattr(component, "variables"):
-                if has_subprograms and no_duplicates:
-                    variable_list = component.get_variables_not_in_subprograms()
-                else:
-                    variable_list = component.variables
-
-                component_json["variableCount"] = len(variable_list)
-                component_json["variables"] = [build_variable_dict(var) for var in variable_list]
-
-            return component_json
-
-        def build_variable_dict(variable: Variable) -> Dict[str, Any]:
-            return {
-                "variableName": variable.name,
-                "dataType": variable.data_type,
-                "attributes": variable.attributes,
-                "lineDeclared": variable.line_declared,
-                "possiblyUnused": variable.possibly_unused,
-                "isArray": variable.is_array,
-                "isPointer": variable.is_pointer,
-            }
-
-        output: Dict[str, Any] = {}
-        failed_parse_count = sum(item.failed_fortran_parse for item in self.collected_files)
-
-        output["fileCount"] = len(self.collected_files)
-        output["fortranFileCount"] = (
-            sum(isinstance(item, FortranFile) for item in self.collected_files) + failed_parse_count
+        self._write_yaml_documents_to_file(
+            lambda: self.report_builder.build_file_counts().to_dict(), "files", build_file_dicts()
         )
-        output["fortranFilesFailedToParse"] = failed_parse_count
-        output["noDuplicateVariableInformation"] = no_duplicates
-        output["files"] = []
 
-        for file_obj in self.collected_files:
-            file_info = {
-                "filePath": file_obj.path_from_root,
-                "failedFortranParse": file_obj.failed_fortran_parse,
-            }
-
-            if isinstance(file_obj, FortranFile):
-                file_info["componentCount"] = len(file_obj.components)
-                file_info["components"] = [build_component_dict(component) for component in file_obj.components]
+    def serialize_get_summary(self, top_level_blocks: bool, top_level_vars: bool) -> None:
+        summary = self.report_builder.build_summary(top_level_blocks, top_level_vars)
+        self._write_yaml_to_file(summary.to_dict())
 
-            output["files"].append(file_info)
+    def serialize_list_all_variables(self, no_duplicates: bool) -> None:
+        def build_header() -> Dict[str, Any]:
+            header = self.report_builder.build_file_counts().to_dict()
+            header["noDuplicateVariableInformation"] = no_duplicates
+            return header
 
-        self._write_yaml_to_file(output)
+        file_listings = self.report_builder.build_file_listings(no_duplicates)
+        self._write_yaml_documents_to_file(build_header, "files", (listing.to_dict() for listing in file_listings))
@@ -0,0 +1,431 @@
+import hashlib
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from types import TracebackType
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Type
+
+from code_data_models.code_block import CodeBlock
+from file_data_models.digital_file import DigitalFile
+from file_data_models.fortran_file import FortranFile
+from utils.repr_builder import build_repr_from_attributes
+
+# This must be bumped whenever a change is made to the tables below or
+# to how fingerprints are taken, as fingerprints from an older version
+# can't be compared with new ones.
+SCAN_HISTORY_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE scans (
+    id INTEGER PRIMARY KEY,
+    code_path TEXT NOT NULL,
+    recorded_at TEXT NOT NULL
+);
+
+CREATE TABLE scan_files (
+    scan_id INTEGER NOT NULL REFERENCES scans (id),
+    path TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    PRIMARY KEY (scan_id, path)
+) WITHOUT ROWID;
+
+CREATE TABLE contents (
+    content_hash TEXT PRIMARY KEY
+) WITHOUT ROWID;
+
+CREATE TABLE content_blocks (
+    content_hash TEXT NOT NULL REFERENCES contents (content_hash),
+    block_key TEXT NOT NULL,
+    block_type TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    PRIMARY KEY (content_hash, block_key)
+) WITHOUT ROWID;
+
+CREATE TABLE content_variables (
+    content_hash TEXT NOT NULL REFERENCES contents (content_hash),
+    variable_key TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    PRIMARY KEY (content_hash, variable_key)
+) WITHOUT ROWID;
+"""
+
+# A file's fingerprints: its code blocks, keyed by block key, with the
+# type and fingerprint of each block, and its variables' fingerprints,
+# keyed by variable key.
+FileFingerprints = Tuple[Dict[str, Tuple[str, str]], Dict[str, str]]
+
+
+@dataclass
+class ScanRecord:
+    """A scan stored in the scan history.
+
+    Attributes:
+        scan_id: The ID of the scan.
+        code_path: The path to the codebase that was scanned.
+        recorded_at: When the scan was recorded, as an ISO 8601 string.
+    """
+
+    scan_id: int
+    code_path: str
+    recorded_at: str
+
+
+@dataclass
+class ScanChange:
+    """A difference between two scans.
+
+    Attributes:
+        change_type: Either 'added', 'removed' or 'changed'.
+        item_type: The type of the item that changed, e.g. 'file',
+          'module', 'subroutine' or 'variable'.
+        file_path: The path of the file the item is in.
+        name: The name of the item. Code blocks and variables are named
+          with the names of the code blocks they are inside of, e.g.
+          'shapes.grow.total'.
+    """
+
+    change_type: str
+    item_type: str
+    file_path: str
+    name: str
+
+
+@dataclass
+class ScanDiff:
+    """The differences between two scans.
+
+    Attributes:
+        old_scan: The earlier of the two scans.
+        new_scan: The later of the two scans.
+        unchanged_file_count: The number of files with the same contents
+          in both scans.
+        changes: The added, removed and changed items.
+    """
+
+    old_scan: ScanRecord
+    new_scan: ScanRecord
+    unchanged_file_count: int = 0
+    changes: List[ScanChange] = field(default_factory=list)
+
+
+class ScanHistory:
+    """A SQLite database recording the scans of a codebase over time.
+
+    Every Fortran file in a scan is recorded with a hash of its contents.
+    Fingerprints of the file's code blocks and variables are stored
+    against the content hash, rather than against the scan, so they are
+    only taken the first time a file's contents are seen. Files that
+    have not changed since an earlier scan are recognised by their hash,
+    and are skipped without walking their code blocks, both when a scan
+    is recorded and when two scans are compared.
+
+    Code blocks are identified by their type and name, along with the
+    types and names of the code blocks they are inside of. Blocks without
+    a name, such as DO loops, are not recorded themselves, but the named
+    blocks inside of them are. Variables are identified by their name and
+    the code block they are declared in.
+
+    Attributes:
+        database_path: The path to the database file.
+        connection: The connection to the database.
+    """
+
+    def __init__(self, database_path: str) -> None:
+        """Opens a scan history, creating it if it does not exist yet.
+
+        Args:
+            database_path: The path to the database file.
+
+        Raises:
+            ValueError: The database was created by a different version
+              of the analyser.
+        """
+
+        self.database_path = database_path
+        self.connection = sqlite3.connect(database_path)
+
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version == 0:
+            with self.connection:
+                self.connection.executescript(SCHEMA)
+                self.connection.execute(f"PRAGMA user_version = {SCAN_HISTORY_VERSION}")
+        elif version != SCAN_HISTORY_VERSION:
+            self.connection.close()
+            raise ValueError(
+                f"The scan history '{database_path}' was created by a different version of the analyser "
+                f"(version {version}, expected {SCAN_HISTORY_VERSION})."
+            )
+
+    def record_scan(self, code_path: str, collected_files: Iterable[DigitalFile]) -> ScanRecord:
+        """Records a scan of a codebase.
+
+        Only Fortran files are recorded, including the ones that failed
+        parsing. The files must have been parsed from disk with their
+        variables, so that each file has a hash of the contents parsed.
+
+        Args:
+            code_path: The path to the codebase/file that was scanned.
+            collected_files: The file(s) collected by the application's
+              file parser.
+
+        Returns:
+            The recorded scan.
+
+        Raises:
+            ValueError: A Fortran file was not parsed from disk.
+        """
+
+        recorded_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO scans (code_path, recorded_at) VALUES (?, ?)", (code_path, recorded_at)
+            )
+            scan_id = cursor.lastrowid
+            assert scan_id is not None
+
+            file_rows: List[Tuple[int, str, str]] = []
+            block_rows: List[Tuple[str, str, str, str]] = []
+            variable_rows: List[Tuple[str, str, str]] = []
+            known_hashes = self._find_known_hashes()
+
+            for file_obj in collected_files:
+                if not isinstance(file_obj, FortranFile) and not file_obj.failed_fortran_parse:
+                    continue
+
+                content_hash = file_obj.content_hash
+                if content_hash is None:
+                    raise ValueError(f"The file '{file_obj.path_from_root}' was not parsed from disk, so has no hash.")
+
+                file_rows.append((scan_id, file_obj.path_from_root, content_hash))
+
+                if content_hash in known_hashes:
+                    continue
+
+                known_hashes.add(content_hash)
+                blocks, variables = self.take_fingerprints(file_obj)
+                block_rows.extend(
+                    (content_hash, key, block_type, fingerprint) for key, (block_type, fingerprint) in blocks.items()
+                )
+                variable_rows.extend((content_hash, key, fingerprint) for key, fingerprint in variables.items())
+                self.connection.execute("INSERT INTO contents VALUES (?)", (content_hash,))
+
+            self.connection.executemany("INSERT OR REPLACE INTO scan_files VALUES (?, ?, ?)", file_rows)
+            self.connection.executemany("INSERT INTO content_blocks VALUES (?, ?, ?, ?)", block_rows)
+            self.connection.executemany("INSERT INTO content_variables VALUES (?, ?, ?)", variable_rows)
+
+        return ScanRecord(scan_id, code_path, recorded_at)
+
+    def get_scans(self) -> List[ScanRecord]:
+        """Returns every recorded scan, from oldest to newest."""
+
+        return [ScanRecord(*row) for row in self.connection.execute("SELECT * FROM scans ORDER BY id")]
+
+    def get_scan(self, scan_id: int) -> ScanRecord:
+        """Finds a recorded scan.
+
+        Args:
+            scan_id: The ID of the scan.
+
+        Returns:
+            The recorded scan.
+
+        Raises:
+            KeyError: There is no scan with the ID in the history.
+        """
+
+        row = self.connection.execute("SELECT * FROM scans WHERE id = ?", (scan_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"There is no scan with the ID {scan_id} in the scan history.")
+
+        return ScanRecord(*row)
+
+    def diff(self, old_scan_id: int, new_scan_id: int) -> ScanDiff:
+        """Finds the differences between two recorded scans.
+
+        Only the files with different content hashes in the two scans
+        have their fingerprints loaded and compared.
+
+        Args:
+            old_scan_id: The ID of the earlier scan.
+            new_scan_id: The ID of the later scan.
+
+        Returns:
+            The added, removed and changed files, code blocks and
+            variables, in order of file path.
+
+        Raises:
+            KeyError: One of the scans is not in the history.
+        """
+
+        scan_diff = ScanDiff(self.get_scan(old_scan_id), self.get_scan(new_scan_id))
+        old_files = self._get_scan_files(old_scan_id)
+        new_files = self._get_scan_files(new_scan_id)
+        empty_fingerprints: FileFingerprints = ({}, {})
+
+        for path in sorted(old_files.keys() | new_files.keys()):
+            old_hash = old_files.get(path)
+            new_hash = new_files.get(path)
+            if old_hash == new_hash:
+                scan_diff.unchanged_file_count += 1
+                continue
+
+            if old_hash is None:
+                scan_diff.changes.append(ScanChange("added", "file", path, path))
+            elif new_hash is None:
+                scan_diff.changes.append(ScanChange("removed", "file", path, path))
+            else:
+                scan_diff.changes.append(ScanChange("changed", "file", path, path))
+
+            old_blocks, old_variables = self._load_fingerprints(old_hash) if old_hash else empty_fingerprints
+            new_blocks, new_variables = self._load_fingerprints(new_hash) if new_hash else empty_fingerprints
+
+            for key in sorted(old_blocks.keys() | new_blocks.keys()):
+                old_block = old_blocks.get(key)
+                new_block = new_blocks.get(key)
+                if old_block != new_block:
+                    block_type = (new_block or old_block or ("", ""))[0]
+                    change_type = self._get_change_type(old_block, new_block)
+                    scan_diff.changes.append(ScanChange(change_type, block_type, path, self._get_display_name(key)))
+
+            for key in sorted(old_variables.keys() | new_variables.keys()):
+                old_fingerprint = old_variables.get(key)
+                new_fingerprint = new_variables.get(key)
+                if old_fingerprint != new_fingerprint:
+                    change_type = self._get_change_type(old_fingerprint, new_fingerprint)
+                    scan_diff.changes.append(ScanChange(change_type, "variable", path, self._get_display_name(key)))
+
+        return scan_diff
+
+    @classmethod
+    def take_fingerprints(cls, file_obj: DigitalFile) -> FileFingerprints:
+        """Takes fingerprints of a file's code blocks and variables.
+
+        Args:
+            file_obj: The parsed file.
+
+        Returns:
+            The fingerprints of the file's code blocks and variables.
+            Files that failed parsing have no fingerprints.
+        """
+
+        fingerprints: FileFingerprints = ({}, {})
+        if isinstance(file_obj, FortranFile):
+            cls._add_block_fingerprints(file_obj.components, "", fingerprints)
+
+        return fingerprints
+
+    @classmethod
+    def _add_block_fingerprints(
+        cls, blocks: Sequence[CodeBlock], parent_key: str, fingerprints: FileFingerprints
+    ) -> None:
+        """Adds the fingerprints for a list of blocks and their contents."""
+
+        block_fingerprints, variable_fingerprints = fingerprints
+
+        for block in blocks:
+            subprograms = getattr(block, "subprograms", None)
+            block_name = getattr(block, "block_name", None)
+            if block_name is None:
+                # Unnamed blocks can't be told apart between scans, so
+                # only the named blocks inside of them are recorded.
+                cls._add_block_fingerprints(subprograms or [], parent_key, fingerprints)
+                continue
+
+            block_type = type(block).__name__.replace("Fortran", "").lower()
+            block_key = cls._get_unique_key(f"{parent_key}/{block_type}:{block_name.lower()}", block_fingerprints)
+            block_hash = hashlib.sha256("\n".join(line.content for line in block.contents).encode())
+            block_fingerprints[block_key] = (block_type, block_hash.hexdigest())
+
+            if subprograms is not None:
+                variables = block.get_variables_not_in_subprograms()
+            else:
+                variables = getattr(block, "variables", [])
+
+            for variable in variables:
+                variable_key = cls._get_unique_key(f"{block_key}/{variable.name.lower()}", variable_fingerprints)
+                declaration = repr((variable.data_type, variable.attributes, variable.is_array, variable.is_pointer))
+                variable_fingerprints[variable_key] = hashlib.sha256(declaration.encode()).hexdigest()
+
+            cls._add_block_fingerprints(subprograms or [], block_key, fingerprints)
+
+    @staticmethod
+    def _get_unique_key(key: str, existing: Dict[str, Any]) -> str:
+        """Numbers a key if it is already in use.
+
+        This happens for blocks that share a name, such as two unnamed
+        interfaces in the same module.
+        """
+
+        unique_key = key
+        count = 1
+        while unique_key in existing:
+            count += 1
+            unique_key = f"{key}#{count}"
+
+        return unique_key
+
+    @staticmethod
+    def _get_display_name(key: str) -> str:
+        """Turns a block or variable key into a readable name."""
+
+        return ".".join(part.split(":")[-1] for part in key.strip("/").split("/"))
+
+    @staticmethod
+    def _get_change_type(old_value: Optional[Any], new_value: Optional[Any]) -> str:
+        """Names the change between an item's old and new fingerprints."""
+
+        if old_value is None:
+            return "added"
+
+        return "removed" if new_value is None else "changed"
+
+    def _find_known_hashes(self) -> Set[str]:
+        """Returns the content hashes that already have fingerprints."""
+
+        return {row[0] for row in self.connection.execute("SELECT content_hash FROM contents")}
+
+    def _get_scan_files(self, scan_id: int) -> Dict[str, str]:
+        """Returns the content hash of each file in a scan, by path."""
+
+        return dict(self.connection.execute("SELECT path, content_hash FROM scan_files WHERE scan_id = ?", (scan_id,)))
+
+    def _load_fingerprints(self, content_hash: str) -> FileFingerprints:
+        """Loads the stored fingerprints for a file's contents."""
+
+        blocks = {
+            key: (block_type, fingerprint)
+            for key, block_type, fingerprint in self.connection.execute(
+                "SELECT block_key, block_type, fingerprint FROM content_blocks WHERE content_hash = ?",
+                (content_hash,),
+            )
+        }
+        variables = dict(
+            self.connection.execute(
+                "SELECT variable_key, fingerprint FROM content_variables WHERE content_hash = ?", (content_hash,)
+            )
+        )
+
+        return blocks, variables
+
+    def close(self) -> None:
+        """Closes the connection to the database."""
+
+        self.connection.close()
+
+    def __enter__(self) -> "ScanHistory":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return build_repr_from_attributes(
+            target_object=self,
+            database_path=self.database_path,
+        )
@@ -0,0 +1,358 @@
+import json
+import os
+import pathlib
+import sqlite3
+from types import TracebackType
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+from code_data_models.code_statement import CodeStatement
+from reports.report_models import ComponentListing, SummaryReport
+from utils.repr_builder import build_repr_from_attributes
+
+# This must be bumped whenever a change is made to the tables below, so
+# that anything reading a database can tell which layout it has.
+SQLITE_SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE scan_info (
+    key TEXT PRIMARY KEY,
+    value
+);
+
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    is_fortran INTEGER NOT NULL,
+    failed_fortran_parse INTEGER NOT NULL
+);
+
+CREATE TABLE statements (
+    file_id INTEGER NOT NULL REFERENCES files (id),
+    position INTEGER NOT NULL,
+    line_number INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    PRIMARY KEY (file_id, position)
+) WITHOUT ROWID;
+
+CREATE TABLE blocks (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files (id),
+    parent_id INTEGER REFERENCES blocks (id),
+    block_type TEXT NOT NULL,
+    block_name TEXT,
+    is_recursive INTEGER,
+    start_line INTEGER NOT NULL,
+    end_line INTEGER NOT NULL
+);
+
+CREATE TABLE variables (
+    id INTEGER PRIMARY KEY,
+    block_id INTEGER NOT NULL REFERENCES blocks (id),
+    name TEXT NOT NULL,
+    data_type TEXT NOT NULL,
+    attributes TEXT NOT NULL,
+    line_declared INTEGER NOT NULL,
+    possibly_unused INTEGER NOT NULL,
+    is_array INTEGER NOT NULL,
+    is_pointer INTEGER NOT NULL
+);
+
+CREATE TABLE summary_counts (
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (category, name)
+);
+"""
+
+# The indexes are created after the rows are inserted, as building an
+# index once is quicker than keeping it up to date through every insert.
+INDEXES = """
+CREATE INDEX blocks_file_id ON blocks (file_id);
+CREATE INDEX blocks_parent_id ON blocks (parent_id);
+CREATE INDEX blocks_type_name ON blocks (block_type, block_name);
+CREATE INDEX variables_block_id ON variables (block_id);
+CREATE INDEX variables_name ON variables (name);
+CREATE INDEX variables_data_type ON variables (data_type);
+"""
+
+
+class SQLiteStore:
+    """A SQLite database holding the results of a scan.
+
+    Rows are gathered in memory and written with one 'executemany' per
+    table, in a transaction for every BATCH_SIZE files. Row IDs are given
+    out by the store rather than the database, so a code block's row can
+    link to its parent before either has been written.
+
+    The store can be used as a context manager, which writes any rows
+    still waiting and closes the database on exit.
+
+    Attributes:
+        BATCH_SIZE: The number of files written in each transaction.
+        database_path: The path to the database file.
+        connection: The connection to the database.
+    """
+
+    BATCH_SIZE = 500
+
+    def __init__(self, database_path: str, connection: sqlite3.Connection) -> None:
+        """Initialises a store for an open database.
+
+        Use 'create' or 'open_read_only' rather than calling this
+        directly.
+
+        Args:
+            database_path: The path to the database file.
+            connection: The connection to the database.
+        """
+
+        self.database_path = database_path
+        self.connection = connection
+        self._pending_rows: Dict[str, List[Tuple[Any, ...]]] = {}
+        self._pending_file_count = 0
+        self._next_ids = {"files": 1, "blocks": 1}
+
+    @classmethod
+    def create(cls, database_path: str) -> "SQLiteStore":
+        """Creates a new, empty database for a scan's results.
+
+        Any existing database at the path is replaced.
+
+        Args:
+            database_path: The path to create the database at.
+
+        Returns:
+            A store for the new database.
+
+        Raises:
+            FileNotFoundError: The directory for the database does not
+              exist.
+        """
+
+        if not os.path.isdir(os.path.dirname(os.path.abspath(database_path))):
+            raise FileNotFoundError(f"No such directory for the database: '{database_path}'")
+
+        if os.path.exists(database_path):
+            os.remove(database_path)
+
+        connection = sqlite3.connect(database_path)
+        # The database is rebuilt from scratch if a scan is interrupted,
+        # so there is no need to pay for a rollback journal.
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.executescript(SCHEMA)
+        connection.execute(f"PRAGMA user_version = {SQLITE_SCHEMA_VERSION}")
+
+        return cls(database_path, connection)
+
+    @classmethod
+    def open_read_only(cls, database_path: str) -> "SQLiteStore":
+        """Opens an existing database without allowing any changes to it.
+
+        Args:
+            database_path: The path to the database.
+
+        Returns:
+            A store for the database.
+
+        Raises:
+            sqlite3.OperationalError: The database could not be opened.
+        """
+
+        # The path is quoted, so that characters like '?' and '%' are
+        # not read as part of the URI.
+        database_uri = pathlib.Path(os.path.abspath(database_path)).as_uri()
+        connection = sqlite3.connect(f"{database_uri}?mode=ro", uri=True)
+        connection.execute("PRAGMA query_only = ON")
+
+        return cls(database_path, connection)
+
+    def add_scan_info(self, **fields: Any) -> None:
+        """Stores details about the scan, such as the command that was run.
+
+        Args:
+            **fields: The details to store, keyed by name.
+        """
+
+        self._add_rows("INSERT INTO scan_info VALUES (?, ?)", list(fields.items()))
+
+    def add_file(self, path: str, is_fortran: bool, failed_fortran_parse: bool) -> int:
+        """Stores a file.
+
+        Args:
+            path: The path to the file from the root of the codebase.
+            is_fortran: Whether the file is a parsed Fortran file.
+            failed_fortran_parse: Whether the file is a Fortran file that
+              failed parsing.
+
+        Returns:
+            The ID of the file's row.
+        """
+
+        file_id = self._take_id("files")
+        self._add_rows("INSERT INTO files VALUES (?, ?, ?, ?)", [(file_id, path, is_fortran, failed_fortran_parse)])
+
+        return file_id
+
+    def add_statements(self, file_id: int, statements: Sequence[CodeStatement]) -> None:
+        """Stores the statements of a file.
+
+        Args:
+            file_id: The ID of the file the statements are from.
+            statements: The statements of the file, in order.
+        """
+
+        self._add_rows(
+            "INSERT INTO statements VALUES (?, ?, ?, ?)",
+            [(file_id, position, line.line_number, line.content) for position, line in enumerate(statements)],
+        )
+
+    def add_component(self, file_id: int, component: ComponentListing, parent_id: Optional[int] = None) -> int:
+        """Stores a code block, along with its variables and subprograms.
+
+        Args:
+            file_id: The ID of the file the code block is in.
+            component: The listing for the code block.
+            parent_id: The ID of the code block this block is inside of.
+
+        Returns:
+            The ID of the code block's row.
+        """
+
+        block_id = self._take_id("blocks")
+        self._add_rows(
+            "INSERT INTO blocks VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    block_id,
+                    file_id,
+                    parent_id,
+                    component.block_type.lower(),
+                    component.block_name,
+                    component.is_recursive,
+                    component.start_line_number,
+                    component.end_line_number,
+                )
+            ],
+        )
+
+        self._add_rows(
+            "INSERT INTO variables VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    block_id,
+                    variable.name,
+                    variable.data_type,
+                    json.dumps(variable.attributes),
+                    variable.line_declared,
+                    variable.possibly_unused,
+                    variable.is_array,
+                    variable.is_pointer,
+                )
+                for variable in component.variables or []
+            ],
+        )
+
+        for subprogram in component.subprograms or []:
+            self.add_component(file_id, subprogram, block_id)
+
+        return block_id
+
+    def add_summary(self, summary: SummaryReport) -> None:
+        """Stores the code block and variable counts of a summary.
+
+        Args:
+            summary: The summary to store.
+        """
+
+        rows: List[Tuple[Any, ...]] = [
+            ("blockType", block_type, count) for block_type, count in summary.block_counts.items()
+        ]
+        rows.extend(("dataType", data_type, count) for data_type, count in summary.variable_counts.items())
+        self._add_rows("INSERT INTO summary_counts VALUES (?, ?, ?)", rows)
+
+    def end_file(self) -> None:
+        """Marks the end of a file's rows, writing a batch if one is full."""
+
+        self._pending_file_count += 1
+        if self._pending_file_count >= self.BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes every waiting row to the database in one transaction."""
+
+        with self.connection:
+            for sql, rows in self._pending_rows.items():
+                self.connection.executemany(sql, rows)
+
+        self._pending_rows.clear()
+        self._pending_file_count = 0
+
+    def finish(self) -> None:
+        """Writes every waiting row and builds the database's indexes."""
+
+        self.flush()
+        self.connection.executescript(INDEXES)
+        self.connection.execute("ANALYZE")
+        self.connection.commit()
+
+    def query(self, sql: str, parameters: Sequence[Any] = ()) -> Tuple[List[str], Iterator[Tuple[Any, ...]]]:
+        """Runs a SQL query against the database.
+
+        Args:
+            sql: The query to run.
+            parameters: The values for any placeholders in the query.
+
+        Returns:
+            The names of the result's columns, and an iterator over the
+            rows of the result.
+
+        Raises:
+            sqlite3.Error: The query is not valid, or tried to change a
+              read-only database.
+        """
+
+        cursor = self.connection.execute(sql, parameters)
+        columns = [column[0] for column in cursor.description or []]
+
+        return columns, iter(cursor)
+
+    def close(self) -> None:
+        """Closes the connection to the database."""
+
+        self.connection.close()
+
+    def _add_rows(self, sql: str, rows: Iterable[Tuple[Any, ...]]) -> None:
+        """Adds rows to be written with the next batch."""
+
+        self._pending_rows.setdefault(sql, []).extend(rows)
+
+    def _take_id(self, table: str) -> int:
+        """Gives out the next row ID for a table."""
+
+        row_id = self._next_ids[table]
+        self._next_ids[table] += 1
+
+        return row_id
+
+    def __enter__(self) -> "SQLiteStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        try:
+            if exc_type is None and self._pending_rows:
+                self.flush()
+        finally:
+            self.close()
+
+    def __repr__(self) -> str:
+        return build_repr_from_attributes(
+            target_object=self,
+            database_path=self.database_path,
+        )
@@ -3,7 +3,9 @@ import json
 import pytest
 from click.testing import CliRunner
 
+from file_data_models.file_stream import FileStream
 from fortran_cli import cli
+from serializers import SerializerRegistry
 
 
 class TestJSONSerializer:
@@ -117,3 +119,41 @@ class TestJSONSerializer:
                 assert "endLineNumber" in component.keys()
                 if component["blockType"] in ("function, subroutine"):
                     assert "isRecursive" in component.keys()
+
+    @pytest.mark.parametrize("item_count", [0, 1, 3])
+    def test_write_json_stream_to_file(self, tmp_path, item_count):
+        output_path = tmp_path / "stream.json"
+        serializer = SerializerRegistry.get_serializer("json", str(output_path), [])
+
+        header = {"fileCount": item_count, "nested": {"flag": True, "values": [1, 2]}, "emptyList": []}
+        items = [
+            {"filePath": f"/file_{i}.f90", "contents": ['PRINT *, "a"', "! é"], "components": []}
+            for i in range(item_count)
+        ]
+
+        # Streaming the items one at a time should give exactly the same
+        # output as dumping the whole object in one go.
+        serializer._write_json_stream_to_file(lambda: header, "files", iter(items))
+        with open(output_path, "r") as f:
+            streamed_output = f.read()
+
+        serializer._write_json_to_file({**header, "files": items})
+        with open(output_path, "r") as f:
+            assert streamed_output == f.read()
+
+    @pytest.mark.parametrize("item_count", [0, 2])
+    def test_write_json_stream_to_file_streaming(self, tmp_path, item_count):
+        output_path = tmp_path / "stream.json"
+        serializer = SerializerRegistry.get_serializer("json", str(output_path), FileStream([]))
+
+        header = {"fileCount": item_count, "nested": {"flag": True}}
+        items = [{"filePath": f"/file_{i}.f90", "contents": ["! a"]} for i in range(item_count)]
+
+        # When the files are streamed, the header fields come after the
+        # list, as they are only known once every file has been read.
+        serializer._write_json_stream_to_file(lambda: header, "files", iter(items))
+        with open(output_path, "r") as f:
+            streamed_output = json.load(f)
+
+        assert list(streamed_output) == ["files", "fileCount", "nested"]
+        assert streamed_output == {**header, "files": items}
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from fortran_cli import cli
+
+
+class TestJSONLSerializer:
+    @pytest.fixture
+    def runner(self):
+        return CliRunner()
+
+    @pytest.fixture
+    def live_data_path(self):
+        return "./src/python/tests/integration/.live_test_data/Fortran"
+
+    def invoke_and_load(self, runner, live_data_path, output_path, command, output_format="jsonl"):
+        result = runner.invoke(
+            cli,
+            [
+                "--fortran-only",
+                "--code-path",
+                live_data_path,
+                "--output-format",
+                output_format,
+                "--output-path",
+                output_path,
+                *command,
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Results serialized successfully" in result.output
+
+        with open(output_path, "r") as f:
+            if output_format == "json":
+                return json.load(f)
+
+            return [json.loads(line) for line in f]
+
+    def test_get_raw_contents(self, runner, live_data_path, tmp_path):
+        header, *records = self.invoke_and_load(runner, live_data_path, tmp_path / "grc.jsonl", ["get-raw-contents"])
+
+        assert header["recordType"] == "scan"
+        assert header["fileCount"] == len(records)
+
+        for record in records:
+            assert record["recordType"] == "file"
+            assert record["filePath"].endswith(".f90")
+            assert isinstance(record["contents"], list)
+
+    def test_get_summary(self, runner, live_data_path, tmp_path):
+        (summary,) = self.invoke_and_load(runner, live_data_path, tmp_path / "gs.jsonl", ["get-summary"])
+
+        assert summary["recordType"] == "summary"
+        assert summary["fileCount"] == 9
+        assert summary["commentCount"] == 108
+        assert len(summary["codeBlockTypeSummary"]) == 8
+        assert len(summary["variableDataTypeSummary"]) == 9
+
+    def test_list_all_variables(self, runner, live_data_path, tmp_path):
+        jsonl_records = self.invoke_and_load(runner, live_data_path, tmp_path / "lav.jsonl", ["list-all-variables"])
+        json_output = self.invoke_and_load(
+            runner, live_data_path, tmp_path / "lav.json", ["list-all-variables"], "json"
+        )
+
+        header, *records = jsonl_records
+        assert header["recordType"] == "scan"
+        assert header["noDuplicateVariableInformation"] is False
+
+        def count_records(components):
+            return sum(
+                1 + component.get("variableCount", 0) + count_records(component.get("subprograms", []))
+                for component in components
+            )
+
+        expected_count = sum(1 + count_records(file_dict["components"]) for file_dict in json_output["files"])
+        assert len(records) == expected_count
+
+        for record in records:
+            assert record["filePath"].endswith(".f90")
+            if record["recordType"] == "component":
+                assert "parentStartLineNumber" in record
+            elif record["recordType"] == "variable":
+                assert record["lineDeclared"] >= record["blockStartLineNumber"]
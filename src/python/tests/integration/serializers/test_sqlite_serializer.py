@@ -0,0 +1,93 @@
+import sqlite3
+
+import pytest
+from click.testing import CliRunner
+
+from fortran_cli import cli
+
+
+class TestSQLiteSerializer:
+    @pytest.fixture
+    def runner(self):
+        return CliRunner()
+
+    @pytest.fixture
+    def live_data_path(self):
+        return "./src/python/tests/integration/.live_test_data/Fortran"
+
+    def invoke_and_connect(self, runner, live_data_path, output_path, command):
+        result = runner.invoke(
+            cli,
+            [
+                "--fortran-only",
+                "--code-path",
+                live_data_path,
+                "--output-format",
+                "sqlite",
+                "--output-path",
+                output_path,
+                *command,
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Results serialized successfully" in result.output
+
+        return sqlite3.connect(output_path)
+
+    def test_get_raw_contents(self, runner, live_data_path, tmp_path):
+        connection = self.invoke_and_connect(runner, live_data_path, tmp_path / "grc.sqlite", ["get-raw-contents"])
+
+        scan_info = dict(connection.execute("SELECT key, value FROM scan_info"))
+        assert scan_info["command"] == "get-raw-contents"
+        assert scan_info["fileCount"] == connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+        first_statement = connection.execute(
+            "SELECT s.content FROM statements s JOIN files f ON s.file_id = f.id "
+            "WHERE f.path = '/simple_eg/hello_world.f90' ORDER BY s.position"
+        ).fetchone()
+        assert first_statement is not None
+
+    def test_get_summary(self, runner, live_data_path, tmp_path):
+        output_path = tmp_path / "gs.sqlite"
+        connection = self.invoke_and_connect(runner, live_data_path, output_path, ["get-summary"])
+
+        scan_info = dict(connection.execute("SELECT key, value FROM scan_info"))
+        assert scan_info["fileCount"] == 9
+        assert scan_info["commentCount"] == 108
+
+        counts = connection.execute("SELECT category, COUNT(*) FROM summary_counts GROUP BY category").fetchall()
+        assert sorted(counts) == [("blockType", 8), ("dataType", 9)]
+
+    def test_list_all_variables(self, runner, live_data_path, tmp_path):
+        connection = self.invoke_and_connect(
+            runner, live_data_path, tmp_path / "lav.sqlite", ["list-all-variables", "--no-duplicates"]
+        )
+
+        scan_info = dict(connection.execute("SELECT key, value FROM scan_info"))
+        assert scan_info["noDuplicateVariableInformation"] == 1
+
+        # Every code block other than a file's top-level blocks links to
+        # a parent block that contains it.
+        bad_parent_links = connection.execute(
+            "SELECT COUNT(*) FROM blocks b JOIN blocks p ON b.parent_id = p.id "
+            "WHERE b.file_id != p.file_id OR b.start_line < p.start_line OR b.end_line > p.end_line"
+        ).fetchone()[0]
+        assert bad_parent_links == 0
+
+        query_plan = " ".join(
+            row[-1]
+            for row in connection.execute(
+                "EXPLAIN QUERY PLAN SELECT v.name FROM variables v JOIN blocks b ON v.block_id = b.id "
+                "WHERE b.block_type = 'module' AND v.data_type = 'REAL' AND v.is_array"
+            )
+        )
+        assert "USING INDEX" in query_plan
+
+    def test_output_replaces_existing_database(self, runner, live_data_path, tmp_path):
+        output_path = tmp_path / "output.sqlite"
+        self.invoke_and_connect(runner, live_data_path, output_path, ["list-all-variables"]).close()
+        connection = self.invoke_and_connect(runner, live_data_path, output_path, ["get-summary"])
+
+        assert connection.execute("SELECT COUNT(*) FROM files").fetchone()[0] == 0
+        assert dict(connection.execute("SELECT key, value FROM scan_info"))["command"] == "get-summary"
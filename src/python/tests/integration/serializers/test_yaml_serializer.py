@@ -77,7 +77,7 @@ class TestYAMLSerializer:
 
         variable_dict = data["variableDataTypeSummary"]
         assert isinstance(variable_dict, dict)
-        assert len(variable_dict) == 7
+        assert len(variable_dict) == 9
         assert all(isinstance(value, int) for value in variable_dict.values())
 
     def test_list_all_variables(self, runner, live_data_path, tmp_path):
@@ -116,3 +116,42 @@ class TestYAMLSerializer:
                 assert "endLineNumber" in component.keys()
                 if component["blockType"] in ("function, subroutine"):
                     assert "isRecursive" in component.keys()
+
+    @pytest.mark.parametrize("command", [["get-raw-contents"], ["list-all-variables", "--no-duplicates"]])
+    def test_multi_document_output(self, runner, live_data_path, tmp_path, command):
+        single_path = tmp_path / "single.yaml"
+        multi_path = tmp_path / "multi.yaml"
+        base_args = ["--fortran-only", "--code-path", live_data_path, "--output-format", "yaml"]
+
+        single_result = runner.invoke(cli, [*base_args, "--output-path", single_path, *command])
+        multi_result = runner.invoke(cli, [*base_args, "--output-path", multi_path, "--multi-document", *command])
+
+        assert single_result.exit_code == 0
+        assert multi_result.exit_code == 0
+
+        with open(single_path, "r") as f:
+            single_data = yaml.safe_load(f)
+
+        with open(multi_path, "r") as f:
+            header, *files = yaml.safe_load_all(f)
+
+        assert "files" not in header
+        assert {**header, "files": files} == single_data
+
+    def test_multi_document_needs_yaml_format(self, runner, live_data_path, tmp_path):
+        result = runner.invoke(
+            cli,
+            [
+                "--code-path",
+                live_data_path,
+                "--output-format",
+                "json",
+                "--output-path",
+                tmp_path / "grc.json",
+                "--multi-document",
+                "get-raw-contents",
+            ],
+        )
+
+        assert result.exit_code != 0
+        assert "Multi-document output can only be used with the YAML output format." in result.output
@@ -1,10 +1,15 @@
 import json
+import shutil
+import subprocess
 from unittest.mock import patch
 
 import pytest
 from click.testing import CliRunner
 
 from fortran_cli import cli
+from parsers.directory_watcher import DirectoryWatcher
+from parsers.file_parser import FileParser
+from parsers.parse_level import ParseLevel
 
 
 class TestFortranCLI:
@@ -60,7 +65,9 @@ class TestFortranCLI:
         assert expected_error_message in result.output
 
     def test_fortran_cli_unsupported_output_format(self, runner, live_data_path):
-        expected_error_message = "Error: Invalid value for '--output-format': 'txt' is not one of 'json', 'yaml'."
+        expected_error_message = (
+            "Error: Invalid value for '--output-format': 'txt' is not one of 'json', 'jsonl', 'sqlite', 'yaml'."
+        )
         result = runner.invoke(
             cli,
             [
@@ -265,3 +272,236 @@ class TestFortranCLI:
         )
         expected_output = "An unknown error occurred while serializing the result of list-all-variables."
         assert expected_output in result.output
+
+    def test_fortran_cli_jobs(self, configured_runner, tmp_path):
+        serial_output_path = tmp_path / "serial.json"
+        parallel_output_path = tmp_path / "parallel.json"
+
+        for jobs, output_path in (("1", serial_output_path), ("2", parallel_output_path)):
+            result = configured_runner.invoke(
+                cli,
+                [
+                    "--jobs",
+                    jobs,
+                    "--output-format",
+                    "json",
+                    "--output-path",
+                    output_path,
+                    "list-all-variables",
+                ],
+            )
+            assert result.exit_code == 0
+
+        with open(serial_output_path, "r") as f:
+            serial_data = json.load(f)
+
+        with open(parallel_output_path, "r") as f:
+            parallel_data = json.load(f)
+
+        # Parsing over several processes should give the exact same
+        # results, in the exact same order, as parsing serially.
+        assert serial_data == parallel_data
+
+    def test_fortran_cli_cache_dir(self, configured_runner, tmp_path):
+        cache_dir = tmp_path / "cache"
+        outputs = []
+
+        # The second run reads everything from the cache populated by
+        # the first, and should give the same results.
+        for _ in range(2):
+            result = configured_runner.invoke(cli, ["--cache-dir", cache_dir, "list-all-variables"])
+            assert result.exit_code == 0
+            outputs.append(result.output)
+
+        assert outputs[0] == outputs[1]
+        assert any(entry.suffix == ".pickle" for entry in cache_dir.iterdir())
+
+    @pytest.mark.parametrize(
+        "command,expected_parse_level",
+        [
+            ("get-raw-contents", ParseLevel.STATEMENTS),
+            ("get-summary", ParseLevel.VARIABLES),
+            ("list-all-variables", ParseLevel.VARIABLES),
+        ],
+    )
+    def test_fortran_cli_parse_level(self, configured_runner, command, expected_parse_level):
+        # Each command should only have the files parsed as far as it
+        # needs them.
+        with patch("fortran_cli.FileParser", wraps=FileParser) as mock_file_parser:
+            result = configured_runner.invoke(cli, [command])
+
+        assert result.exit_code == 0
+        mock_file_parser.assert_called_once()
+        assert mock_file_parser.call_args.args[:2] == (None, expected_parse_level)
+
+    def test_fortran_cli_prompts_for_code_path(self, runner, live_data_path):
+        result = runner.invoke(cli, ["get-summary"], input=f"{live_data_path}\n")
+
+        assert result.exit_code == 0
+        assert "Code path:" in result.output
+        assert "# of FORTRAN files: 9" in result.output
+
+    def test_query(self, configured_runner, tmp_path):
+        database_path = tmp_path / "lav.sqlite"
+        configured_runner.invoke(
+            cli, ["--output-format", "sqlite", "--output-path", database_path, "list-all-variables"]
+        )
+
+        # The query command should not parse the codebase again.
+        with patch("fortran_cli.FileParser") as mock_file_parser:
+            result = configured_runner.invoke(
+                cli, ["query", "--database", database_path, "SELECT COUNT(*) AS total FROM files"]
+            )
+
+        assert result.exit_code == 0
+        assert result.output == "total\n9\n"
+        mock_file_parser.assert_not_called()
+
+        result = configured_runner.invoke(cli, ["query", "--database", database_path, "DELETE FROM files"])
+
+        assert "There was an error while running the query: attempt to write a readonly database" in result.output
+
+    def test_watch(self, runner, tmp_path):
+        code_path = tmp_path / "code"
+        code_path.mkdir()
+        (code_path / "main.f90").write_text("PROGRAM main\nINTEGER :: i\nEND PROGRAM main\n")
+
+        def change_files(watcher, interval):
+            if (code_path / "shapes.f90").exists():
+                raise KeyboardInterrupt
+
+            (code_path / "shapes.f90").write_text("MODULE shapes\nREAL :: scale\nEND MODULE shapes\n")
+            return watcher.poll()
+
+        with patch.object(DirectoryWatcher, "wait_for_changes", autospec=True, side_effect=change_files):
+            result = runner.invoke(cli, ["--code-path", code_path, "watch", "get-summary", "--top-level-blocks"])
+
+        assert result.exit_code == 0
+        assert f"Watching '{code_path}' for changes." in result.output
+        assert "Files changed: 1 added, 0 modified, 0 removed." in result.output
+        assert "\tFortranModule: 0" in result.output
+        assert "\tFortranModule: 1" in result.output
+        assert "\tREAL: 1" in result.output
+        assert result.output.endswith("Stopped watching.\n")
+
+    def test_watch_needs_directory(self, runner, live_data_path):
+        result = runner.invoke(
+            cli, ["--code-path", f"{live_data_path}/simple_eg/hello_world.f90", "watch", "get-summary"]
+        )
+
+        assert result.exit_code == 2
+        assert "The --code-path option must be a directory to watch it for changes." in result.output
+
+    def test_path_filter_options(self, runner, live_data_path):
+        result = runner.invoke(
+            cli,
+            [
+                "--code-path",
+                live_data_path,
+                "--fortran-only",
+                "--exclude",
+                "simple_eg/",
+                "--exclude",
+                "*_test.f90",
+                "get-summary",
+            ],
+        )
+        unfiltered_result = runner.invoke(cli, ["--code-path", live_data_path, "--fortran-only", "get-summary"])
+
+        assert result.exit_code == 0
+        assert result.output != unfiltered_result.output
+
+        result = runner.invoke(cli, ["--code-path", live_data_path, "--include", "simple_eg/**", "get-raw-contents"])
+
+        assert result.exit_code == 0
+        assert all(line.startswith("> /simple_eg/") for line in result.output.splitlines() if line.startswith(">"))
+
+    def test_changed_files_only(self, runner, tmp_path):
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+        (tmp_path / "main.f90").write_text("PROGRAM main\nEND PROGRAM main\n")
+        (tmp_path / "shapes.f90").write_text("MODULE shapes\nEND MODULE shapes\n")
+        subprocess.run(["git", "add", "."], cwd=tmp_path, check=True)
+        subprocess.run(
+            ["git", "-c", "user.name=Tester", "-c", "user.email=tester@example.com", "commit", "-qm", "First commit"],
+            cwd=tmp_path,
+            check=True,
+        )
+        (tmp_path / "shapes.f90").write_text("MODULE shapes\nREAL :: scale\nEND MODULE shapes\n")
+
+        result = runner.invoke(cli, ["--code-path", tmp_path, "--since", "HEAD", "list-all-variables"])
+
+        assert result.exit_code == 0
+        assert "# of files: 1" in result.output
+        assert "REAL 'scale' declared on line 2;" in result.output
+        assert "/main.f90" not in result.output
+
+        result = runner.invoke(cli, ["--code-path", tmp_path, "--rev-range", "HEAD..", "get-summary"])
+        assert result.exit_code == 2
+        assert "'HEAD..' is not a revision range in the form 'A..B'." in result.output
+
+        result = runner.invoke(cli, ["--code-path", tmp_path, "--since", "HEAD~5", "get-summary"])
+        assert result.exit_code == 2
+        assert "The changed files could not be found with git:" in result.output
+
+        result = runner.invoke(cli, ["--code-path", tmp_path, "--since", "HEAD", "--rev-range", "A..B", "get-summary"])
+        assert result.exit_code == 2
+        assert "Only one of --since and --rev-range can be used at a time." in result.output
+
+        result = runner.invoke(
+            cli, ["--code-path", tmp_path, "--since", "HEAD", "--history-db", tmp_path / "history.db", "get-summary"]
+        )
+        assert result.exit_code == 2
+        assert "Scans of only the changed files cannot be recorded in the scan history." in result.output
+
+    def test_diff(self, runner, live_data_path, tmp_path):
+        code_path = tmp_path / "code"
+        shutil.copytree(live_data_path, code_path)
+        history_path = tmp_path / "history.db"
+        base_args = ["--fortran-only", "--code-path", code_path, "--history-db", history_path]
+
+        result = runner.invoke(cli, [*base_args, "get-raw-contents"])
+        assert result.exit_code == 0
+        assert "Scan recorded in the scan history with the ID 1." in result.output
+
+        (code_path / "simple_eg" / "hello_world.f90").unlink()
+        runner.invoke(cli, [*base_args, "get-summary"])
+
+        result = runner.invoke(cli, ["--history-db", history_path, "diff"])
+
+        assert result.exit_code == 0
+        assert "# of unchanged files: 8" in result.output
+        assert "- /simple_eg/hello_world.f90" in result.output
+
+        result = runner.invoke(cli, ["--history-db", history_path, "diff", "1", "5"])
+        assert "There is no scan with the ID 5 in the scan history." in result.output
+
+    def test_diff_needs_history_db(self, runner, tmp_path):
+        result = runner.invoke(cli, ["--history-db", tmp_path / "missing.db", "diff"])
+
+        assert result.exit_code == 2
+        assert "The --history-db option must be the path to an existing scan history." in result.output
+
+    def test_stream(self, configured_runner, tmp_path):
+        result = configured_runner.invoke(cli, ["--stream", "get-summary"])
+
+        assert result.exit_code == 0
+        # The file counts are only known once the files have been read.
+        assert result.output.index("# of comments: 108") < result.output.index("# of FORTRAN files: 9")
+
+        output_path = tmp_path / "lav.json"
+        result = configured_runner.invoke(
+            cli, ["--stream", "--output-format", "json", "--output-path", output_path, "list-all-variables"]
+        )
+        with open(output_path, "r") as f:
+            data = json.load(f)
+
+        assert result.exit_code == 0
+        assert data["fileCount"] == len(data["files"]) == 9
+
+        result = configured_runner.invoke(cli, ["--stream", "--history-db", tmp_path / "history.db", "get-summary"])
+        assert result.exit_code == 2
+        assert "Streamed scans cannot be recorded in the scan history." in result.output
+
+        result = configured_runner.invoke(cli, ["--stream", "watch", "get-summary"])
+        assert result.exit_code == 2
+        assert "A streamed scan cannot be watched for changes." in result.output
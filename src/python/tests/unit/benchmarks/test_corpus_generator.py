@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from benchmarks.corpus_generator import CorpusConfig, FortranFileGenerator, generate_corpus
+from file_data_models.fortran_file import FortranFile
+from parsers.file_parser import FileParser
+
+
+class TestCorpusGenerator:
+    @pytest.fixture
+    def config(self):
+        return CorpusConfig(file_count=4, lines_per_file=120, files_per_directory=3)
+
+    def read_corpus(self, corpus_dir):
+        corpus = {}
+        for dir_path, _, file_names in os.walk(corpus_dir):
+            for file_name in file_names:
+                file_path = os.path.join(dir_path, file_name)
+                with open(file_path) as f:
+                    corpus[os.path.relpath(file_path, corpus_dir)] = f.read()
+
+        return corpus
+
+    def test_generate_corpus(self, tmp_path, config):
+        corpus_stats = generate_corpus(str(tmp_path), config)
+        corpus = self.read_corpus(str(tmp_path))
+
+        assert corpus_stats.file_count == 4
+        assert corpus_stats.line_count == sum(len(contents.splitlines()) for contents in corpus.values())
+        assert sorted(corpus) == [
+            os.path.join("dir_0000", "bench_00000.f90"),
+            os.path.join("dir_0000", "bench_00001.f90"),
+            os.path.join("dir_0000", "bench_00002.f90"),
+            os.path.join("dir_0001", "bench_00003.f90"),
+        ]
+
+        collected_files = FileParser().build_directory_tree(str(tmp_path)).get_all_files()
+        assert all(isinstance(parsed_file, FortranFile) for parsed_file in collected_files)
+
+    def test_generate_corpus_is_deterministic(self, tmp_path, config):
+        generate_corpus(str(tmp_path / "first"), config)
+        generate_corpus(str(tmp_path / "second"), config)
+        assert self.read_corpus(str(tmp_path / "first")) == self.read_corpus(str(tmp_path / "second"))
+
+        # A file's contents don't depend on the number of files generated.
+        generate_corpus(str(tmp_path / "third"), CorpusConfig(file_count=1, lines_per_file=120))
+        third_corpus = self.read_corpus(str(tmp_path / "third"))
+        first_file = os.path.join("dir_0000", "bench_00000.f90")
+        assert third_corpus[first_file] == self.read_corpus(str(tmp_path / "first"))[first_file]
+
+    def test_generated_file_follows_config(self):
+        config = CorpusConfig(
+            lines_per_file=300,
+            nesting_depth=0,
+            variables_per_declaration=5,
+            continuation_rate=0,
+            semicolon_rate=0,
+            comment_density=0,
+        )
+        lines = FortranFileGenerator(config, 7).generate()
+        fortran_file = FortranFile("/bench_00007.f90", lines)
+
+        assert 300 <= len(lines) < 350
+        assert not any(character in line for line in lines for character in "&;!")
+
+        module = fortran_file.components[0]
+        assert module.block_name == "bench_module_7"
+        assert all(type(subprogram).__name__ == "FortranSubroutine" for subprogram in module.subprograms)
+        assert all(subprogram.subprograms == [] for subprogram in module.subprograms)
+        # Every declaration other than the subroutine arguments declares
+        # the configured number of variables.
+        assert len(module.get_variables_not_in_subprograms()) == 10
+
+    def test_generated_file_nesting_depth(self):
+        config = CorpusConfig(lines_per_file=2000, nesting_depth=2)
+        fortran_file = FortranFile("/bench.f90", FortranFileGenerator(config, 0).generate())
+
+        def max_depth(block):
+            return 1 + max((max_depth(subprogram) for subprogram in block.subprograms), default=0)
+
+        # The module and subroutines make up the first two levels.
+        assert max_depth(fortran_file.components[0]) == 4
@@ -0,0 +1,48 @@
+import json
+
+from click.testing import CliRunner
+
+from benchmarks.corpus_generator import CorpusConfig
+from benchmarks.runner import CLI_COMMANDS, main, run_benchmarks
+from serializers import SerializerRegistry
+
+
+class TestRunner:
+    def test_run_benchmarks(self, tmp_path):
+        config = CorpusConfig(file_count=2, lines_per_file=50)
+        results = run_benchmarks(str(tmp_path), config, repeats=1)
+
+        assert results["corpus"]["file_count"] == 2
+        assert results["corpus"]["line_count"] > 0
+
+        benchmark_names = [result["name"] for result in results["results"]]
+        assert "file_parser.build_directory_tree" in benchmark_names
+        assert "fortran_file.parse" in benchmark_names
+        assert all(f"cli.{' '.join(command)}" in benchmark_names for command in CLI_COMMANDS)
+        for output_format in SerializerRegistry.get_all_serializable_formats():
+            assert f"serializer.{output_format}.list_all_variables" in benchmark_names
+
+        for result in results["results"]:
+            assert result["best_seconds"] > 0
+            assert result["lines_per_second"] > 0
+            assert result["files_per_second"] > 0
+            assert result["peak_memory_bytes"] > 0
+
+        memory_result = results["memory"][0]
+        assert memory_result["name"] == "file_parser.build_directory_tree"
+        assert memory_result["bytes_per_line"] == memory_result["retained_bytes"] / results["corpus"]["line_count"]
+        assert memory_result["retained_bytes"] > 0
+
+    def test_runner_cli(self, tmp_path):
+        output_path = tmp_path / "results.json"
+        result = CliRunner().invoke(
+            main,
+            ["--output", str(output_path), "--repeats", "1", "--file-count", "1", "--lines-per-file", "20"],
+        )
+
+        assert result.exit_code == 0
+        with open(output_path) as f:
+            results = json.load(f)
+
+        assert results["corpus"]["lines_per_file"] == 20
+        assert len(results["results"]) > 0
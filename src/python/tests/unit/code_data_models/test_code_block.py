@@ -122,31 +122,31 @@ class TestCodeBlock:
         for name in expected_names:
             assert name in variables_marked_unused
 
-    @pytest.mark.parametrize(
-        "split_string,delimiter,expected_result",
-        [
-            (
-                "*a*string*to*'be*split*with'*quotes*",
-                "*",
-                ["", "a", "string", "to", "'be*split*with'", "quotes", ""],
-            ),
-            (
-                "'::'CHARACTER(LEN=1024) :: char_1=':: Declare :: variables with ::'",
-                "::",
-                ["'::'CHARACTER(LEN=1024) ", " char_1=':: Declare :: variables with ::'"],
-            ),
-            (
-                "test!*!string!*!to!*!split!*!",
-                "!*!",
-                ["test", "string", "to", "split", ""],
-            ),
-        ],
-    )
-    def test_split_outside_quotes(self, split_string, delimiter, expected_result):
-        code_block = random_fortran_program()
-        split_result = code_block._split_outside_quotes(split_string, delimiter)
-
-        assert split_result == expected_result
+    def test_find_variable_declarations_possibly_unused(self):
+        declaration_1 = random_code_statement(content="INTEGER :: count, counter, total, unused")
+        declaration_2 = random_code_statement(content="REAL :: late_var")
+        usage_statement_1 = random_code_statement(content="COUNT = counter_2 + 1 ! unused")
+        usage_statement_2 = random_code_statement(content="Total = total * 2")
+
+        block_with_declarations = random_fortran_module(
+            contents=[
+                declaration_1,
+                usage_statement_1,
+                usage_statement_2,
+                declaration_2,
+            ]
+        )
+        variables_marked_unused = [
+            variable.name for variable in block_with_declarations.variables if variable.possibly_unused
+        ]
+
+        # Only whole names count as a use, regardless of case, and a
+        # variable is never used by the statement that declares it.
+        assert "count" not in variables_marked_unused
+        assert "total" not in variables_marked_unused
+        assert "counter" in variables_marked_unused
+        assert "unused" not in variables_marked_unused
+        assert "late_var" in variables_marked_unused
 
     def test_get_variables_not_in_subprograms(self):
         fake_file_path = "fake/dir/file.f90"
@@ -274,9 +274,27 @@ class TestCodeBlock:
         assert sum(isinstance(item, FortranFunction) for item in subprograms) == 1
         assert sum(isinstance(item, FortranIfBlock) for item in subprograms) == 1
         assert sum(isinstance(item, FortranType) for item in subprograms) == 1
+        # The list is built once, and then reused.
+        assert test_program.get_all_subprograms() is subprograms
 
     def test_get_all_subprograms_type_error(self):
         unsupported_code_block = random_fortran_type()
 
         with pytest.raises(TypeError):
             unsupported_code_block.get_all_subprograms()
+
+    def test_variables_are_loaded_lazily(self):
+        test_variable = random_variable()
+        loaded_blocks = []
+
+        def load_variables():
+            loaded_blocks.append(test_program)
+            return [test_variable]
+
+        test_program = random_fortran_program(subprograms=[], variables=load_variables)
+        assert loaded_blocks == []
+
+        assert test_program.variables == [test_variable]
+        assert test_program.variables == [test_variable]
+        assert test_program.get_variables_not_in_subprograms() == [test_variable]
+        assert loaded_blocks == [test_program]
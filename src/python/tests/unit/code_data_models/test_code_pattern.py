@@ -2,7 +2,7 @@ import re
 
 import pytest
 
-from code_data_models.code_pattern import CodePatternRegex
+from code_data_models.code_pattern import CodePattern, CodePatternRegex, match_code_patterns
 
 
 class TestCodePatternRegex:
@@ -311,3 +311,80 @@ class TestCodePatternRegex:
     )
     def test_do_loop_end(self, string, expect_match):
         self.assert_regex_result(CodePatternRegex.DO_LOOP_END, string, expect_match)
+
+
+class TestMatchCodePatterns:
+    ALL_BLOCK_PATTERNS = [
+        CodePattern.DO_LOOP,
+        CodePattern.DO_LOOP_END,
+        CodePattern.FUNCTION,
+        CodePattern.FUNCTION_END,
+        CodePattern.IF_BLOCK,
+        CodePattern.IF_BLOCK_END,
+        CodePattern.INTERFACE,
+        CodePattern.INTERFACE_END,
+        CodePattern.MODULE,
+        CodePattern.MODULE_END,
+        CodePattern.PROGRAM,
+        CodePattern.PROGRAM_END,
+        CodePattern.SUBROUTINE,
+        CodePattern.SUBROUTINE_END,
+        CodePattern.TYPE,
+        CodePattern.TYPE_END,
+    ]
+
+    @pytest.mark.parametrize(
+        "statement",
+        [
+            "x = 1",
+            "",
+            "! just a comment",
+            "MODULE test_module ! comment",
+            "module procedure swap_int",
+            "END",
+            "end ! comment",
+            "endmodule test_module",
+            "END PROGRAM test_program",
+            "end function test_function ()",
+            "endif",
+            "END IF ! comment",
+            "end interface gesvd",
+            "ENDTYPE",
+            "end subroutine",
+            "end select",
+            "endpoint = 3",
+            " 30   END DO",
+            " 100  IF(NP.LT.NR)THEN",
+            " 310  DO I=IA, IMAX",
+            "10 FUNCTION label_function()",
+            "DO",
+            "do while (.true.)",
+            "while (condition) do",
+            "double precision :: d",
+            "if_count = if_count + 1",
+            "IF (condition) THEN",
+            "    abstract interface",
+            "INTERFACE",
+            "PROGRAM test_program",
+            "RECURSIVE SUBROUTINE test_subroutine(arg_1)",
+            "recursive function fact(n) result(r)",
+            "real(wp) function evaluate_integrals_singular(this,label,coeff,dummy_orb)",
+            "(x) function odd(y)",
+            "pure function pure_one(x)",
+            "function_result = function_call(x)",
+            "type, abstract :: BaseHamiltonian",
+            "type(test_type) :: type_object",
+            "\u017fubroutine long_s",
+            "END \u212aYPE",
+        ],
+    )
+    def test_match_code_patterns(self, statement):
+        # The keyword dispatch should never change which patterns a
+        # statement matches, or the order they are returned in.
+        expected_result = [
+            pattern
+            for pattern in self.ALL_BLOCK_PATTERNS
+            if re.match(getattr(CodePatternRegex, pattern), statement, re.IGNORECASE)
+        ]
+
+        assert match_code_patterns(statement) == expected_result
@@ -27,6 +27,25 @@ class TestCodeStatement:
 
         assert hello_world_line.matched_patterns == [CodePattern.PROGRAM]
 
+    def test_matched_patterns_order(self, hello_world_line):
+        # The patterns are read back in the order they are declared in
+        # CodePattern, however they were added.
+        hello_world_line.add_pattern(CodePattern.PROGRAM_END)
+        hello_world_line.add_pattern(CodePattern.MODULE_END)
+        hello_world_line.add_pattern(CodePattern.PROGRAM_END)
+
+        assert hello_world_line.matched_patterns == [CodePattern.MODULE_END, CodePattern.PROGRAM_END]
+        assert not hasattr(hello_world_line, "__dict__")
+
+    def test_first_matched_pattern(self, hello_world_line):
+        assert hello_world_line.first_matched_pattern() is None
+
+        hello_world_line.add_pattern(CodePattern.TYPE_END)
+        hello_world_line.add_pattern(CodePattern.DO_LOOP_END)
+
+        assert hello_world_line.first_matched_pattern() == CodePattern.DO_LOOP_END
+        assert hello_world_line.first_matched_pattern() == hello_world_line.matched_patterns[0]
+
     def test_has_matched_patterns(self, hello_world_line):
         assert hello_world_line.has_matched_patterns() is False
         hello_world_line.add_pattern(CodePattern.PROGRAM)
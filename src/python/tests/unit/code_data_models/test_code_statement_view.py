@@ -0,0 +1,68 @@
+import pytest
+
+from code_data_models.code_statement import CodeStatement
+from code_data_models.code_statement_view import CodeStatementView
+from file_data_models.fortran_file import FortranFile
+
+
+class TestCodeStatementView:
+    @pytest.fixture
+    def statements(self):
+        return [CodeStatement(line_number, f"x = {line_number}") for line_number in range(1, 11)]
+
+    @pytest.fixture
+    def statement_view(self, statements):
+        return CodeStatementView(statements, 2, 6)
+
+    def test_init_statement_view(self, statements, statement_view):
+        assert len(statement_view) == 4
+        assert len(CodeStatementView(statements)) == 10
+        assert len(CodeStatementView(statements, 4, 4)) == 0
+
+    @pytest.mark.parametrize("start,stop", [(-1, 5), (5, 4), (0, 11)])
+    def test_init_statement_view_bad_range(self, statements, start, stop):
+        with pytest.raises(ValueError):
+            CodeStatementView(statements, start, stop)
+
+    def test_statement_view_behaves_like_list(self, statements, statement_view):
+        assert statement_view == statements[2:6]
+        assert list(statement_view) == statements[2:6]
+        assert statement_view[0] is statements[2]
+        assert statement_view[-1] is statements[5]
+        assert statements[3] in statement_view
+        assert statements[6] not in statement_view
+        assert statement_view.index(statements[4]) == 2
+        assert list(reversed(statement_view)) == statements[5:1:-1]
+        assert statement_view != "not statements"
+
+        with pytest.raises(TypeError):
+            hash(statement_view)
+
+        with pytest.raises(IndexError):
+            statement_view[4]
+
+        with pytest.raises(IndexError):
+            statement_view[-5]
+
+    @pytest.mark.parametrize(
+        "view_slice", [slice(1, 3), slice(None, -1), slice(3, 1), slice(10, 20), slice(None, None, 2)]
+    )
+    def test_slice_statement_view(self, statements, statement_view, view_slice):
+        assert statement_view[view_slice] == statements[2:6][view_slice]
+
+    def test_statement_view_repr(self, statement_view):
+        assert repr(statement_view) == "CodeStatementView(start=2, stop=6)"
+
+    def test_fortran_file_blocks_use_views(self):
+        fortran_file = FortranFile(
+            "/loop.f90",
+            ["PROGRAM loop", "INTEGER :: i", "DO i = 1, 10", "PRINT *, i", "END DO", "END PROGRAM loop"],
+        )
+
+        program = fortran_file.components[0]
+        do_loop = program.subprograms[0]
+
+        assert isinstance(do_loop.contents, CodeStatementView)
+        assert do_loop.contents.statements is fortran_file.contents
+        assert do_loop.contents == fortran_file.get_snippet(3, 5)
+        assert (do_loop.start_line_number, do_loop.end_line_number) == (3, 5)
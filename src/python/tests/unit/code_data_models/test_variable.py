@@ -40,3 +40,24 @@ class TestVariable:
         # And just a little extra to test that NotImplemented does its
         # job...
         assert not var_1 == 3
+
+    def test_variable_hash(self):
+        var_1 = random_variable(possibly_unused=True)
+        var_2 = random_variable(
+            data_type=var_1.data_type,
+            attributes=list(var_1.attributes),
+            name=var_1.name,
+            parent_file_path=var_1.parent_file_path,
+            line_declared=var_1.line_declared,
+            is_array=var_1.is_array,
+            possibly_unused=False,
+        )
+        var_3 = random_variable(name=var_1.name + "_other")
+
+        # Equal variables must hash the same so they can be found in
+        # sets, regardless of their possibly_unused values.
+        assert var_1.identity_key == var_2.identity_key
+        assert hash(var_1) == hash(var_2)
+        assert var_2 in {var_1}
+        assert var_3 not in {var_1}
+        assert len({var_1, var_2, var_3}) == 2
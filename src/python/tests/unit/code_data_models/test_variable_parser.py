@@ -0,0 +1,100 @@
+import pytest
+
+from code_data_models.code_statement import CodeStatement
+from code_data_models.variable_parser import VariableParser
+from file_data_models.fortran_file import FortranFile
+
+
+class TestVariableParser:
+    @pytest.fixture
+    def nested_statements(self):
+        return [
+            CodeStatement(1, "PROGRAM outer"),
+            CodeStatement(2, "INTEGER :: a, b = 2"),
+            CodeStatement(3, "CONTAINS"),
+            CodeStatement(4, "SUBROUTINE inner()"),
+            CodeStatement(5, "REAL, DIMENSION(3) :: c"),
+            CodeStatement(6, "INTEGER :: d"),
+            CodeStatement(7, "c = 1.0"),
+            CodeStatement(8, "END SUBROUTINE inner"),
+            CodeStatement(9, "d = a"),
+            CodeStatement(10, "END PROGRAM outer"),
+        ]
+
+    def test_find_declarations(self, nested_statements):
+        variable_parser = VariableParser(nested_statements, "/outer.f90")
+        declarations = variable_parser.find_declarations()
+
+        assert [index for index, _ in declarations] == [1, 4, 5]
+        assert [[var.name for var in variables] for _, variables in declarations] == [["a", "b"], ["c"], ["d"]]
+
+        c = declarations[1][1][0]
+        assert c.data_type == "REAL"
+        assert c.attributes == ["DIMENSION(3)"]
+        assert c.is_array
+        assert c.line_declared == 5
+
+        # Declarations are only parsed once.
+        assert variable_parser.find_declarations() is declarations
+
+    def test_claim_variables(self, nested_statements):
+        variable_parser = VariableParser(nested_statements, "/outer.f90")
+
+        inner_variables = variable_parser.claim_variables(3, 7)
+        assert [var.name for var in inner_variables] == ["c", "d"]
+        # 'd' is used after the subroutine ends, but not inside of it.
+        assert [var.possibly_unused for var in inner_variables] == [False, True]
+
+        outer_variables = variable_parser.claim_variables(0, 9)
+        assert [var.name for var in outer_variables] == ["a", "b", "c", "d"]
+        assert [var.possibly_unused for var in outer_variables] == [False, True, False, True]
+        # The outer block shares the inner block's variables.
+        assert outer_variables[2] is inner_variables[0]
+        assert outer_variables[3] is inner_variables[1]
+
+    @pytest.mark.parametrize(
+        "variable_name,start_index,end_index,expected_result",
+        [
+            ("a", 2, 9, True),
+            ("A", 2, 9, True),
+            ("a", 2, 7, False),
+            ("c", 6, 6, True),
+            ("c", 7, 9, False),
+            ("ab", 0, 9, False),
+            ("a", 5, 4, False),
+        ],
+    )
+    def test_is_used(self, nested_statements, variable_name, start_index, end_index, expected_result):
+        variable_parser = VariableParser(nested_statements, "/outer.f90")
+        assert variable_parser.is_used(variable_name, start_index, end_index) == expected_result
+
+    def test_is_used_non_ascii(self):
+        statements = [CodeStatement(1, "INTEGER :: k"), CodeStatement(2, "PRINT *, 'é', K")]
+        assert VariableParser(statements, "/k.f90").is_used("k", 1, 1)
+
+    def test_fortran_file_variables(self):
+        fortran_file = FortranFile(
+            "/outer.f90",
+            [
+                "PROGRAM outer",
+                "INTEGER :: a",
+                "CONTAINS",
+                "SUBROUTINE inner()",
+                "INTEGER :: b",
+                "END SUBROUTINE inner",
+                "b = a",
+                "END PROGRAM outer",
+            ],
+        )
+
+        program = fortran_file.components[0]
+        subroutine = program.subprograms[0]
+
+        assert [var.name for var in program.variables] == ["a", "b"]
+        assert program.variables[1] is subroutine.variables[0]
+        assert subroutine.variables[0].possibly_unused
+        assert program.get_variables_not_in_subprograms() == [program.variables[0]]
+
+    def test_variable_parser_repr(self, nested_statements):
+        expected_repr = "VariableParser(parent_file_path='/outer.f90', statements=10)"
+        assert repr(VariableParser(nested_statements, "/outer.f90")) == expected_repr
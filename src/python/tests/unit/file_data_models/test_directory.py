@@ -76,6 +76,29 @@ class TestDirectory:
         result = populated_dir.get_item("nonsense_key")
         assert result is None
 
+    def test_remove_item(self, populated_dir):
+        assert isinstance(populated_dir.remove_item("test_subdir"), Directory)
+        assert populated_dir.remove_item("test_file").file_name == "test_file"
+
+        assert populated_dir.get_item("test_subdir") is None
+        assert list(populated_dir.files) == ["test_file_2"]
+
+        with pytest.raises(KeyError):
+            populated_dir.remove_item("test_file")
+
+    def test_replace_file(self, populated_dir):
+        assert populated_dir.get_by_path("test_file").file_name == "test_file"
+        old_file = populated_dir.get_item("test_file")
+        new_file = DigitalFile("test_file")
+
+        assert populated_dir.replace_file(new_file) is old_file
+        assert list(populated_dir.files) == ["test_file", "test_file_2"]
+        assert populated_dir.get_item("test_file") is new_file
+        assert populated_dir.get_by_path("test_file") is new_file
+
+        with pytest.raises(KeyError):
+            populated_dir.replace_file(DigitalFile("missing_file"))
+
     def test_directory_repr(self, empty_dir, populated_dir):
         expected_repr = "Directory(name='empty_dir_fixture', files=0, subdirectories=0)"
         assert repr(empty_dir) == expected_repr
@@ -101,3 +124,41 @@ class TestDirectory:
 
         for name in expected_file_names:
             assert name in retrieved_file_names
+
+    def test_iter_files(self, empty_dir):
+        sub_dir = Directory("test_subdir", [Directory("nested_dir", [], [FortranFile("nested_file")])])
+        sub_dir.add_file(DigitalFile("sub_file"))
+        empty_dir.add_file(FortranFile("test_file1"))
+        empty_dir.add_subdirectory(sub_dir)
+        empty_dir.add_file(DigitalFile("test_file2"))
+
+        file_names = [file_obj.file_name for file_obj in empty_dir.iter_files()]
+        assert file_names == ["test_file1", "test_file2", "sub_file", "nested_file"]
+        assert file_names == [file_obj.file_name for file_obj in empty_dir.get_all_files()]
+
+        fortran_file_names = [file_obj.file_name for file_obj in empty_dir.iter_fortran_files()]
+        assert fortran_file_names == ["test_file1", "nested_file"]
+
+    def test_get_by_path(self, empty_dir):
+        sub_dir = Directory("test_subdir", [Directory("nested_dir", [], [FortranFile("nested_file")])])
+        empty_dir.add_subdirectory(sub_dir)
+
+        assert empty_dir.get_by_path("test_subdir") is sub_dir
+        assert empty_dir.get_by_path("/test_subdir/nested_dir/nested_file").file_name == "nested_file"
+        assert empty_dir.get_by_path("test_subdir/missing_file") is None
+        assert sub_dir.get_by_path("nested_dir").parent is sub_dir
+
+        # The indexes are kept up to date as the directories change.
+        nested_dir = sub_dir.get_item("nested_dir")
+        nested_dir.add_file(DigitalFile("new_file"))
+        nested_dir.add_subdirectory(Directory("new_dir", [], [DigitalFile("deep_file")]))
+
+        assert empty_dir.get_by_path("test_subdir/nested_dir/new_file").file_name == "new_file"
+        assert sub_dir.get_by_path("nested_dir/new_dir/deep_file").file_name == "deep_file"
+
+        sub_dir.remove_item("nested_dir")
+
+        assert nested_dir.parent is None
+        assert empty_dir.get_by_path("test_subdir/nested_dir") is None
+        assert empty_dir.get_by_path("test_subdir/nested_dir/new_dir/deep_file") is None
+        assert sub_dir.get_by_path("nested_dir/new_file") is None
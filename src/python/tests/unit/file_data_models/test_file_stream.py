@@ -0,0 +1,48 @@
+import pytest
+
+from file_data_models.digital_file import DigitalFile
+from file_data_models.file_stream import FileStream
+from file_data_models.fortran_file import FortranFile
+
+
+class TestFileStream:
+    @pytest.fixture
+    def files(self):
+        failed_file = DigitalFile("/broken.f90", failed_fortran_parse=True)
+
+        return [
+            FortranFile("/shapes.f90", ["PROGRAM shapes", "END PROGRAM shapes"]),
+            DigitalFile("/notes.txt"),
+            failed_file,
+        ]
+
+    def test_files_are_counted_as_read(self, files):
+        stream = FileStream(iter(files))
+
+        assert not stream.is_read
+        assert stream.file_count == 0
+
+        files_read = iter(stream)
+        assert next(files_read) is files[0]
+        assert stream.file_count == 1
+        assert stream.fortran_file_count == 1
+
+        assert list(files_read) == files[1:]
+        assert stream.is_read
+        assert stream.file_count == 3
+        assert stream.fortran_file_count == 2
+        assert stream.failed_parse_count == 1
+
+    def test_stream_can_only_be_read_once(self, files):
+        stream = FileStream(files)
+        list(stream)
+
+        with pytest.raises(RuntimeError):
+            list(stream)
+
+    def test_file_stream_repr(self, files):
+        stream = FileStream(files)
+        assert repr(stream) == "FileStream(file_count=0, is_read=False)"
+
+        list(stream)
+        assert repr(stream) == "FileStream(file_count=3, is_read=True)"
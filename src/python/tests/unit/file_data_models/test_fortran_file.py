@@ -1,9 +1,14 @@
+import pickle
+from unittest.mock import patch
+
 import pytest
 
 from code_data_models.code_pattern import CodePattern
 from code_data_models.code_statement import CodeStatement
 from code_data_models.fortran_program import FortranProgram
+from code_data_models.variable_parser import VariableParser
 from file_data_models.fortran_file import FortranFile
+from parsers.parse_level import ParseLevel
 
 
 class TestFortranFile:
@@ -121,3 +126,118 @@ class TestFortranFile:
         retrieved_end_line = test_f90_file.contents[-1]
         expected_end_line = "END PROGRAM test_program ! This is a comment; with a semicolon"
         assert retrieved_end_line.content == expected_end_line
+
+    def test_join_continued_lines(self, empty_fortran_file):
+        contents = [
+            "x = 1 + &",
+            "    2 + &",
+            "  & 3 ! comment",
+            "call foo(a, &",
+            "         b)",
+            "  & , c)",
+            "y = 4",
+        ]
+
+        joined_lines = [
+            (line_number, line.text) for line_number, line in empty_fortran_file._join_continued_lines(contents)
+        ]
+        assert joined_lines == [
+            (3, "x = 1 + 2 + 3 ! comment"),
+            (5, "call foo(a, b) , c)"),
+            (7, "y = 4"),
+        ]
+
+    def test_join_continued_lines_is_lazy(self, empty_fortran_file):
+        lines_read = []
+
+        def read_lines():
+            for line in ["a = 1", "b = 2 + &", "3", "c = 4"]:
+                lines_read.append(line)
+                yield line
+
+        joined_lines = empty_fortran_file._join_continued_lines(read_lines())
+
+        # A line is only passed on once the line after it has been read,
+        # in case that line continues it.
+        assert next(joined_lines)[1].text == "a = 1"
+        assert lines_read == ["a = 1", "b = 2 + &", "3"]
+
+        assert next(joined_lines)[1].text == "b = 2 + 3"
+        assert [line.text for _, line in joined_lines] == ["c = 4"]
+
+    @pytest.mark.parametrize("contents", [["& a = 1"], ["a = 1 + &"]])
+    def test_join_continued_lines_unfinished(self, empty_fortran_file, contents):
+        with pytest.raises(ValueError):
+            list(empty_fortran_file._join_continued_lines(contents))
+
+    def test_parse_levels(self, fortran_with_semicolons):
+        fortran_with_semicolons.append("INTEGER :: x = &")
+        fortran_with_semicolons.append("  1\n")
+
+        raw_file = FortranFile("raw_file", fortran_with_semicolons, ParseLevel.RAW_LINES)
+        assert raw_file.parse_level == ParseLevel.RAW_LINES
+        assert [line.content for line in raw_file.contents] == [
+            "PROGRAM test_program; Print *, 'Hello World'; END PROGRAM test_program",
+            "INTEGER :: x = &",
+            "  1",
+        ]
+        assert raw_file.components == []
+
+        statements_file = FortranFile("statements_file", fortran_with_semicolons, ParseLevel.STATEMENTS)
+        assert len(statements_file.contents) == 4
+        assert statements_file.contents[-1].content == "INTEGER :: x = 1"
+        assert statements_file.components == []
+
+        blocks_file = FortranFile("blocks_file", fortran_with_semicolons, ParseLevel.BLOCKS)
+        assert len(blocks_file.components) == 1
+        assert blocks_file.components[0].variables == []
+
+        variables_file = FortranFile("variables_file", fortran_with_semicolons)
+        assert variables_file.parse_level == ParseLevel.VARIABLES
+        assert len(variables_file.components) == 1
+
+    def test_variables_parsed_when_first_used(self):
+        code = [
+            "MODULE shapes",
+            "REAL :: scale",
+            "CONTAINS",
+            "SUBROUTINE grow(n)",
+            "INTEGER :: n, unused",
+            "n = n * scale",
+            "END SUBROUTINE grow",
+            "END MODULE shapes",
+        ]
+
+        claim_variables = VariableParser.claim_variables
+        with patch.object(VariableParser, "claim_variables", autospec=True, side_effect=claim_variables) as claim:
+            test_f90_file = FortranFile("shapes_file", code)
+            module = test_f90_file.components[0]
+            assert module.block_name == "shapes"
+            assert module.subprograms[0].is_recursive is False
+            assert claim.call_count == 0
+
+            # The module's variables can only be claimed after the
+            # subroutine's, so both are claimed together.
+            assert [variable.name for variable in module.variables] == ["scale", "n", "unused"]
+            assert claim.call_count == 2
+
+        subroutine = module.subprograms[0]
+        assert [variable.possibly_unused for variable in subroutine.variables] == [False, True]
+        assert module.get_variables_not_in_subprograms() == [module.variables[0]]
+
+        # Pickling a file loads the variables of any block yet to load
+        # them, so a pickled file gives the same results.
+        unpickled_file = pickle.loads(pickle.dumps(FortranFile("shapes_file", code)))
+        unpickled_module = unpickled_file.components[0]
+        assert unpickled_module.variables == module.variables
+        assert [variable.possibly_unused for variable in unpickled_module.variables] == [False, False, True]
+
+    def test_parse_levels_unresolved_blocks(self):
+        # A file with blocks that can't be resolved can still be parsed
+        # as far as its statements.
+        broken_code = ["PROGRAM broken", "DO i = 1, 3", "END PROGRAM broken"]
+        statements_file = FortranFile("broken_file", broken_code, ParseLevel.STATEMENTS)
+        assert len(statements_file.contents) == 3
+
+        with pytest.raises(AssertionError):
+            FortranFile("broken_file", broken_code, ParseLevel.BLOCKS)
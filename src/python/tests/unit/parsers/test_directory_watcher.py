@@ -0,0 +1,118 @@
+import os
+
+import pytest
+
+from file_data_models.fortran_file import FortranFile
+from parsers.directory_watcher import DirectoryWatcher
+from parsers.file_parser import FileParser
+from parsers.path_filter import PathFilter
+
+
+class TestDirectoryWatcher:
+    @pytest.fixture
+    def code_path(self, tmp_path):
+        code_path = tmp_path / "code"
+        (code_path / "shapes").mkdir(parents=True)
+        (code_path / "main.f90").write_text("PROGRAM main\nINTEGER :: i\nEND PROGRAM main\n")
+        (code_path / "shapes" / "circle.f90").write_text("MODULE circle\nREAL :: radius\nEND MODULE circle\n")
+        (code_path / "notes.txt").write_text("Some notes\n")
+        return code_path
+
+    @pytest.fixture(params=[False, True], ids=["stat", "inotify"])
+    def watcher(self, request, code_path):
+        parser = FileParser()
+        directory_tree = parser.build_directory_tree(code_path)
+        with DirectoryWatcher(parser, directory_tree, code_path, use_inotify=request.param) as watcher:
+            yield watcher
+
+    def get_file_paths(self, watcher):
+        return sorted(file_obj.path_from_root for file_obj in watcher.directory_tree.get_all_files())
+
+    def test_poll_without_changes(self, watcher):
+        assert not watcher.poll()
+        assert self.get_file_paths(watcher) == ["/main.f90", "/shapes/circle.f90"]
+
+    def test_poll_added_modified_and_removed_files(self, watcher, code_path):
+        (code_path / "shapes" / "square.f90").write_text("MODULE square\nEND MODULE square\n")
+        (code_path / "main.f90").write_text("PROGRAM main\nINTEGER :: i, j\nEND PROGRAM main\n")
+        (code_path / "shapes" / "circle.f90").unlink()
+        (code_path / "notes.txt").write_text("Some more notes\n")
+
+        changes = watcher.wait_for_changes(0.01)
+
+        assert [file_obj.path_from_root for file_obj in changes.added_files] == ["/shapes/square.f90"]
+        assert [file_obj.path_from_root for file_obj in changes.removed_files] == ["/shapes/circle.f90"]
+        ((old_file, new_file),) = changes.modified_files
+        assert isinstance(new_file, FortranFile)
+        assert len(old_file.components[0].variables) == 1
+        assert len(new_file.components[0].variables) == 2
+        assert changes.old_files == [changes.removed_files[0], old_file]
+        assert changes.new_files == [changes.added_files[0], new_file]
+
+        assert self.get_file_paths(watcher) == ["/main.f90", "/shapes/square.f90"]
+        assert not watcher.poll()
+
+    def test_poll_keeps_file_order(self, watcher, code_path):
+        for file_name in ("a.f90", "b.f90", "c.f90"):
+            (code_path / file_name).write_text(f"MODULE {file_name[0]}\nEND MODULE {file_name[0]}\n")
+        watcher.wait_for_changes(0.01)
+        file_order = list(watcher.directory_tree.files)
+
+        (code_path / file_order[0]).write_text("MODULE edited\nEND MODULE edited\n")
+        watcher.wait_for_changes(0.01)
+
+        # A modified file should stay in the same place as before.
+        assert list(watcher.directory_tree.files) == file_order
+        assert watcher.directory_tree.get_by_path(file_order[0]).components[0].block_name == "edited"
+
+    def test_poll_added_and_removed_directories(self, watcher, code_path):
+        (code_path / "solvers" / "linear").mkdir(parents=True)
+        (code_path / "solvers" / "linear" / "jacobi.f90").write_text("MODULE jacobi\nEND MODULE jacobi\n")
+
+        changes = watcher.wait_for_changes(0.01)
+
+        assert [file_obj.path_from_root for file_obj in changes.added_files] == ["/solvers/linear/jacobi.f90"]
+        assert "linear" in watcher.directory_tree.get_item("solvers").subdirectories
+
+        (code_path / "solvers" / "linear" / "jacobi.f90").unlink()
+        os.removedirs(code_path / "solvers" / "linear")
+        changes = watcher.wait_for_changes(0.01)
+
+        assert [file_obj.path_from_root for file_obj in changes.removed_files] == ["/solvers/linear/jacobi.f90"]
+        assert watcher.directory_tree.get_item("solvers") is None
+        assert self.get_file_paths(watcher) == ["/main.f90", "/shapes/circle.f90"]
+
+    def test_poll_given_directories(self, code_path):
+        parser = FileParser()
+        directory_tree = parser.build_directory_tree(code_path)
+        watcher = DirectoryWatcher(parser, directory_tree, code_path, use_inotify=False)
+        (code_path / "shapes" / "circle.f90").unlink()
+
+        assert not watcher.poll([str(code_path)])
+        assert watcher.poll([str(code_path / "shapes")]).removed_files[0].path_from_root == "/shapes/circle.f90"
+
+    def test_all_files_watched(self, code_path):
+        parser = FileParser()
+        directory_tree = parser.build_directory_tree(code_path, fortran_only=False)
+        watcher = DirectoryWatcher(parser, directory_tree, code_path, fortran_only=False, use_inotify=False)
+        (code_path / "notes.txt").write_text("Some more notes\n")
+
+        ((old_file, new_file),) = watcher.poll().modified_files
+        assert new_file.path_from_root == "/notes.txt"
+        assert not isinstance(new_file, FortranFile)
+
+    def test_path_filter_used(self, code_path):
+        parser = FileParser(path_filter=PathFilter(exclude=["build/", "*_test.f90"]))
+        watcher = DirectoryWatcher(parser, parser.build_directory_tree(code_path), code_path, use_inotify=False)
+        (code_path / "build").mkdir()
+        (code_path / "build" / "main.f90").write_text("PROGRAM main\nEND PROGRAM main\n")
+        (code_path / "shapes" / "circle_test.f90").write_text("PROGRAM circle_test\nEND PROGRAM circle_test\n")
+
+        assert not watcher.poll()
+        assert self.get_file_paths(watcher) == ["/main.f90", "/shapes/circle.f90"]
+
+    def test_directory_watcher_repr(self, code_path):
+        parser = FileParser()
+        watcher = DirectoryWatcher(parser, parser.build_directory_tree(code_path), code_path, use_inotify=False)
+
+        assert repr(watcher) == f"DirectoryWatcher(dir_path='{code_path}', uses_inotify=False)"
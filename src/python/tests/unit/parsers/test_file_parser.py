@@ -0,0 +1,66 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from parsers.file_parser import FileParser
+from parsers.path_filter import PathFilter
+
+
+class TestFileParser:
+    @pytest.fixture
+    def code_path(self, tmp_path):
+        for dir_path in ["src/shapes", "build/src", "vendor/lapack", ".git/objects"]:
+            (tmp_path / dir_path).mkdir(parents=True)
+
+        for file_path in ["src/main.f90", "src/shapes/circle.f90", "build/src/main.f90", "vendor/lapack/solve.f90"]:
+            (tmp_path / file_path).write_text("PROGRAM main\nEND PROGRAM main\n")
+
+        (tmp_path / "src" / "notes.txt").write_text("Some notes\n")
+        (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+        (tmp_path / ".gitignore").write_text("build/\n")
+        os.symlink(tmp_path / "src", tmp_path / "src_link")
+        return tmp_path
+
+    def get_file_paths(self, directory_tree):
+        return sorted(file_obj.path_from_root for file_obj in directory_tree.get_all_files())
+
+    def test_build_directory_tree(self, code_path):
+        directory_tree = FileParser().build_directory_tree(code_path, fortran_only=False)
+
+        assert self.get_file_paths(directory_tree) == [
+            "/.git/HEAD",
+            "/.gitignore",
+            "/build/src/main.f90",
+            "/src/main.f90",
+            "/src/notes.txt",
+            "/src/shapes/circle.f90",
+            "/vendor/lapack/solve.f90",
+        ]
+        # Symbolic links to directories are added, but not followed.
+        assert directory_tree.get_item("src_link").files == {}
+
+    def test_build_directory_tree_with_path_filter(self, code_path):
+        parser = FileParser(path_filter=PathFilter(include=["*.f90"], exclude=["vendor/"], use_gitignore=True))
+
+        with patch("os.scandir", wraps=os.scandir) as scandir:
+            directory_tree = parser.build_directory_tree(code_path, fortran_only=False)
+
+        assert self.get_file_paths(directory_tree) == ["/src/main.f90", "/src/shapes/circle.f90"]
+        assert sorted(directory_tree.subdirectories) == ["src", "src_link"]
+        # The excluded directories are never listed.
+        assert scandir.call_count == 3
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_iter_directory_files(self, code_path, workers):
+        parser = FileParser(path_filter=PathFilter(use_gitignore=True))
+
+        file_paths = [file_obj.path_from_root for file_obj in parser.iter_directory_files(code_path, True, workers)]
+        expected_paths = self.get_file_paths(parser.build_directory_tree(code_path, fortran_only=True))
+
+        assert sorted(file_paths) == expected_paths
+        assert "/src/main.f90" in file_paths
+
+    def test_iter_directory_files_bad_path(self, code_path):
+        with pytest.raises(ValueError):
+            next(FileParser().iter_directory_files(code_path / "src" / "main.f90"))
@@ -0,0 +1,92 @@
+import subprocess
+
+import pytest
+
+from file_data_models.digital_file import DigitalFile
+from file_data_models.fortran_file import FortranFile
+from parsers.file_parser import FileParser
+from parsers.git_repository import GitRepository
+
+
+class TestGitRepository:
+    @pytest.fixture
+    def repository_path(self, tmp_path):
+        def commit(message):
+            subprocess.run(["git", "add", "."], cwd=tmp_path, check=True)
+            subprocess.run(
+                ["git", "-c", "user.name=Tester", "-c", "user.email=tester@example.com", "commit", "-qm", message],
+                cwd=tmp_path,
+                check=True,
+            )
+
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+        code_path = tmp_path / "code"
+        (code_path / "shapes").mkdir(parents=True)
+        (code_path / "main.f90").write_text("PROGRAM main\nINTEGER :: i\nEND PROGRAM main\n")
+        (code_path / "shapes" / "circle.f90").write_text("MODULE circle\nEND MODULE circle\n")
+        (code_path / "notes.txt").write_text("Some notes\n")
+        (tmp_path / "outside.f90").write_text("PROGRAM outside\nEND PROGRAM outside\n")
+        commit("First commit")
+
+        (code_path / "shapes" / "circle.f90").write_text("MODULE circle\nREAL :: radius\nEND MODULE circle\n")
+        (code_path / "shapes" / "square.f90").write_text("MODULE square\nEND MODULE square\n")
+        (code_path / "notes.txt").unlink()
+        (tmp_path / "outside.f90").write_text("PROGRAM outside\nINTEGER :: i\nEND PROGRAM outside\n")
+        commit("Second commit")
+
+        (code_path / "main.f90").write_text("PROGRAM main\nINTEGER :: i, j\nEND PROGRAM main\n")
+        return code_path
+
+    def test_git_repository_bad_init(self, tmp_path):
+        with pytest.raises(ValueError):
+            GitRepository(str(tmp_path))
+
+    def test_split_revision_range(self):
+        assert GitRepository.split_revision_range("main..feature") == ("main", "feature")
+        assert GitRepository.split_revision_range("main...HEAD~1") == ("main", "HEAD~1")
+
+        with pytest.raises(ValueError):
+            GitRepository.split_revision_range("main..")
+
+    def test_list_changed_files(self, repository_path):
+        repository = GitRepository(str(repository_path))
+
+        assert repository.list_changed_files("HEAD") == ["main.f90"]
+        assert repository.list_changed_files("HEAD~1..HEAD") == ["shapes/circle.f90", "shapes/square.f90"]
+
+        with pytest.raises(ValueError):
+            repository.list_changed_files("missing-revision")
+
+    def test_read_files(self, repository_path):
+        repository = GitRepository(str(repository_path))
+
+        files = {file_path: contents.read() for file_path, contents in repository.read_files("HEAD~1", ["main.f90"])}
+        assert files == {"main.f90": "PROGRAM main\nINTEGER :: i\nEND PROGRAM main\n"}
+
+        with pytest.raises(ValueError):
+            list(repository.read_files("HEAD~1", ["shapes/square.f90"]))
+
+    def test_collect_changed_files(self, repository_path):
+        changed_files = FileParser().collect_changed_files(repository_path, "HEAD")
+
+        assert [file_obj.path_from_root for file_obj in changed_files] == ["/main.f90"]
+        assert len(changed_files[0].components[0].variables) == 2
+
+    def test_collect_changed_files_in_range(self, repository_path):
+        (repository_path / "shapes" / "circle.f90").unlink()
+        changed_files = FileParser().collect_changed_files(repository_path, "HEAD~1..HEAD", fortran_only=False)
+
+        assert [file_obj.path_from_root for file_obj in changed_files] == ["/shapes/circle.f90", "/shapes/square.f90"]
+        assert all(isinstance(file_obj, FortranFile) for file_obj in changed_files)
+        assert changed_files[0].components[0].variables[0].name == "radius"
+
+        changed_files = FileParser().collect_changed_files(repository_path, "HEAD~1...HEAD~1", fortran_only=False)
+        assert changed_files == []
+
+        (repository_path / "notes.txt").write_text("Some notes\n")
+        subprocess.run(["git", "add", "notes.txt"], cwd=repository_path, check=True)
+        (changed_file,) = FileParser().collect_changed_files(repository_path, "HEAD", fortran_only=False)[1:]
+        assert type(changed_file) is DigitalFile
+
+    def test_git_repository_repr(self, repository_path):
+        assert repr(GitRepository(str(repository_path))) == f"GitRepository(dir_path='{repository_path}')"
@@ -0,0 +1,124 @@
+import os
+import shutil
+
+import pytest
+
+from file_data_models.fortran_file import FortranFile
+from parsers import parse_cache
+from parsers.file_parser import FileParser
+from parsers.parse_cache import FileFingerprint, ParseCache
+from parsers.parse_level import ParseLevel
+from utils.file_hasher import hash_file
+
+
+class TestParseCache:
+    @pytest.fixture
+    def fortran_file_path(self, tmp_path):
+        file_path = tmp_path / "hello_world.f90"
+        file_path.write_text('PROGRAM hello_world\n    PRINT *, "Hello World!"\nEND PROGRAM hello_world\n')
+        return str(file_path)
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return ParseCache(str(tmp_path / "cache"))
+
+    def store_file(self, cache, file_path, path_from_root="/hello_world.f90"):
+        parsed_file = FortranFile(path_from_root, FileParser().parse_file_contents(file_path))
+        file_stat = os.stat(file_path)
+        fingerprint = FileFingerprint(file_stat.st_size, file_stat.st_mtime_ns, hash_file(file_path))
+        cache.store(file_path, path_from_root, fingerprint, parsed_file)
+
+    def test_load_missing_entry(self, cache, fortran_file_path):
+        assert cache.load(fortran_file_path, "/hello_world.f90") is None
+
+    def test_store_and_load(self, cache, fortran_file_path):
+        self.store_file(cache, fortran_file_path)
+
+        cached_file = cache.load(fortran_file_path, "/hello_world.f90")
+        assert isinstance(cached_file, FortranFile)
+        assert cached_file.path_from_root == "/hello_world.f90"
+        assert [line.content for line in cached_file.contents] == [
+            "PROGRAM hello_world",
+            'PRINT *, "Hello World!"',
+            "END PROGRAM hello_world",
+        ]
+        assert len(cached_file.components) == 1
+
+        # The same file under a different root is a different entry.
+        assert cache.load(fortran_file_path, "/other_root/hello_world.f90") is None
+
+    def test_load_changed_file(self, cache, fortran_file_path):
+        self.store_file(cache, fortran_file_path)
+
+        with open(fortran_file_path, "a") as f:
+            f.write("! A new comment\n")
+
+        assert cache.load(fortran_file_path, "/hello_world.f90") is None
+
+    def test_load_touched_file(self, cache, fortran_file_path):
+        self.store_file(cache, fortran_file_path)
+
+        # A new modification time with the same contents should still
+        # be loaded from the cache.
+        file_stat = os.stat(fortran_file_path)
+        os.utime(fortran_file_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 1_000_000_000))
+
+        assert cache.load(fortran_file_path, "/hello_world.f90") is not None
+
+    def test_version_change_clears_cache(self, cache, fortran_file_path, monkeypatch):
+        self.store_file(cache, fortran_file_path)
+
+        monkeypatch.setattr(parse_cache, "PARSE_CACHE_VERSION", parse_cache.PARSE_CACHE_VERSION + 1)
+        new_cache = ParseCache(cache.cache_dir)
+
+        assert new_cache.load(fortran_file_path, "/hello_world.f90") is None
+        assert not any(name.endswith(ParseCache.ENTRY_EXTENSION) for name in os.listdir(cache.cache_dir))
+
+    def test_evict(self, tmp_path, fortran_file_path):
+        small_cache = ParseCache(str(tmp_path / "small_cache"), max_size=0)
+        self.store_file(small_cache, fortran_file_path, "/a.f90")
+        self.store_file(small_cache, fortran_file_path, "/b.f90")
+
+        small_cache.evict()
+
+        assert small_cache.load(fortran_file_path, "/a.f90") is None
+        assert small_cache.load(fortran_file_path, "/b.f90") is None
+
+    def test_file_parser_uses_cache(self, cache, fortran_file_path, monkeypatch):
+        parser = FileParser(cache)
+        parsed_file = parser.parse_file(fortran_file_path)
+        assert isinstance(parsed_file, FortranFile)
+
+        # With the file cached, it shouldn't need to be parsed again.
+        def fail_parse(*args, **kwargs):
+            raise AssertionError("File was parsed again.")
+
+        monkeypatch.setattr(parser, "parse_file_contents", fail_parse)
+        cached_file = parser.parse_file(fortran_file_path)
+
+        assert isinstance(cached_file, FortranFile)
+        assert len(cached_file.contents) == len(parsed_file.contents)
+
+    def test_failed_store_still_parses(self, cache, fortran_file_path, caplog):
+        parser = FileParser(cache)
+        # The cache directory disappearing means the entry can't be
+        # written, but the file should still be parsed.
+        shutil.rmtree(cache.cache_dir)
+
+        parsed_file = parser.parse_file(fortran_file_path)
+
+        assert isinstance(parsed_file, FortranFile)
+        assert len(parsed_file.contents) == 3
+        assert "Could not store" in caplog.text
+
+    def test_parse_levels_use_separate_entries(self, cache, fortran_file_path):
+        parser = FileParser(cache, ParseLevel.STATEMENTS)
+        statements_file = parser.parse_file(fortran_file_path)
+        assert statements_file.components == []
+
+        assert cache.load(fortran_file_path, statements_file.path_from_root) is None
+        cached_file = cache.load(fortran_file_path, statements_file.path_from_root, ParseLevel.STATEMENTS)
+        assert cached_file.parse_level == ParseLevel.STATEMENTS
+
+        full_file = FileParser(cache).parse_file(fortran_file_path)
+        assert len(full_file.components) == 1
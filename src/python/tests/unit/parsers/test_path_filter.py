@@ -0,0 +1,71 @@
+import pytest
+
+from parsers.path_filter import PathFilter
+
+
+class TestPathFilter:
+    @pytest.mark.parametrize(
+        "pattern, path, is_match",
+        [
+            ("*.f90", "main.f90", True),
+            ("*.f90", "src/shapes/circle.f90", True),
+            ("src/*.f90", "src/main.f90", True),
+            ("src/*.f90", "src/shapes/circle.f90", False),
+            ("/main.f90", "src/main.f90", False),
+            ("src/**", "src/shapes/circle.f90", True),
+            ("**/shapes/*.f90", "src/shapes/circle.f90", True),
+            ("circle.f9?", "circle.f90", True),
+            ("[ab]*.f90", "area.f90", True),
+            ("[!ab]*.f90", "area.f90", False),
+        ],
+    )
+    def test_exclude_patterns(self, pattern, path, is_match):
+        assert PathFilter(exclude=[pattern]).includes_file(path) is not is_match
+
+    def test_include_patterns(self):
+        path_filter = PathFilter(include=["src/**", "*.F90"], exclude=["src/vendor/"])
+
+        assert path_filter.includes_file("src/main.f90")
+        assert path_filter.includes_file("tests/circle.F90")
+        assert not path_filter.includes_file("tests/circle.f90")
+        assert path_filter.excludes_directory("src/vendor")
+        assert not path_filter.includes_path("src/vendor/lapack/solve.f90")
+        assert path_filter.includes_path("src/shapes/circle.f90")
+
+    def test_directory_only_patterns(self):
+        path_filter = PathFilter(exclude=["build/"])
+
+        assert path_filter.excludes_directory("src/build")
+        assert path_filter.includes_file("src/build")
+
+    def test_gitignore(self, tmp_path):
+        (tmp_path / ".gitignore").write_text("# Build outputs\n*.mod\nbuild/\n!keep.mod\n\\#notes.txt\n")
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / ".gitignore").write_text("/generated.f90\n!build/\n")
+
+        root_filter = PathFilter(use_gitignore=True).for_directory(str(tmp_path), "")
+        src_filter = root_filter.for_directory(str(tmp_path / "src"), "src")
+
+        assert root_filter.excludes_directory(".git")
+        assert root_filter.excludes_directory("build")
+        assert not root_filter.includes_file("shapes.mod")
+        assert root_filter.includes_file("keep.mod")
+        assert not root_filter.includes_file("#notes.txt")
+        assert root_filter.includes_file("src/generated.f90")
+
+        assert not src_filter.includes_file("src/generated.f90")
+        assert src_filter.includes_file("src/shapes/generated.f90")
+        assert not src_filter.excludes_directory("src/build")
+        assert not src_filter.includes_file("src/shapes.mod")
+
+    def test_gitignore_not_used(self, tmp_path):
+        (tmp_path / ".gitignore").write_text("*.f90\n")
+        path_filter = PathFilter()
+
+        assert path_filter.for_directory(str(tmp_path), "") is path_filter
+        assert not path_filter.excludes_directory(".git")
+
+    def test_path_filter_repr(self):
+        assert repr(PathFilter(["src/**"], ["build/"], True)) == (
+            "PathFilter(include=['src/**'], exclude=['build/'], use_gitignore=True)"
+        )
@@ -0,0 +1,139 @@
+import pytest
+
+from file_data_models.digital_file import DigitalFile
+from file_data_models.file_stream import FileStream
+from file_data_models.fortran_file import FortranFile
+from reports.report_builder import ReportBuilder
+from reports.report_models import SummaryReport
+
+
+class TestReportBuilder:
+    @pytest.fixture
+    def fortran_module(self):
+        return [
+            "MODULE shapes ! Shape helpers",
+            "REAL :: scale",
+            "CONTAINS",
+            "RECURSIVE SUBROUTINE grow(n)",
+            "INTEGER :: n",
+            "INTEGER(KIND=8) :: total",
+            "DO n = 1, 10",
+            "total = total + n ! Add up",
+            "END DO",
+            "END SUBROUTINE grow",
+            "FUNCTION area(r)",
+            "DOUBLE COMPLEX :: r",
+            "area = r * scale",
+            "END FUNCTION area",
+            "END MODULE shapes",
+        ]
+
+    @pytest.fixture
+    def report_builder(self, fortran_module):
+        return ReportBuilder([FortranFile("/shapes.f90", fortran_module), DigitalFile("/notes.txt")])
+
+    def test_build_file_counts(self, report_builder):
+        file_counts = report_builder.build_file_counts()
+
+        assert file_counts.file_count == 2
+        assert file_counts.fortran_file_count == 1
+        assert file_counts.failed_parse_count == 0
+
+    def test_build_summary(self, report_builder):
+        summary = report_builder.build_summary(False, False)
+
+        assert summary.comment_count == 2
+        assert list(summary.block_counts) == SummaryReport.BLOCK_TYPES
+        assert summary.block_counts["FortranModule"] == 1
+        assert summary.block_counts["FortranSubroutine"] == 1
+        assert summary.block_counts["FortranFunction"] == 1
+        assert summary.block_counts["FortranDoLoop"] == 1
+        assert summary.variable_counts["REAL"] == 1
+        assert summary.variable_counts["INTEGER"] == 2
+        # 'DOUBLE COMPLEX' is also counted as a 'COMPLEX' variable.
+        assert summary.variable_counts["DOUBLE COMPLEX"] == 1
+        assert summary.variable_counts["COMPLEX"] == 1
+
+    def test_build_summary_top_level(self, report_builder):
+        summary = report_builder.build_summary(True, False)
+
+        assert sum(summary.block_counts.values()) == 1
+        assert summary.variable_counts["INTEGER"] == 2
+
+        top_level_vars_summary = report_builder.build_summary(True, True)
+
+        assert top_level_vars_summary.variable_counts["REAL"] == 1
+        assert top_level_vars_summary.variable_counts["INTEGER"] == 0
+
+    def test_build_summary_is_reused(self, report_builder):
+        assert report_builder.build_summary(False, False) is report_builder.build_summary(False, False)
+        assert report_builder.build_summary(False, False) is not report_builder.build_summary(True, False)
+
+    def test_update_files(self, report_builder, fortran_module):
+        old_summary = report_builder.build_summary(False, False)
+        old_file = report_builder.collected_files[0]
+        new_file = FortranFile("/shapes.f90", fortran_module[:3] + fortran_module[10:])
+        added_file = FortranFile("/main.f90", ["PROGRAM main", "INTEGER :: i", "END PROGRAM main"])
+
+        report_builder.update_files([new_file, added_file], [old_file], [new_file, added_file])
+        summary = report_builder.build_summary(False, False)
+
+        assert summary is not old_summary
+        assert summary.file_counts.file_count == 2
+        assert summary.comment_count == 1
+        assert summary.block_counts["FortranProgram"] == 1
+        assert summary.block_counts["FortranSubroutine"] == 0
+        assert summary.block_counts["FortranDoLoop"] == 0
+        assert summary.variable_counts["INTEGER"] == 1
+        assert summary == ReportBuilder([new_file, added_file]).build_summary(False, False)
+
+    def test_build_file_listings(self, report_builder):
+        fortran_listing, other_listing = report_builder.build_file_listings(False)
+
+        assert other_listing.components is None
+        assert other_listing.to_dict() == {"filePath": "/notes.txt", "failedFortranParse": False}
+
+        (module,) = fortran_listing.components
+        subroutine, function = module.subprograms
+
+        assert (module.block_type, module.block_name, module.is_recursive) == ("Module", "shapes", None)
+        assert (subroutine.block_type, subroutine.is_recursive) == ("Subroutine", True)
+        assert [var.name for var in module.variables] == ["scale", "n", "total", "r"]
+        assert [var.name for var in function.variables] == ["r"]
+        assert subroutine.subprograms[0].block_name is None
+
+    def test_build_file_listings_no_duplicates(self, report_builder):
+        (fortran_listing, _) = report_builder.build_file_listings(True)
+        (module,) = fortran_listing.components
+
+        assert [var.name for var in module.variables] == ["scale"]
+
+    def test_component_listing_to_dict(self, report_builder):
+        (fortran_listing, _) = report_builder.build_file_listings(True)
+        module_dict = fortran_listing.to_dict()["components"][0]
+
+        assert module_dict["blockType"] == "module"
+        assert module_dict["blockName"] == "shapes"
+        assert "isRecursive" not in module_dict
+        assert module_dict["subprogramCount"] == 2
+        assert module_dict["variableCount"] == 1
+        assert module_dict["variables"][0]["variableName"] == "scale"
+        assert module_dict["subprograms"][0]["isRecursive"] is True
+
+    def test_report_builder_repr(self, report_builder):
+        assert repr(report_builder) == "ReportBuilder(collected_files=2)"
+
+    def test_streaming_report_builder(self, fortran_module):
+        stream = FileStream([FortranFile("/shapes.f90", fortran_module), DigitalFile("/notes.txt")])
+        report_builder = ReportBuilder(stream)
+
+        assert report_builder.is_streaming
+        assert report_builder.build_file_counts().file_count == 0
+
+        # The counts are complete once the summary has read the stream.
+        summary = report_builder.build_summary(False, False)
+
+        assert summary.comment_count == 2
+        assert summary.file_counts.file_count == 2
+        assert summary.file_counts.fortran_file_count == 1
+        assert repr(report_builder) == "ReportBuilder(collected_files=FileStream(file_count=2, is_read=True))"
@@ -0,0 +1,139 @@
+import hashlib
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from file_data_models.digital_file import DigitalFile
+from file_data_models.fortran_file import FortranFile
+from parsers.file_parser import FileParser
+from storage.scan_history import ScanChange, ScanHistory
+
+
+class TestScanHistory:
+    @pytest.fixture
+    def module_lines(self):
+        return [
+            "MODULE shapes",
+            "REAL :: scale",
+            "CONTAINS",
+            "SUBROUTINE grow(n)",
+            "INTEGER :: n",
+            "DO n = 1, 10",
+            "END DO",
+            "END SUBROUTINE grow",
+            "END MODULE shapes",
+        ]
+
+    @pytest.fixture
+    def codebase(self, tmp_path, module_lines):
+        code_path = tmp_path / "code"
+        code_path.mkdir()
+        (code_path / "shapes.f90").write_text("\n".join(module_lines))
+        (code_path / "main.f90").write_text("PROGRAM main\nEND PROGRAM main")
+        (code_path / "README.md").write_text("Not Fortran")
+        return code_path
+
+    @pytest.fixture
+    def history(self, tmp_path):
+        with ScanHistory(str(tmp_path / "history.db")) as history:
+            yield history
+
+    def record(self, history, code_path):
+        parser = FileParser()
+        collected_files = [
+            parser.parse_file(str(file_path), str(code_path)) for file_path in sorted(code_path.iterdir())
+        ]
+
+        return history.record_scan(str(code_path), collected_files)
+
+    def test_take_fingerprints(self, module_lines):
+        blocks, variables = ScanHistory.take_fingerprints(FortranFile("/shapes.f90", module_lines))
+
+        # The DO loop has no name, so it isn't recorded.
+        assert list(blocks) == ["/module:shapes", "/module:shapes/subroutine:grow"]
+        assert list(variables) == ["/module:shapes/scale", "/module:shapes/subroutine:grow/n"]
+        assert ScanHistory.take_fingerprints(DigitalFile("/failed.f90", True)) == ({}, {})
+
+    def test_record_scan(self, history, codebase):
+        scan = self.record(history, codebase)
+
+        assert history.get_scans() == [scan]
+        assert history.get_scan(scan.scan_id) == scan
+
+        file_paths = history.connection.execute("SELECT path FROM scan_files ORDER BY path").fetchall()
+        assert file_paths == [("/main.f90",), ("/shapes.f90",)]
+
+    def test_record_scan_skips_known_files(self, history, codebase):
+        self.record(history, codebase)
+        (codebase / "main.f90").write_text("PROGRAM main\nINTEGER :: count\nEND PROGRAM main")
+
+        with patch.object(ScanHistory, "take_fingerprints", wraps=ScanHistory.take_fingerprints) as mock_fingerprints:
+            self.record(history, codebase)
+
+        # Only the changed file has its code blocks walked.
+        assert [call.args[0].path_from_root for call in mock_fingerprints.call_args_list] == ["/main.f90"]
+
+    def test_record_scan_hashes_parsed_contents(self, history, codebase):
+        main_path = codebase / "main.f90"
+        parsed_file = FileParser().parse_file(str(main_path), str(codebase))
+
+        # The file changing after it was parsed shouldn't have the old
+        # contents recorded against the hash of the new contents.
+        main_path.write_text("PROGRAM main\nINTEGER :: count\nEND PROGRAM main")
+        history.record_scan(str(codebase), [parsed_file])
+
+        recorded_hash = history.connection.execute("SELECT content_hash FROM scan_files").fetchone()[0]
+        assert recorded_hash == hashlib.sha256(b"PROGRAM main\nEND PROGRAM main").hexdigest()
+
+        with pytest.raises(ValueError):
+            history.record_scan(str(codebase), [FortranFile("/main.f90", ["PROGRAM main", "END PROGRAM main"])])
+
+    def test_diff(self, history, codebase):
+        old_scan = self.record(history, codebase)
+
+        shapes_path = codebase / "shapes.f90"
+        shapes_path.write_text(
+            shapes_path.read_text().replace("REAL :: scale", "DOUBLE PRECISION :: scale\nLOGICAL :: done")
+        )
+        (codebase / "main.f90").unlink()
+        (codebase / "extra.f90").write_text("MODULE extra\nEND MODULE extra")
+        new_scan = self.record(history, codebase)
+
+        scan_diff = history.diff(old_scan.scan_id, new_scan.scan_id)
+
+        assert scan_diff.unchanged_file_count == 0
+        assert scan_diff.changes == [
+            ScanChange("added", "file", "/extra.f90", "/extra.f90"),
+            ScanChange("added", "module", "/extra.f90", "extra"),
+            ScanChange("removed", "file", "/main.f90", "/main.f90"),
+            ScanChange("removed", "program", "/main.f90", "main"),
+            ScanChange("changed", "file", "/shapes.f90", "/shapes.f90"),
+            ScanChange("changed", "module", "/shapes.f90", "shapes"),
+            ScanChange("added", "variable", "/shapes.f90", "shapes.done"),
+            ScanChange("changed", "variable", "/shapes.f90", "shapes.scale"),
+        ]
+
+    def test_diff_unchanged_files(self, history, codebase):
+        old_scan = self.record(history, codebase)
+        new_scan = self.record(history, codebase)
+
+        scan_diff = history.diff(old_scan.scan_id, new_scan.scan_id)
+
+        assert scan_diff.unchanged_file_count == 2
+        assert scan_diff.changes == []
+
+    def test_diff_missing_scan(self, history):
+        with pytest.raises(KeyError):
+            history.diff(1, 2)
+
+    def test_scan_history_version_mismatch(self, tmp_path):
+        database_path = str(tmp_path / "history.db")
+        with sqlite3.connect(database_path) as connection:
+            connection.execute("PRAGMA user_version = 999")
+
+        with pytest.raises(ValueError):
+            ScanHistory(database_path)
+
+    def test_scan_history_repr(self, history, tmp_path):
+        assert repr(history) == f"ScanHistory(database_path='{tmp_path / 'history.db'}')"
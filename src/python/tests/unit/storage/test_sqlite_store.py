@@ -0,0 +1,83 @@
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from code_data_models.code_statement import CodeStatement
+from code_data_models.variable import Variable
+from reports.report_models import ComponentListing
+from storage.sqlite_store import SQLITE_SCHEMA_VERSION, SQLiteStore
+
+
+class TestSQLiteStore:
+    @pytest.fixture
+    def database_path(self, tmp_path):
+        return str(tmp_path / "scan.sqlite")
+
+    @pytest.fixture
+    def component(self):
+        variable = Variable("REAL", ["DIMENSION(3)"], "values", "/a.f90", 2, False, True)
+        subroutine = ComponentListing("Subroutine", 4, 6, "inner", False, [], [])
+        return ComponentListing("Module", 1, 8, "outer", None, [variable], [subroutine])
+
+    def test_create_sqlite_store(self, database_path):
+        with open(database_path, "w") as f:
+            f.write("not a database")
+
+        with SQLiteStore.create(database_path) as store:
+            assert store.connection.execute("PRAGMA user_version").fetchone()[0] == SQLITE_SCHEMA_VERSION
+
+    def test_create_sqlite_store_missing_directory(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            SQLiteStore.create(str(tmp_path / "missing" / "scan.sqlite"))
+
+    def test_add_component(self, database_path, component):
+        with SQLiteStore.create(database_path) as store:
+            file_id = store.add_file("/a.f90", True, False)
+            module_id = store.add_component(file_id, component)
+            store.add_statements(file_id, [CodeStatement(1, "MODULE outer"), CodeStatement(1, "x = 1")])
+            store.finish()
+
+            blocks = store.connection.execute("SELECT id, parent_id, block_type, block_name FROM blocks").fetchall()
+            variables = store.connection.execute("SELECT block_id, name, attributes, is_array FROM variables")
+
+            assert blocks == [(module_id, None, "module", "outer"), (module_id + 1, module_id, "subroutine", "inner")]
+            assert variables.fetchall() == [(module_id, "values", '["DIMENSION(3)"]', 1)]
+            assert store.connection.execute("SELECT COUNT(*) FROM statements").fetchone()[0] == 2
+
+    def test_rows_written_in_batches(self, database_path):
+        with patch.object(SQLiteStore, "BATCH_SIZE", 2), SQLiteStore.create(database_path) as store:
+            for file_index in range(3):
+                store.add_file(f"/{file_index}.f90", True, False)
+                store.end_file()
+
+                written_count = store.connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+                assert written_count == (2 if file_index >= 1 else 0)
+
+        with SQLiteStore.open_read_only(database_path) as store:
+            columns, rows = store.query("SELECT COUNT(*) AS total FROM files")
+            assert (columns, list(rows)) == (["total"], [(3,)])
+
+    def test_open_read_only(self, database_path):
+        SQLiteStore.create(database_path).close()
+
+        with SQLiteStore.open_read_only(database_path) as store:
+            with pytest.raises(sqlite3.OperationalError):
+                store.query("INSERT INTO files VALUES (1, '/a.f90', 1, 0)")
+
+    @pytest.mark.parametrize("directory_name", ["q?1", "with%20space", "hash#dir"])
+    def test_open_read_only_escapes_path(self, tmp_path, directory_name):
+        database_path = tmp_path / directory_name / "scan.db"
+        database_path.parent.mkdir()
+
+        with SQLiteStore.create(str(database_path)) as store:
+            store.add_file("/a.f90", True, False)
+            store.end_file()
+
+        with SQLiteStore.open_read_only(str(database_path)) as store:
+            columns, rows = store.query("SELECT path FROM files")
+            assert list(rows) == [("/a.f90",)]
+
+    def test_sqlite_store_repr(self, database_path):
+        with SQLiteStore.create(database_path) as store:
+            assert repr(store) == f"SQLiteStore(database_path='{database_path}')"
@@ -0,0 +1,30 @@
+import hashlib
+import io
+
+from utils.file_hasher import HashingReader, hash_file
+
+
+class TestFileHasher:
+    def test_hash_file(self, tmp_path):
+        file_path = tmp_path / "test.f90"
+        file_path.write_bytes(b"PROGRAM test\r\nEND PROGRAM test\r\n")
+
+        assert hash_file(str(file_path)) == hashlib.sha256(b"PROGRAM test\r\nEND PROGRAM test\r\n").hexdigest()
+
+    def test_hash_empty_file(self, tmp_path):
+        file_path = tmp_path / "empty.f90"
+        file_path.write_bytes(b"")
+
+        assert hash_file(str(file_path)) == hashlib.sha256(b"").hexdigest()
+
+    def test_hashing_reader(self, tmp_path):
+        file_path = tmp_path / "test.f90"
+        file_path.write_bytes(b"PROGRAM test\r\nEND PROGRAM test\r\n")
+
+        with open(file_path, "rb") as f:
+            reader = HashingReader(f)
+            text_file = io.TextIOWrapper(io.BufferedReader(reader))
+            assert text_file.readline() == "PROGRAM test\n"
+
+            # The rest of the file is hashed, even though it wasn't read.
+            assert reader.hexdigest() == hash_file(str(file_path))
@@ -0,0 +1,47 @@
+import pytest
+
+from utils.line_lexer import LexedLine, lex_line
+
+
+class TestLineLexer:
+    @pytest.mark.parametrize(
+        "line,expected_comment,expected_separators",
+        [
+            ("test command", None, ()),
+            ("test command ! comment", "! comment", ()),
+            ("!", "!", ()),
+            ("a = 1; b = 2", None, (5,)),
+            ("a = 1; b = 2; c = 3 ! set; all", "! set; all", (5, 12)),
+            ("Print *, 'Hello; World!'", None, ()),
+            ('Print *, "it\'s; fine!"; a = 1', None, (22,)),
+            ("Print *, 'Hello World!' ! comment", "! comment", ()),
+            ("Print *, 'unclosed; ! quote", None, ()),
+        ],
+    )
+    def test_lex_line(self, line, expected_comment, expected_separators):
+        lexed_line = lex_line(line)
+
+        assert lexed_line.text == line
+        assert lexed_line.comment == expected_comment
+        assert lexed_line.separators == expected_separators
+
+    @pytest.mark.parametrize(
+        "line,expected_code,continues_on_next_line,continues_previous_line",
+        [
+            ("a = 1", "a = 1", False, False),
+            ("a = 1 + & ! comment", "a = 1 + & ", False, False),
+            ("a = 1 + &", "a = 1 + &", True, False),
+            ("& 2 ! comment &", "& 2 ", False, True),
+            ("Print *, '! &'", "Print *, '! &'", False, False),
+        ],
+    )
+    def test_lexed_line_code(self, line, expected_code, continues_on_next_line, continues_previous_line):
+        lexed_line = lex_line(line)
+
+        assert lexed_line.code == expected_code
+        assert lexed_line.continues_on_next_line is continues_on_next_line
+        assert lexed_line.continues_previous_line is continues_previous_line
+
+    def test_lexed_line_is_frozen(self):
+        with pytest.raises(AttributeError):
+            LexedLine("a = 1").comment = "! comment"  # type: ignore[misc]
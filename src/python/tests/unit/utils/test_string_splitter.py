@@ -0,0 +1,53 @@
+import pytest
+
+from utils.string_splitter import split_outside_quotes
+
+
+class TestStringSplitter:
+    @pytest.mark.parametrize(
+        "split_string,delimiter,expected_result",
+        [
+            (
+                "*a*string*to*'be*split*with'*quotes*",
+                "*",
+                ["", "a", "string", "to", "'be*split*with'", "quotes", ""],
+            ),
+            (
+                "'::'CHARACTER(LEN=1024) :: char_1=':: Declare :: variables with ::'",
+                "::",
+                ["'::'CHARACTER(LEN=1024) ", " char_1=':: Declare :: variables with ::'"],
+            ),
+            (
+                "test!*!string!*!to!*!split!*!",
+                "!*!",
+                ["test", "string", "to", "split", ""],
+            ),
+            ("a = 1; b = 2", ";", ["a = 1", " b = 2"]),
+            ("PRINT *, 'a;b'; x = 1", ";", ["PRINT *, 'a;b'", " x = 1"]),
+            ('x = "unclosed; quote', ";", ['x = "unclosed', " quote"]),
+            ("a = 1;", ";", ["a = 1", ""]),
+            # Delimiters inside quotes after the final split are still
+            # split on when the string does not end with a quote.
+            ("a, 'b, c' d", ",", ["a", " 'b", " c' d"]),
+            ("", ",", [""]),
+        ],
+    )
+    def test_split_outside_quotes(self, split_string, delimiter, expected_result):
+        assert split_outside_quotes(split_string, delimiter) == expected_result
+
+    @pytest.mark.parametrize(
+        "split_string,expected_result",
+        [
+            ("a = 1; b = 2", ["a = 1", " b = 2"]),
+            ("a = 1;", ["a = 1;"]),
+            ("PRINT *, 'a;b', x", ["PRINT *, 'a;b', x"]),
+            ("a = 1; PRINT *, 'a;b', x", ["a = 1", " PRINT *, 'a", "b', x"]),
+        ],
+    )
+    def test_split_outside_quotes_keep_unsplit_string(self, split_string, expected_result):
+        assert split_outside_quotes(split_string, ";", keep_unsplit_string=True) == expected_result
+
+    @pytest.mark.parametrize("delimiter", ["", "'", 'a"b'])
+    def test_split_outside_quotes_bad_delimiter(self, delimiter):
+        with pytest.raises(ValueError):
+            split_outside_quotes("a, 'b'", delimiter)
@@ -1,5 +1,7 @@
 from typing import Optional
 
+from .line_lexer import lex_line
+
 
 def find_comment(line: str) -> Optional[str]:
     """Checks a provided line for the presence of a comment.
@@ -15,25 +17,7 @@ def find_comment(line: str) -> Optional[str]:
         comment.
     """
 
-    if "!" not in line:
-        return None
-
-    # If we encounter an exclamation mark inside a quote, we know it's
-    # not a comment
-    active_quote_char = None  # Set and unset as we enter and exit quotes
-    quote_chars = ("'", '"')
-    for i in range(len(line)):
-        if line[i] not in ("!", "'", '"'):
-            continue
-        elif line[i] in quote_chars and active_quote_char is None:
-            active_quote_char = line[i]
-        elif active_quote_char is not None:
-            if line[i] == active_quote_char:
-                active_quote_char = None
-        else:
-            return line[i:]  # Reaching here means we found an exclamation mark outside quotes
-
-    return None
+    return lex_line(line).comment
 
 
 def remove_comment_from_line(line: str) -> str:
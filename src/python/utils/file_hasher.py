@@ -0,0 +1,70 @@
+import hashlib
+import io
+from typing import Any, BinaryIO
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path: str) -> str:
+    """Hashes the contents of a file.
+
+    The file is read in chunks, so large files are not loaded into
+    memory all at once.
+
+    Args:
+        file_path: The path to the file on disk.
+
+    Returns:
+        A SHA-256 hash of the file's contents, as a hex string.
+    """
+
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            file_hash.update(chunk)
+
+    return file_hash.hexdigest()
+
+
+class HashingReader(io.RawIOBase):
+    """Reads a binary file, hashing its contents as they are read.
+
+    This lets a file be hashed while it is parsed, rather than being read
+    a second time. The bytes that are hashed are then exactly the bytes
+    that were parsed, even if the file changes on disk in the meantime.
+    Closing the reader does not close the file it reads from.
+    """
+
+    def __init__(self, file: BinaryIO) -> None:
+        """Initialises a hashing reader.
+
+        Args:
+            file: The binary file to read from, opened at its start.
+        """
+
+        self._file = file
+        self._hash = hashlib.sha256()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        read_count = self._file.readinto(buffer)  # type: ignore[attr-defined]
+        self._hash.update(memoryview(buffer)[:read_count])
+
+        return read_count
+
+    def hexdigest(self) -> str:
+        """Returns the hash of the whole file.
+
+        Any part of the file that hasn't been read yet, such as when
+        parsing stopped early, is read and hashed first.
+
+        Returns:
+            A SHA-256 hash of the file's contents, as a hex string.
+        """
+
+        for chunk in iter(lambda: self._file.read(CHUNK_SIZE), b""):
+            self._hash.update(chunk)
+
+        return self._hash.hexdigest()
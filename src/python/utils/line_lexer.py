@@ -0,0 +1,93 @@
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+# The characters that start a comment, separate statements, or start a
+# quote that the other two are ignored inside of.
+_LEXEME_REGEX = re.compile(r"['\"!;]")
+
+
+@dataclass(frozen=True, slots=True)
+class LexedLine:
+    """A line of Fortran code, split into the parts the parser needs.
+
+    Attributes:
+        text: The line of code.
+        comment: The comment at the end of the line, or None if the line
+          has no comment.
+        separators: The indices of the semicolons in the line that are
+          outside quotes and before the comment.
+    """
+
+    text: str
+    comment: Optional[str] = None
+    separators: Tuple[int, ...] = ()
+
+    @property
+    def code(self) -> str:
+        """The line without its comment.
+
+        This is the same as 'remove_comment_from_line', so every copy of
+        the comment's text is removed from the line.
+        """
+
+        if self.comment is None:
+            return self.text
+
+        return self.text.replace(self.comment, "")
+
+    @property
+    def continues_on_next_line(self) -> bool:
+        """Whether the line ends with a continuation character."""
+
+        return self.code.endswith("&")
+
+    @property
+    def continues_previous_line(self) -> bool:
+        """Whether the line starts with a continuation character."""
+
+        return self.code.startswith("&")
+
+
+def lex_line(line: str) -> LexedLine:
+    """Finds the comment and statement separators in a line of code.
+
+    The line is scanned once, from quote to quote and from one comment
+    or separator character to the next. Exclamation marks and semicolons
+    inside quotes are ignored, as is everything after a quote that is
+    never closed.
+
+    Args:
+        line: The line of code to lex.
+
+    Returns:
+        The lexed line.
+    """
+
+    # Most lines have neither, so they don't need to be scanned at all.
+    if "!" not in line and ";" not in line:
+        return LexedLine(line)
+
+    comment = None
+    separators: List[int] = []
+    position = 0
+
+    while (match := _LEXEME_REGEX.search(line, position)) is not None:
+        found = match.group()
+        if found == "!":
+            comment = line[match.start() :]
+            break
+        elif found == ";":
+            separators.append(match.start())
+            position = match.end()
+            continue
+
+        # Skip straight to the matching closing quote, as nothing inside
+        # the quotes can be a comment or a separator.
+        closing_quote_index = line.find(found, match.end())
+        if closing_quote_index == -1:
+            break
+
+        position = closing_quote_index + 1
+
+    return LexedLine(line, comment, tuple(separators))
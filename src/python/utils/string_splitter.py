@@ -0,0 +1,75 @@
+import re
+from typing import Dict, List, Pattern
+
+QUOTE_CHARS = ("'", '"')
+
+# Compiled patterns for finding the next quote or delimiter in a string,
+# keyed by delimiter. There are only ever a handful of delimiters in use.
+_DELIMITER_PATTERNS: Dict[str, Pattern[str]] = {}
+
+
+def split_outside_quotes(string_to_split: str, delimiter: str, keep_unsplit_string: bool = False) -> List[str]:
+    """Splits a string, ignoring delimiters inside quotes.
+
+    The string is scanned from quote to quote and delimiter to delimiter
+    rather than character by character, so each call takes linear time
+    in the length of the string.
+
+    A delimiter at the very end of the string is only split on if the
+    string does not end with a quote character. Any delimiters left
+    after the final split (which can include delimiters inside quotes)
+    are split on as well, unless the string ends with a quote character.
+
+    Args:
+        string_to_split: The string to split.
+        delimiter: The delimiter to split the string on. The delimiter
+          cannot contain quote characters.
+        keep_unsplit_string: When True, a string that has no delimiters
+          outside quotes before its final character is returned whole.
+
+    Returns:
+        A list of the parts of the string between each delimiter.
+
+    Raises:
+        ValueError: The delimiter is empty or contains quote characters.
+    """
+
+    if not delimiter or any(quote_char in delimiter for quote_char in QUOTE_CHARS):
+        raise ValueError("Delimiter must be non-empty and cannot contain quote characters.")
+
+    if (pattern := _DELIMITER_PATTERNS.get(delimiter)) is None:
+        pattern = re.compile(f"['\"]|{re.escape(delimiter)}")
+        _DELIMITER_PATTERNS[delimiter] = pattern
+
+    split_parts = []
+    start_of_slice = 0
+    position = 0
+    # A delimiter that finishes on the final character is left for the
+    # check after the loop.
+    last_split_end = len(string_to_split) - 1
+
+    while (match := pattern.search(string_to_split, position)) is not None:
+        found = match.group()
+        if found in QUOTE_CHARS:
+            # Skip straight to the matching closing quote, as nothing
+            # inside the quotes can be split on.
+            closing_quote_index = string_to_split.find(found, match.end())
+            if closing_quote_index == -1:
+                break
+
+            position = closing_quote_index + 1
+            continue
+
+        if match.end() > last_split_end:
+            break
+
+        split_parts.append(string_to_split[start_of_slice : match.start()])
+        start_of_slice = position = match.end()
+
+    remainder = string_to_split[start_of_slice:]
+    if remainder[-1:] in QUOTE_CHARS or (keep_unsplit_string and start_of_slice == 0):
+        split_parts.append(remainder)
+    else:
+        split_parts.extend(remainder.split(delimiter))
+
+    return split_parts